@@ -0,0 +1,383 @@
+"""In-process stand-in for `JciHitachi.api.JciHitachiAWSAPI` used by the benchmarks.
+
+It keeps the same public interface and the private MQTT members the
+integration publishes merged control requests through, but never touches
+the network. Device count, device type mix, call latency and failure
+rate are configurable through `FakeJciHitachiAWSAPI.configure`.
+"""
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from JciHitachi.api import AWSThing
+from JciHitachi.model import (STATUS_DICT, JciHitachiAWSStatus,
+                              JciHitachiAWSStatusSupport)
+
+DEVICE_TYPE_IDS = {"AC": 1, "DH": 2, "HE": 3}
+LIMIT_STATUS_NAMES = ("max_temp", "min_temp", "max_humidity", "min_humidity")
+
+# Numeric statuses drifting between refreshes, like real sensor readings.
+DRIFTING_STATUS_NAMES = {
+    "AC": ("IndoorTemperature",),
+    "DH": ("IndoorHumidity", "PM25"),
+    "HE": ("IndoorTemperature",),
+}
+
+
+class LatencyDistribution:
+    """Per-call latency in seconds.
+
+    Parameters
+    ----------
+    kind : str
+        "fixed", "uniform" or "lognormal".
+    mean : float
+        Mean latency in seconds.
+    spread : float, optional
+        Half width for "uniform", sigma of the underlying normal for "lognormal".
+    """
+
+    def __init__(self, kind="fixed", mean=0.0, spread=0.0):
+        if kind not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        self.kind = kind
+        self.mean = mean
+        self.spread = spread
+
+    def sample(self, rng):
+        if self.mean <= 0:
+            return 0.0
+        if self.kind == "uniform":
+            return max(0.0, rng.uniform(self.mean - self.spread, self.mean + self.spread))
+        if self.kind == "lognormal":
+            mu = math.log(self.mean) - self.spread ** 2 / 2
+            return rng.lognormvariate(mu, self.spread)
+        return self.mean
+
+    def as_dict(self):
+        return {"kind": self.kind, "mean": self.mean, "spread": self.spread}
+
+
+def _raw_status(device_type, rng):
+    raw = {}
+    for status_name, spec in STATUS_DICT[device_type].items():
+        if status_name in LIMIT_STATUS_NAMES:
+            continue
+        if spec["is_numeric"]:
+            raw[status_name] = 0 if status_name == "Error" else rng.randint(20, 30)
+        else:
+            raw[status_name] = next(iter(spec["id2str"]), 0)
+    raw["DeviceType"] = DEVICE_TYPE_IDS[device_type]
+    return raw
+
+
+def _raw_support(device_type):
+    raw = {}
+    for status_name, spec in STATUS_DICT[device_type].items():
+        if status_name in LIMIT_STATUS_NAMES:
+            continue
+        raw[status_name] = 100 if spec["is_numeric"] else 2 ** len(spec["id2str"]) - 1
+    raw.update(
+        DeviceType=DEVICE_TYPE_IDS[device_type],
+        Error=0,
+        Brand="HITACHI",
+        Model="Simulated",
+        FirmwareVersion="0",
+        FirmwareCode="0",
+    )
+    if device_type == "AC":
+        raw["TemperatureSetting"] = (16 << 8) | 32
+    return raw
+
+
+class _Stats:
+    """Thread usage of the simulated calls, shared by all instances."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.calls = {}
+            self.failures = {}
+            self.busy_seconds = 0.0
+            self.in_flight = 0
+            self.peak_in_flight = 0
+            self.threads = set()
+
+    def enter(self, name):
+        with self._lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            self.threads.add(threading.get_ident())
+
+    def leave(self, busy, failed=None):
+        with self._lock:
+            self.in_flight -= 1
+            self.busy_seconds += busy
+            if failed is not None:
+                self.failures[failed] = self.failures.get(failed, 0) + 1
+
+    def as_dict(self):
+        with self._lock:
+            return {
+                "calls": dict(self.calls),
+                "failures": dict(self.failures),
+                "busy_seconds": self.busy_seconds,
+                "peak_concurrent_calls": self.peak_in_flight,
+                "threads_used": len(self.threads),
+            }
+
+
+class _MqttEvents:
+    """Like the library's, the answers are kept across requests and the per-thing events tell whether the last one was answered."""
+
+    def __init__(self):
+        self.device_control = {}
+        self.device_status = {}
+        self.device_control_event = {}
+        self.device_status_event = {}
+
+
+class _AWSIdentity:
+    host_identity_id = "simulated-host"
+
+
+class _FakeMqtt:
+    """Collects publishes and answers them on `execute`.
+
+    Status requests of one execution are awaited concurrently, like the
+    real execution pools, so an execution takes as long as its slowest
+    device and each device fails independently. As with the real
+    connection, publishing clears the thing's event, and a request that
+    times out is still in the execution results, only its event stays
+    cleared.
+    """
+
+    def __init__(self, api):
+        self._api = api
+        self._pending = []
+        self.mqtt_events = _MqttEvents()
+
+    def publish(self, host_identity_id, thing_name, publish_type, timeout, payload=None):
+        events = {"status": self.mqtt_events.device_status_event, "control": self.mqtt_events.device_control_event}
+        if publish_type in events:
+            events[publish_type].setdefault(thing_name, threading.Event()).clear()
+        self._pending.append((thing_name, publish_type, payload or {}))
+
+    def execute(self, control=False, **kwargs):
+        if not control:
+            pending, self._pending = self._pending, []
+            thing_names = [thing_name for thing_name, publish_type, _ in pending if publish_type == "status"]
+            self._api._execute_status(thing_names)
+            return None, None, thing_names, None
+
+        pending, self._pending = self._pending, []
+        confirmed = []
+        with self._api._call("execute"):
+            for thing_name, publish_type, payload in pending:
+                if publish_type != "control":
+                    continue
+                thing = self._api._things_by_thing_name[thing_name]
+                echo = {k: v for k, v in payload.items() if k not in ("TaskID", "Timestamp")}
+                for status_name, status_value in echo.items():
+                    thing.status_code.set_new_status(status_name, status_value)
+                self.mqtt_events.device_control[thing_name] = echo
+                self.mqtt_events.device_control_event[thing_name].set()
+                confirmed.append(thing_name)
+        return None, None, None, confirmed
+
+
+class FakeJciHitachiAWSAPI:
+    """Simulated `JciHitachiAWSAPI`.
+
+    Takes the same constructor arguments as the real API. The simulated
+    fleet is set up class-wide with `configure` before the integration
+    creates its instance.
+    """
+
+    device_count = 1
+    type_mix = {"AC": 1.0}
+    latency = LatencyDistribution()
+    failure_rate = 0.0
+    change_rate = 0.1
+    seed = 0
+    stats = _Stats()
+
+    @classmethod
+    def configure(cls, device_count=1, type_mix=None, latency=None, failure_rate=0.0, change_rate=0.1, seed=0):
+        """Configure the fleet the next instance will simulate.
+
+        Parameters
+        ----------
+        device_count : int
+            Number of devices.
+        type_mix : dict, optional
+            {device_type: weight} for "AC", "DH" and "HE", by default AC only.
+        latency : LatencyDistribution, optional
+            Latency of every cloud call, by default none.
+        failure_rate : float, optional
+            Probability of a cloud call raising, by default 0.
+        change_rate : float, optional
+            Probability of a refresh changing a device's readings, by default 0.1.
+        seed : int, optional
+            Random seed, by default 0.
+        """
+        cls.device_count = device_count
+        cls.type_mix = type_mix or {"AC": 1.0}
+        cls.latency = latency or LatencyDistribution()
+        cls.failure_rate = failure_rate
+        cls.change_rate = change_rate
+        cls.seed = seed
+        cls.stats.reset()
+
+    def __init__(self, email, password, device_names=None, max_retries=5, device_offline_timeout=10.0, **kwargs):
+        self.email = email
+        self.password = password
+        self.device_names = device_names
+        self.max_retries = max_retries
+        self.device_offline_timeout = device_offline_timeout
+        self.task_id = 0
+        self._rng = random.Random(self.seed)
+        self._rng_lock = threading.Lock()
+        self._things = {}
+        self._things_by_thing_name = {}
+        self._mqtt = _FakeMqtt(self)
+        self._mqtt_timeout = 10.0
+        self._aws_identity = _AWSIdentity()
+
+    @property
+    def things(self):
+        return self._things
+
+    def _random(self):
+        with self._rng_lock:
+            return self._rng.random()
+
+    @contextmanager
+    def _call(self, name, can_fail=True):
+        """Simulate the latency and failures of a cloud call around the body."""
+        self.stats.enter(name)
+        start = time.monotonic()
+        failed = False
+        try:
+            with self._rng_lock:
+                delay = self.latency.sample(self._rng)
+                fail = can_fail and self._rng.random() < self.failure_rate
+            time.sleep(delay)
+            if fail:
+                raise RuntimeError(f"Simulated {name} failure.")
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.stats.leave(time.monotonic() - start, failed=name if failed else None)
+
+    def _check_before_publish(self):
+        pass
+
+    def login(self):
+        # Login never fails so that every run sets up the whole fleet.
+        with self._call("login", can_fail=False):
+            types = list(self.type_mix)
+            weights = [self.type_mix[device_type] for device_type in types]
+            for i in range(self.device_count):
+                device_type = self._rng.choices(types, weights)[0]
+                thing = AWSThing({
+                    "CustomDeviceName": f"sim_{device_type.lower()}_{i:04d}",
+                    "DeviceType": str(DEVICE_TYPE_IDS[device_type]),
+                    "ThingName": f"ap-northeast-1:{i:012x}",
+                })
+                thing.support_code = JciHitachiAWSStatusSupport(_raw_support(device_type))
+                thing.status_code = JciHitachiAWSStatus(_raw_status(device_type, self._rng))
+                self._things[thing.name] = thing
+                self._things_by_thing_name[thing.thing_name] = thing
+
+    def logout(self):
+        pass
+
+    def reauth(self):
+        with self._call("reauth"):
+            pass
+
+    def _valid_things(self, device_name):
+        if device_name is None:
+            return list(self._things.items())
+        return [(device_name, self._things[device_name])]
+
+    def _drift(self, thing):
+        if self._random() >= self.change_rate:
+            return
+        for status_name in DRIFTING_STATUS_NAMES[thing.type]:
+            if status_name in thing.status_code.status:
+                thing.status_code.set_new_status(
+                    status_name, thing.status_code.status[status_name] + (1 if self._random() < 0.5 else -1))
+
+    def _execute_status(self, thing_names):
+        """Answer concurrent status requests, returning the thing names that responded."""
+        for _ in thing_names:
+            self.stats.enter("refresh_status")
+        start = time.monotonic()
+        with self._rng_lock:
+            delays = [self.latency.sample(self._rng) for _ in thing_names]
+            failed = {thing_name for thing_name in thing_names if self._rng.random() < self.failure_rate}
+        time.sleep(max(delays, default=0.0))
+        busy = time.monotonic() - start
+        responded = []
+        for thing_name in thing_names:
+            thing = self._things_by_thing_name[thing_name]
+            if thing_name in failed:
+                self.stats.leave(busy, failed="refresh_status")
+                continue
+            self._drift(thing)
+            self._mqtt.mqtt_events.device_status[thing_name] = thing.status_code
+            self._mqtt.mqtt_events.device_status_event[thing_name].set()
+            responded.append(thing_name)
+            self.stats.leave(busy)
+        return responded
+
+    def refresh_status(self, device_name=None, refresh_support_code=False, refresh_shadow=False):
+        with self._call("refresh_status"):
+            for _, thing in self._valid_things(device_name):
+                self._drift(thing)
+
+    def get_status(self, device_name=None, legacy=False):
+        statuses = {}
+        for name, thing in self._valid_things(device_name):
+            statuses[name] = thing.status_code.legacy_status if legacy else thing.status_code
+            if thing.type == "AC":
+                statuses[name]._status["max_temp"] = thing.support_code.max_temp
+                statuses[name]._status["min_temp"] = thing.support_code.min_temp
+            elif thing.type == "DH":
+                statuses[name]._status["max_humidity"] = thing.support_code.max_humidity
+                statuses[name]._status["min_humidity"] = thing.support_code.min_humidity
+        return statuses
+
+    def set_status(self, status_name, device_name, status_value=None, status_str_value=None):
+        thing = self._things[device_name]
+        is_valid, status_name, status_value = JciHitachiAWSStatus.str2id(
+            device_type=thing.type,
+            status_name=status_name,
+            status_value=status_value,
+            status_str_value=status_str_value,
+            support_code=thing.support_code,
+        )
+        if not is_valid:
+            return False
+        with self._call("set_status"):
+            thing.status_code.set_new_status(status_name, status_value)
+        return True
+
+    def refresh_monthly_data(self, months, device_name=None):
+        with self._call("refresh_monthly_data"):
+            now = time.time()
+            for _, thing in self._valid_things(device_name):
+                thing.monthly_data = [
+                    {"Timestamp": int((now - month * 30 * 86400) * 1000), "PowerConsumption_Sum": 100 * (month + 1)}
+                    for month in range(months, -1, -1)
+                ]
@@ -0,0 +1,222 @@
+"""Stand-in for `JciHitachi.api.JciHitachiAWSAPI` replaying a recording.
+
+Recordings are written by the integration's `jcihitachi_tw.record`
+service. The devices are the recorded ones, and every cloud call of a
+device takes the recorded duration, divided by the replay speed, and
+answers or fails the way the recorded call of the same kind did. The
+recorded calls of a device are replayed in order and start over once
+used up. Calls the recording has none of are simulated like
+`FakeJciHitachiAWSAPI` does, without latency.
+"""
+import gzip
+import itertools
+import json
+import time
+from contextlib import contextmanager
+
+from fake_api import FakeJciHitachiAWSAPI, _FakeMqtt
+from JciHitachi.api import AWSThing
+from JciHitachi.model import (STATUS_DICT, JciHitachiAWSStatus,
+                              JciHitachiAWSStatusSupport)
+
+# Same as `RECORDING_VERSION` of the integration's recording module.
+RECORDING_VERSION = 1
+
+
+def read_recording(path):
+    """Read a recording, returning its header and events."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        lines = [json.loads(line) for line in file if line.strip()]
+    if not lines or lines[0].get("version") != RECORDING_VERSION:
+        raise ValueError(f"{path} is not a version {RECORDING_VERSION} recording.")
+    return lines[0], lines[1:]
+
+
+def _outcomes(events):
+    """Group recorded calls into {(op, device_name): [outcome]}, in recorded order.
+
+    Executions are split per device, the other calls are keyed by the
+    device they addressed, None for every device.
+    """
+    outcomes = {}
+    for event in events:
+        op = event["op"]
+        if op in ("status", "control"):
+            for device_name, answer in event["devices"].items():
+                outcomes.setdefault((op, device_name), []).append(
+                    {"d": event["d"], "answer": answer, "error": event.get("error")})
+        elif op != "login":
+            outcomes.setdefault((op, event.get("device")), []).append(event)
+    return outcomes
+
+
+class _ReplayMqtt(_FakeMqtt):
+    """Answers control executions the way the recorded ones of the devices were."""
+
+    def execute(self, control=False, **kwargs):
+        if not control:
+            return super().execute(control, **kwargs)
+
+        pending, self._pending = self._pending, []
+        controls = [
+            (thing_name, payload, self._api._next_outcome("control", self._api._things_by_thing_name[thing_name].name))
+            for thing_name, publish_type, payload in pending
+            if publish_type == "control"
+        ]
+        self._api._sleep(max((outcome["d"] for _, _, outcome in controls if outcome), default=0.0))
+        for thing_name, payload, outcome in controls:
+            self._api.stats.enter("execute")
+            if outcome is not None and outcome["answer"] is None:
+                self._api.stats.leave(0.0, failed="execute")
+                continue
+            thing = self._api._things_by_thing_name[thing_name]
+            # The command sent is echoed, the recording only decides whether and when.
+            echo = {k: v for k, v in payload.items() if k in STATUS_DICT[thing.type]}
+            for status_name, status_value in echo.items():
+                thing.status_code.set_new_status(status_name, status_value)
+            self.mqtt_events.device_control[thing_name] = echo
+            self.mqtt_events.device_control_event[thing_name].set()
+            self._api.stats.leave(0.0)
+        # Unconfirmed requests timed out without raising, only their events stay cleared.
+        return None, None, None, [thing_name for thing_name, _, _ in controls]
+
+
+class ReplayJciHitachiAWSAPI(FakeJciHitachiAWSAPI):
+    """`FakeJciHitachiAWSAPI` answering like a recording.
+
+    The recording is loaded class-wide with `configure` before the
+    integration creates its instance.
+    """
+
+    header = None
+    outcomes = {}
+    speed = 1.0
+
+    @classmethod
+    def configure(cls, path, speed=1.0):
+        """Load the recording the next instance will replay.
+
+        Parameters
+        ----------
+        path : str or Path
+            Recording written by the `jcihitachi_tw.record` service.
+        speed : float, optional
+            Replay speed, recorded durations are divided by it, by default 1.
+        """
+        if speed <= 0:
+            raise ValueError(f"Replay speed must be positive, got {speed}.")
+        cls.header, events = read_recording(path)
+        cls.outcomes = _outcomes(events)
+        cls.login_seconds = next((event["d"] for event in events if event["op"] == "login"), 0.0)
+        cls.device_count = len(cls.header["things"])
+        cls.speed = speed
+        cls.stats.reset()
+
+    def __init__(self, email, password, device_names=None, **kwargs):
+        super().__init__(email, password, device_names, **kwargs)
+        self._mqtt = _ReplayMqtt(self)
+        self._cursors = {key: itertools.cycle(outcomes) for key, outcomes in self.outcomes.items()}
+
+    def _sleep(self, seconds):
+        time.sleep(seconds / self.speed)
+
+    def _next_outcome(self, op, device_name):
+        """Return the next recorded outcome of `op` on a device, None if there is none."""
+        with self._rng_lock:
+            cursor = self._cursors.get((op, device_name))
+            return next(cursor) if cursor is not None else None
+
+    @contextmanager
+    def _replay(self, op, device_name):
+        """Take the recorded duration of the next `op` call and raise like it did, yields its outcome."""
+        outcome = self._next_outcome(op, device_name)
+        self.stats.enter(op)
+        start = time.monotonic()
+        failed = False
+        try:
+            if outcome is not None:
+                self._sleep(outcome["d"])
+                if outcome.get("error"):
+                    raise RuntimeError(f"Replayed {op} failure: {outcome['error']}")
+            yield outcome
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.stats.leave(time.monotonic() - start, failed=op if failed else None)
+
+    def login(self):
+        self.stats.enter("login")
+        self._sleep(self.login_seconds)
+        for item in self.header["things"]:
+            thing = AWSThing(item["json"])
+            if item["support"] is not None:
+                thing.support_code = JciHitachiAWSStatusSupport(item["support"])
+            if item["status"] is not None:
+                thing.status_code = JciHitachiAWSStatus(item["status"], legacy=True)
+            if self.device_names and thing.name not in self.device_names:
+                continue
+            self._things[thing.name] = thing
+            self._things_by_thing_name[thing.thing_name] = thing
+        self.stats.leave(self.login_seconds / self.speed)
+
+    def _set_recorded_status(self, thing, status):
+        thing.status_code = JciHitachiAWSStatus(status, legacy=True)
+        self._mqtt.mqtt_events.device_status[thing.thing_name] = thing.status_code
+
+    def _execute_status(self, thing_names):
+        """Answer concurrent status requests like the recorded ones, returning the thing names that responded."""
+        for _ in thing_names:
+            self.stats.enter("refresh_status")
+        outcomes = [self._next_outcome("status", self._things_by_thing_name[name].name) for name in thing_names]
+        start = time.monotonic()
+        self._sleep(max((outcome["d"] for outcome in outcomes if outcome), default=0.0))
+        busy = time.monotonic() - start
+        responded = []
+        for thing_name, outcome in zip(thing_names, outcomes):
+            thing = self._things_by_thing_name[thing_name]
+            if outcome is not None and outcome["answer"] is None:
+                self.stats.leave(busy, failed="refresh_status")
+                continue
+            if outcome is not None:
+                self._set_recorded_status(thing, outcome["answer"])
+            else:
+                self._mqtt.mqtt_events.device_status[thing_name] = thing.status_code
+            self._mqtt.mqtt_events.device_status_event[thing_name].set()
+            responded.append(thing_name)
+            self.stats.leave(busy)
+        return responded
+
+    def refresh_status(self, device_name=None, refresh_support_code=False, refresh_shadow=False):
+        with self._replay("refresh_status", device_name) as outcome:
+            if outcome is None:
+                return
+            for name, status in outcome["statuses"].items():
+                if name in self._things and status is not None:
+                    self._set_recorded_status(self._things[name], status)
+
+    def set_status(self, status_name, device_name, status_value=None, status_str_value=None):
+        thing = self._things[device_name]
+        is_valid, status_name, status_value = JciHitachiAWSStatus.str2id(
+            device_type=thing.type,
+            status_name=status_name,
+            status_value=status_value,
+            status_str_value=status_str_value,
+            support_code=thing.support_code,
+        )
+        if not is_valid:
+            return False
+        with self._replay("set_status", device_name) as outcome:
+            if outcome is not None and not outcome["result"]:
+                return False
+            thing.status_code.set_new_status(status_name, status_value)
+        return True
+
+    def refresh_monthly_data(self, months, device_name=None):
+        with self._replay("refresh_monthly_data", device_name) as outcome:
+            if outcome is not None:
+                for name, records in outcome["records"].items():
+                    if name in self._things:
+                        self._things[name].monthly_data = records
+        if outcome is None:
+            super().refresh_monthly_data(months, device_name)
@@ -0,0 +1,352 @@
+"""Fleet-scale benchmarks of the integration against a simulated cloud.
+
+Runs Home Assistant in-process with `JciHitachiAWSAPI` replaced by
+`FakeJciHitachiAWSAPI` and reports, per device count, setup time, memory
+per device, refresh cycle time, devices left stale per cycle, command
+round time, event loop blocking, executor thread usage and state writes
+per cycle as JSON.
+
+Example::
+
+    python benchmarks/run_benchmarks.py --devices 1 10 100 1000 --output results.json
+
+With `--replay`, the cloud is `ReplayJciHitachiAWSAPI` instead, answering
+like a recording of the `jcihitachi_tw.record` service::
+
+    python benchmarks/run_benchmarks.py --replay jcihitachi_tw_recording.jsonl.gz --replay-speed 10
+
+Requires Home Assistant and LibJciHitachi to be installed, no network access.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = BENCHMARKS_DIR.parent
+sys.path.insert(0, str(BENCHMARKS_DIR))
+
+import JciHitachi.api  # noqa: E402
+from fake_api import FakeJciHitachiAWSAPI, LatencyDistribution  # noqa: E402
+from replay_api import ReplayJciHitachiAWSAPI  # noqa: E402
+from homeassistant import config_entries, loader  # noqa: E402
+from homeassistant.const import EVENT_STATE_CHANGED  # noqa: E402
+from homeassistant.const import __version__ as HA_VERSION  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers.entity import Entity  # noqa: E402
+from homeassistant.setup import async_setup_component  # noqa: E402
+
+DOMAIN = "jcihitachi_tw"
+SCHEMA_VERSION = 1
+HEARTBEAT_INTERVAL = 0.01
+
+# Commands sent to every entity of a domain in one service call per round.
+COMMANDS = (
+    ("climate", "set_temperature", {"temperature": 24}),
+    ("humidifier", "set_humidity", {"humidity": 50}),
+    ("fan", "turn_on", {}),
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LoopMonitor:
+    """Measure event loop blocking with a heartbeat, and sample thread count."""
+
+    def __init__(self, interval=HEARTBEAT_INTERVAL):
+        self.interval = interval
+        self._task = None
+        self.reset()
+
+    def reset(self):
+        self.blocked_seconds = 0.0
+        self.max_lag = 0.0
+        self.peak_threads = threading.active_count()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - start - self.interval
+            if lag > 0:
+                self.blocked_seconds += lag
+                self.max_lag = max(self.max_lag, lag)
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def as_dict(self):
+        return {
+            "blocked_seconds": self.blocked_seconds,
+            "max_lag_seconds": self.max_lag,
+            "peak_threads": self.peak_threads,
+        }
+
+
+class StateWriteCounter:
+    """Count entity state writes and resulting state_changed events."""
+
+    def __init__(self):
+        self.writes = 0
+        self.events = 0
+        counter = self
+        original = Entity.async_write_ha_state
+
+        def async_write_ha_state(entity):
+            counter.writes += 1
+            original(entity)
+
+        Entity.async_write_ha_state = async_write_ha_state
+
+    def reset(self):
+        self.writes = 0
+        self.events = 0
+
+    def listen(self, hass):
+        def _count(event):
+            self.events += 1
+        return hass.bus.async_listen(EVENT_STATE_CHANGED, _count)
+
+
+async def async_start_hass(config_dir):
+    """Start a bare Home Assistant instance able to load custom components."""
+    from homeassistant import bootstrap
+    from homeassistant import config as conf_util
+
+    hass = HomeAssistant(config_dir)
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    await bootstrap.async_load_base_functionality(hass)
+    await conf_util.async_process_ha_core_config(hass, {})
+    hass.config.skip_pip = True
+    await async_setup_component(hass, "homeassistant", {})
+    return hass
+
+
+def _summary(values):
+    values = sorted(values)
+    if not values:
+        return None
+    return {
+        "min": values[0],
+        "mean": sum(values) / len(values),
+        "p50": values[len(values) // 2],
+        "max": values[-1],
+    }
+
+
+async def async_run_scenario(config_dir, counter, args, device_count):
+    """Set up a fleet of `device_count` devices and measure it."""
+    if args.replay is None:
+        FakeJciHitachiAWSAPI.configure(
+            device_count=device_count,
+            type_mix=args.mix,
+            latency=LatencyDistribution(args.latency, args.latency_mean, args.latency_spread),
+            failure_rate=args.failure_rate,
+            change_rate=args.change_rate,
+            seed=args.seed,
+        )
+    hass = await async_start_hass(config_dir)
+    monitor = LoopMonitor()
+    unsub = counter.listen(hass)
+    result = {"devices": device_count}
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    start = time.monotonic()
+    ok = await async_setup_component(
+        hass, DOMAIN, {DOMAIN: {
+            "email": "benchmark@example.com",
+            "password": "benchmark",
+            "refresh_concurrency": args.refresh_concurrency,
+        }})
+    await hass.async_block_till_done()
+    result["setup_seconds"] = time.monotonic() - start
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    if not ok:
+        raise RuntimeError(f"Setting up {DOMAIN} with {device_count} devices failed.")
+    result["memory_per_device_bytes"] = (after - before) / device_count
+    result["peak_memory_bytes"] = peak - before
+    # The YAML account is imported into a config entry.
+    entry_data = hass.data[DOMAIN][hass.config_entries.async_entries(DOMAIN)[0].entry_id]
+    result["entities"] = len(hass.states.async_all())
+    result["types"] = {
+        device_type: sum(thing.type == device_type for thing in entry_data["api"].things.values())
+        for device_type in ("AC", "DH", "HE")
+    }
+
+    coordinators = list(entry_data["coordinator"].values())
+    cycles = []
+    monitor.start()
+    FakeJciHitachiAWSAPI.stats.reset()
+    for _ in range(args.cycles):
+        counter.reset()
+        start = time.monotonic()
+        await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+        await hass.async_block_till_done()
+        cycles.append({
+            "seconds": time.monotonic() - start,
+            "state_writes": counter.writes,
+            "state_changed_events": counter.events,
+            "failed_devices": sum(not coordinator.last_update_success for coordinator in coordinators),
+            # Devices that missed the cycle while others answered keep their last status.
+            "stale_devices": len(entry_data["updated_data"].stale),
+        })
+    result["cycle_seconds"] = _summary([cycle["seconds"] for cycle in cycles])
+    result["state_writes_per_cycle"] = _summary([cycle["state_writes"] for cycle in cycles])
+    result["state_changed_events_per_cycle"] = _summary([cycle["state_changed_events"] for cycle in cycles])
+    result["failed_devices_per_cycle"] = _summary([cycle["failed_devices"] for cycle in cycles])
+    result["stale_devices_per_cycle"] = _summary([cycle["stale_devices"] for cycle in cycles])
+    result["cycle_executor"] = FakeJciHitachiAWSAPI.stats.as_dict()
+    result["cycle_loop"] = monitor.as_dict()
+
+    monitor.reset()
+    FakeJciHitachiAWSAPI.stats.reset()
+    counter.reset()
+    start = time.monotonic()
+    for domain, service, data in COMMANDS:
+        entity_ids = hass.states.async_entity_ids(domain)
+        if entity_ids and hass.services.has_service(domain, service):
+            try:
+                await hass.services.async_call(domain, service, {"entity_id": entity_ids, **data}, blocking=True)
+            except Exception as err:
+                _LOGGER.warning(f"{domain}.{service} failed: {err}")
+    await hass.async_block_till_done()
+    result["command_round"] = {
+        "seconds": time.monotonic() - start,
+        "state_writes": counter.writes,
+        "state_changed_events": counter.events,
+        "executor": FakeJciHitachiAWSAPI.stats.as_dict(),
+        "loop": monitor.as_dict(),
+    }
+
+    await monitor.stop()
+    unsub()
+    await hass.async_stop(force=True)
+    return result
+
+
+def _parse_mix(value):
+    mix = {}
+    for item in value.split(","):
+        device_type, _, weight = item.partition("=")
+        if device_type not in ("AC", "DH", "HE"):
+            raise argparse.ArgumentTypeError(f"Unknown device type: {device_type}")
+        mix[device_type] = float(weight or 1)
+    return mix
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 100],
+                        help="Device counts to benchmark, 1 to 1000.")
+    parser.add_argument("--mix", type=_parse_mix, default=_parse_mix("AC=0.5,DH=0.3,HE=0.2"),
+                        help="Device type weights, e.g. AC=0.5,DH=0.3,HE=0.2.")
+    parser.add_argument("--latency", choices=("fixed", "uniform", "lognormal"), default="lognormal",
+                        help="Latency distribution of simulated cloud calls.")
+    parser.add_argument("--latency-mean", type=float, default=0.005,
+                        help="Mean latency of simulated cloud calls in seconds.")
+    parser.add_argument("--latency-spread", type=float, default=0.5,
+                        help="Half width (uniform) or sigma (lognormal) of the latency.")
+    parser.add_argument("--failure-rate", type=float, default=0.0,
+                        help="Probability of a simulated cloud call failing.")
+    parser.add_argument("--change-rate", type=float, default=0.1,
+                        help="Probability of a refresh changing a device's readings.")
+    parser.add_argument("--refresh-concurrency", type=int, default=10,
+                        help="refresh_concurrency option of the integration.")
+    parser.add_argument("--cycles", type=int, default=5, help="Refresh cycles per device count.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed.")
+    parser.add_argument("--replay", type=Path,
+                        help="Replay this recording instead of simulating a fleet, --devices and the "
+                             "simulation options are ignored.")
+    parser.add_argument("--replay-speed", type=float, default=1.0,
+                        help="Replay speed, recorded call durations are divided by it.")
+    parser.add_argument("--output", type=Path, help="Write results to this file instead of stdout.")
+    args = parser.parse_args(argv)
+    for device_count in args.devices:
+        if not 1 <= device_count <= 1000:
+            parser.error(f"Device count must be between 1 and 1000, got {device_count}.")
+    if args.replay_speed <= 0:
+        parser.error(f"Replay speed must be positive, got {args.replay_speed}.")
+    return args
+
+
+async def async_main(args):
+    manifest = json.loads((REPO_ROOT / "custom_components" / DOMAIN / "manifest.json").read_text())
+    results = {
+        "schema_version": SCHEMA_VERSION,
+        "integration_version": manifest["version"],
+        "home_assistant_version": HA_VERSION,
+        "python_version": platform.python_version(),
+        "platform": platform.platform(),
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "parameters": {
+            "mix": args.mix,
+            "latency": LatencyDistribution(args.latency, args.latency_mean, args.latency_spread).as_dict(),
+            "failure_rate": args.failure_rate,
+            "change_rate": args.change_rate,
+            "refresh_concurrency": args.refresh_concurrency,
+            "cycles": args.cycles,
+            "seed": args.seed,
+        },
+        "scenarios": [],
+    }
+    devices = args.devices
+    if args.replay is not None:
+        results["parameters"] = {
+            "replay": str(args.replay),
+            "replay_speed": args.replay_speed,
+            "recorded_at": ReplayJciHitachiAWSAPI.header["started_at"],
+            "refresh_concurrency": args.refresh_concurrency,
+            "cycles": args.cycles,
+        }
+        devices = [ReplayJciHitachiAWSAPI.device_count]
+    counter = StateWriteCounter()
+    with tempfile.TemporaryDirectory() as config_dir:
+        (Path(config_dir) / "custom_components").mkdir()
+        (Path(config_dir) / "custom_components" / DOMAIN).symlink_to(REPO_ROOT / "custom_components" / DOMAIN)
+        for device_count in devices:
+            _LOGGER.info(f"Benchmarking {device_count} devices.")
+            results["scenarios"].append(await async_run_scenario(config_dir, counter, args, device_count))
+    return results
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # The integration and Home Assistant are noisy at scale.
+    logging.getLogger("homeassistant").setLevel(logging.ERROR)
+    logging.getLogger(f"custom_components.{DOMAIN}").setLevel(logging.ERROR)
+    # Must be patched before the integration imports it during setup.
+    if args.replay is None:
+        JciHitachi.api.JciHitachiAWSAPI = FakeJciHitachiAWSAPI
+    else:
+        ReplayJciHitachiAWSAPI.configure(args.replay, args.replay_speed)
+        JciHitachi.api.JciHitachiAWSAPI = ReplayJciHitachiAWSAPI
+    results = asyncio.run(async_main(args))
+    output = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
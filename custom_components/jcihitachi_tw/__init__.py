@@ -1,32 +1,93 @@
 """JciHitachi integration."""
 import asyncio
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import timedelta
-from queue import Queue
 from typing import Optional
 
-import async_timeout
-from homeassistant.helpers import discovery
+from homeassistant.config_entries import SOURCE_IMPORT
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import (CoordinatorEntity,
                                                       DataUpdateCoordinator,
                                                       UpdateFailed)
 from JciHitachi import __version__
 from JciHitachi.api import JciHitachiAWSAPI
 
-from .const import (API, CONF_DEVICES, CONF_EMAIL, CONF_PASSWORD, CONF_RETRY,
-                    CONFIG_SCHEMA, COORDINATOR, DOMAIN, UPDATE_DATA,
-                    UPDATED_DATA)
+from .const import (API, API_EXECUTOR, CIRCUIT_BREAKER, CONFIG_SCHEMA,
+                    CONF_DEVICES, CONF_EMAIL, CONF_MAX_UPDATE_INTERVAL,
+                    CONF_OPTIMISTIC_TIMEOUT, CONF_PASSWORD, CONF_PUSH,
+                    CONF_REFRESH_CONCURRENCY, CONF_RETRY, COORDINATOR,
+                    DEFAULT_MAX_UPDATE_INTERVAL, DEFAULT_OPTIMISTIC_TIMEOUT,
+                    DEFAULT_PUSH, DEFAULT_REFRESH_CONCURRENCY, DOMAIN,
+                    METRICS, MONTHLY_CACHE, MONTHLY_DATA, PUSH_LISTENER,
+                    RATE_LIMITER, REFRESH_POOL, SESSION_CACHE,
+                    UNLOAD_CALLBACKS, UPDATED_DATA, UPDATE_DATA,
+                    VALIDATED_SESSION)
+from .breaker import JciHitachiCircuitBreaker
+from .command import JciHitachiCommandPipeline
+from .executor import JciHitachiAPIExecutor
+from .metrics import (OPERATION_LOGIN, OPERATION_REFRESH_STATUS,
+                      JciHitachiMetrics)
+from .monthly import JciHitachiMonthlyDataCache, async_remove_monthly_data
+from .push import JciHitachiPushListener
+from .ratelimit import JciHitachiRateLimiter
+from .refresh import DeviceLateError, JciHitachiRefreshPool
+from .scheduler import AdaptivePollingScheduler
+from .services import async_register_services
+from .session import (JciHitachiSessionCache, close_session, is_complete,
+                      restore_inventory, restore_session, resume_session)
+from .statistics import JciHitachiStatisticsImporter
+from .store import JciHitachiStatusStore
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS = ["binary_sensor", "climate", "fan", "humidifier", "number", "sensor", "switch", "light"]
 DATA_UPDATE_INTERVAL = timedelta(seconds=30)
+PUSH_DATA_UPDATE_INTERVAL = timedelta(minutes=10)
 BASE_TIMEOUT = 5
-
-
-def build_coordinator(hass, api):
-
-    timeout = BASE_TIMEOUT + len(api.things) * 2
+# Seconds queued commands may take to be sent when an account is unloaded.
+COMMAND_FLUSH_TIMEOUT = 10
+SESSION_SAVE_INTERVAL = timedelta(minutes=15)
+STATISTICS_IMPORT_INTERVAL = timedelta(hours=1)
+
+
+class JciHitachiDataUpdateCoordinator(DataUpdateCoordinator):
+    """Coordinator polling at the interval given by an `AdaptivePollingScheduler`."""
+
+    def __init__(self, hass, scheduler, entry_data, **kwargs):
+        super().__init__(hass, _LOGGER, update_interval=scheduler.interval, **kwargs)
+        self.scheduler = scheduler
+        # Runtime data of the account the coordinator's device belongs to.
+        self.entry_data = entry_data
+        self.store = entry_data[UPDATED_DATA]
+
+    @callback
+    def async_command_sent(self, changed):
+        """Poll fast for a while and reset the update scheduler."""
+        self.update_interval = self.scheduler.command_sent()
+        self.async_set_updated_data(changed)
+
+    @callback
+    def async_notify_changed(self, changed):
+        """Notify entities reading any of the `changed` status names."""
+        self.data = changed
+        self.async_update_listeners()
+
+
+def build_coordinator(hass, entry_data, thing, push=False, max_update_interval=DEFAULT_MAX_UPDATE_INTERVAL):
+
+    api = entry_data[API]
+    pool = entry_data[REFRESH_POOL]
+    metrics = entry_data[METRICS]
+    store = entry_data[UPDATED_DATA]
+    scheduler = AdaptivePollingScheduler(
+        # In push mode polling is only a safety net for missed updates.
+        base_interval=PUSH_DATA_UPDATE_INTERVAL if push else DATA_UPDATE_INTERVAL,
+        max_interval=timedelta(seconds=max_update_interval),
+    )
 
     async def async_update_data():
         """Fetch data from API endpoint.
@@ -37,81 +98,302 @@ def build_coordinator(hass, api):
         try:
             # Note: asyncio.TimeoutError and aiohttp.ClientError are already
             # handled by the data update coordinator.
-            async with async_timeout.timeout(timeout):
-                await hass.async_add_executor_job(api.refresh_status)
-                hass.data[DOMAIN][UPDATED_DATA] = api.get_status(legacy=True)
+            with metrics.measure(thing.name, OPERATION_REFRESH_STATUS):
+                await pool.async_refresh(thing.name)
+            current = api.get_status(thing.name, legacy=True)
+            changed = store.confirm(current)[thing.name]
+
+        except DeviceLateError as err:
+            # Other devices answered, keep the last status and flag it rather than failing.
+            _LOGGER.info(f"{err}")
+            # None notifies every entity of the device, which then carries the stale attribute.
+            return None if store.mark_stale(thing.name) else set()
 
         except asyncio.TimeoutError as err:
-            raise UpdateFailed(f"Command executed timed out when regularly fetching data.")
+            raise UpdateFailed(f"Command executed timed out when regularly fetching {thing.name} data.")
 
         except Exception as err:
             raise UpdateFailed(f"Error communicating with API: {err}")
         
-        _LOGGER.debug(
-            f"Latest data: {[(name, value.status) for name, value in hass.data[DOMAIN][UPDATED_DATA].items()]}")
+        _LOGGER.debug(f"Latest data: {[(name, value.status) for name, value in current.items()]}")
+
+        coordinator.update_interval = scheduler.refreshed(*scheduler.classify(changed))
+        _LOGGER.debug(f"Next {thing.name} update in {coordinator.update_interval}")
 
-    coordinator = DataUpdateCoordinator(
+        # Becomes `coordinator.data`, entities only write state if they read any of these.
+        return changed
+
+    coordinator = JciHitachiDataUpdateCoordinator(
         hass,
-        _LOGGER,
+        scheduler,
+        entry_data,
         # Name of the data. For logging purposes.
-        name=DOMAIN,
+        name=f"{DOMAIN} {thing.name}",
         update_method=async_update_data,
-        # Polling interval. Will only be polled if there are subscribers.
-        update_interval=DATA_UPDATE_INTERVAL,
     )
 
-    # Reset the update scheduler as the data already exists in
-    # `hass.data[DOMAIN][UPDATED_DATA]`.
+    # Reset the update scheduler as the data already exists in the
+    # account's status store. None notifies every entity.
     coordinator.async_set_updated_data(None)
 
     return coordinator
 
-async def async_setup(hass, config):
-    """Set up from the configuration.yaml"""
-    if config.get(DOMAIN, None) is None:
-        # skip if no config defined in configuration.yaml"""
-        return True
-    _LOGGER.debug(
-        {
-            "CONF_EMAIL": config[DOMAIN].get(CONF_EMAIL),
-            "CONF_PASSWORD": '*' * len(config[DOMAIN].get(CONF_PASSWORD)),
-            "CONF_RETRY": config[DOMAIN].get(CONF_RETRY),
-            "CONF_DEVICES": config[DOMAIN].get(CONF_DEVICES)
-        }
-    )
+def build_coordinators(hass, entry_data, push=False, max_update_interval=DEFAULT_MAX_UPDATE_INTERVAL):
+    """Build one coordinator per thing so that devices refresh independently."""
+    return {
+        name: build_coordinator(hass, entry_data, thing, push, max_update_interval)
+        for name, thing in entry_data[API].things.items()
+    }
 
-    if config[DOMAIN].get(CONF_DEVICES) == []:
-        config[DOMAIN][CONF_DEVICES] = None
+async def async_start_push(hass, api, coordinators):
+    """Subscribe to shadow updates, falling back to regular polling on failure."""
+    try:
+        listener = JciHitachiPushListener(hass, api, coordinators)
+        await hass.async_add_executor_job(listener.subscribe)
+    except Exception as err:
+        _LOGGER.warning(f"Failed to subscribe to shadow updates, falling back to polling: {err}")
+        for coordinator in coordinators.values():
+            coordinator.scheduler.reset(DATA_UPDATE_INTERVAL)
+            coordinator.update_interval = coordinator.scheduler.interval
+        return None
+    _LOGGER.debug("Push mode enabled.")
+    return listener
+
+async def async_login(hass, api, cache, metrics, session):
+    """Resume `session`, or login if there is none or it is rejected.
+
+    Returns the names of the devices whose status was restored from the session.
+    """
+    device_names = api.device_names
+    if session is not None:
+        try:
+            with metrics.measure(None, OPERATION_LOGIN):
+                stale = await hass.async_add_executor_job(restore_session, api, session)
+        except Exception as err:
+            _LOGGER.info(f"The cached session was rejected, logging in: {err}")
+            await hass.async_add_executor_job(close_session, api)
+            api.device_names = device_names
+        else:
+            _LOGGER.debug(f"Resumed the cached session, skipping login. Stale devices: {stale}")
+            return stale
+
+    with metrics.measure(None, OPERATION_LOGIN):
+        await hass.async_add_executor_job(api.login)
+    cache.inventory_at = time.time()
+    return set()
 
-    api = JciHitachiAWSAPI(
-        email=config[DOMAIN].get(CONF_EMAIL),
-        password=config[DOMAIN].get(CONF_PASSWORD),
-        device_names=config[DOMAIN].get(CONF_DEVICES),
-        max_retries=config[DOMAIN].get(CONF_RETRY),
-    )
+async def async_resume(hass, entry_data, session, device_names):
+    """Connect the session of an account set up from its cached session.
 
+    Runs in the account's executor, so refreshes and commands queue behind it.
+    """
+    api = entry_data[API]
     try:
-        await hass.async_add_executor_job(api.login)
-    except AssertionError as err:
-        _LOGGER.error(f"Assertion check error: {err}")
-        return False
-    except RuntimeError as err:
+        with entry_data[METRICS].measure(None, OPERATION_LOGIN):
+            resumed = await entry_data[API_EXECUTOR].async_call(resume_session, api, session, device_names)
+    except Exception as err:
         _LOGGER.error(f"Failed to login API: {err}")
-        return False
-
+        return
+    if resumed:
+        _LOGGER.debug("Resumed the cached session.")
+    else:
+        entry_data[SESSION_CACHE].inventory_at = time.time()
+        # Statuses were read by the login.
+        entry_data[UPDATED_DATA].confirm(api.get_status(legacy=True))
+        for coordinator in entry_data[COORDINATOR].values():
+            coordinator.async_notify_changed(None)
+
+async def async_setup_account(hass, entry_id, api, metrics, cache, config, stale=(), session=None, device_names=None):
+    """Build the runtime data of an account under `hass.data[DOMAIN][entry_id]`.
+
+    Every account has its own API session, executor, status store,
+    coordinators and command pipeline, so accounts never wait on each other.
+    Devices in `stale` start from their cached status and are refreshed
+    right away in the background.
+
+    The account is logged in, unless `session` is given, in which case
+    `api` holds the devices restored from it and the session is connected
+    in the background.
+    """
     _LOGGER.debug(f"Backend version: {__version__}")
     _LOGGER.debug(f"Thing info: {[thing for thing in api.things.values()]}")
 
-    hass.data[DOMAIN] = {}
-    hass.data[DOMAIN][API] = api
-    hass.data[DOMAIN][UPDATE_DATA] = Queue()
-    hass.data[DOMAIN][UPDATED_DATA] = api.get_status(legacy=True)
-    hass.data[DOMAIN][COORDINATOR] = build_coordinator(hass, api)
-    
-    # Start jcihitachi components
-    _LOGGER.debug("Starting JciHitachi components.")
-    for platform in PLATFORMS:
-        discovery.load_platform(hass, platform, DOMAIN, {}, config)
+    entry_data = {}
+    hass.data.setdefault(DOMAIN, {})[entry_id] = entry_data
+    entry_data[API] = api
+    entry_data[METRICS] = metrics
+    # Cancel the tasks, timers and listeners of the account when it is unloaded.
+    entry_data[UNLOAD_CALLBACKS] = []
+    entry_data[UPDATED_DATA] = JciHitachiStatusStore(
+        api.get_status(legacy=True),
+        config.get(CONF_OPTIMISTIC_TIMEOUT, DEFAULT_OPTIMISTIC_TIMEOUT),
+        stale
+    )
+    entry_data[RATE_LIMITER] = JciHitachiRateLimiter(hass, metrics)
+    entry_data[CIRCUIT_BREAKER] = JciHitachiCircuitBreaker()
+    entry_data[API_EXECUTOR] = JciHitachiAPIExecutor(
+        hass, api, entry_data[RATE_LIMITER], entry_data[CIRCUIT_BREAKER])
+    entry_data[SESSION_CACHE] = cache
+    # Created first so that it takes the executor before any refresh or command.
+    resume = None
+    if session is not None:
+        resume = hass.async_create_background_task(
+            async_resume(hass, entry_data, session, device_names), f"{DOMAIN} {entry_id} resume")
+        entry_data[UNLOAD_CALLBACKS].append(resume.cancel)
+    entry_data[MONTHLY_CACHE] = JciHitachiMonthlyDataCache(
+        hass,
+        entry_id,
+        api,
+        metrics,
+        entry_data[RATE_LIMITER],
+        entry_data[CIRCUIT_BREAKER],
+        config.get(CONF_REFRESH_CONCURRENCY, DEFAULT_REFRESH_CONCURRENCY)
+    )
+    await entry_data[MONTHLY_CACHE].async_load()
+    entry_data[REFRESH_POOL] = JciHitachiRefreshPool(
+        hass,
+        api,
+        entry_data[API_EXECUTOR],
+        config.get(CONF_REFRESH_CONCURRENCY, DEFAULT_REFRESH_CONCURRENCY),
+        device_timeout=BASE_TIMEOUT
+    )
+    entry_data[COORDINATOR] = build_coordinators(
+        hass,
+        entry_data,
+        config.get(CONF_PUSH, DEFAULT_PUSH),
+        config.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL)
+    )
+    entry_data[UPDATE_DATA] = JciHitachiCommandPipeline(
+        hass,
+        api,
+        entry_data[API_EXECUTOR],
+        entry_data[COORDINATOR],
+        entry_data[UPDATED_DATA],
+        entry_data[METRICS]
+    )
+
+    async def async_subscribe():
+        if resume is not None:
+            await resume
+        entry_data[PUSH_LISTENER] = await async_start_push(hass, api, entry_data[COORDINATOR])
+
+    if config.get(CONF_PUSH, DEFAULT_PUSH):
+        if resume is None:
+            await async_subscribe()
+        else:
+            entry_data[UNLOAD_CALLBACKS].append(hass.async_create_background_task(
+                async_subscribe(), f"{DOMAIN} {entry_id} subscribe").cancel)
+
+    for name in stale:
+        entry_data[UNLOAD_CALLBACKS].append(hass.async_create_background_task(
+            entry_data[COORDINATOR][name].async_refresh(), f"{DOMAIN} {name} first refresh").cancel)
+
+    # Saved again periodically and on stop, as tokens are renewed and statuses change while running.
+    await cache.async_save(api)
+
+    async def async_save_session(now):
+        await cache.async_save(api)
+
+    entry_data[UNLOAD_CALLBACKS].append(
+        async_track_time_interval(hass, async_save_session, SESSION_SAVE_INTERVAL))
+
+    importer = JciHitachiStatisticsImporter(hass, api, entry_data[MONTHLY_CACHE])
+
+    async def async_import_statistics(now=None):
+        if resume is not None:
+            await resume
+        await importer.async_import()
+
+    entry_data[UNLOAD_CALLBACKS].extend([
+        hass.async_create_background_task(async_import_statistics(), f"{DOMAIN} {entry_id} statistics import").cancel,
+        async_track_time_interval(hass, async_import_statistics, STATISTICS_IMPORT_INTERVAL),
+        # Not a one-time listener, so that it can always be removed on unload.
+        hass.bus.async_listen(EVENT_HOMEASSISTANT_STOP, async_save_session),
+    ])
+
+    return entry_data
+
+async def async_unload_account(hass, entry_id):
+    """Tear down the runtime data of an account built by `async_setup_account`.
+
+    Commands queued so far are sent first, for at most
+    `COMMAND_FLUSH_TIMEOUT` seconds. The session is saved before it is
+    disconnected, so that setting the account up again, e.g. on a reload,
+    resumes it instead of logging in.
+    """
+    entry_data = hass.data.get(DOMAIN, {}).pop(entry_id, None)
+    if entry_data is None:
+        return
+    # Runtime data may be partial if the setup was cancelled.
+    for unsubscribe in entry_data.get(UNLOAD_CALLBACKS, []):
+        unsubscribe()
+    if UPDATE_DATA in entry_data:
+        await entry_data[UPDATE_DATA].async_shutdown(COMMAND_FLUSH_TIMEOUT)
+    if REFRESH_POOL in entry_data:
+        await entry_data[REFRESH_POOL].async_shutdown()
+    for coordinator in entry_data.get(COORDINATOR, {}).values():
+        await coordinator.async_shutdown()
+    if entry_data.get(PUSH_LISTENER) is not None:
+        await hass.async_add_executor_job(entry_data[PUSH_LISTENER].unsubscribe)
+    if MONTHLY_CACHE in entry_data:
+        await entry_data[MONTHLY_CACHE].async_save()
+
+    api = entry_data[API]
+    if SESSION_CACHE in entry_data:
+        await entry_data[SESSION_CACHE].async_save(api)
+    await hass.async_add_executor_job(close_session, api)
+    _LOGGER.debug(f"Unloaded account {entry_id}.")
+
+async def async_start_account(hass, entry_id, api, metrics, cache, config, session=None):
+    """Log an account in and set it up.
+
+    With a complete cached session, devices are set up right away from the
+    cached inventory and statuses while the session connects in the
+    background, so setup does not wait on the cloud. Otherwise the account
+    is logged in first.
+
+    `session` is used in place of the cached one if given.
+
+    Raises
+    ------
+    AssertionError
+        If configured devices are not available from the API.
+    ConfigEntryNotReady
+        If the login failed, Home Assistant retries the setup later.
+    """
+    device_names = api.device_names
+    if session is None:
+        session = await cache.async_load(device_names)
+    if session is not None and is_complete(session):
+        stale = restore_inventory(api, session)
+        await async_setup_account(
+            hass, entry_id, api, metrics, cache, config, stale, session=session, device_names=device_names)
+        return
+
+    try:
+        stale = await async_login(hass, api, cache, metrics, session)
+    except AssertionError:
+        raise
+    except Exception as err:
+        # Connected partway at most, the next attempt starts over with a new API instance.
+        await hass.async_add_executor_job(close_session, api)
+        raise ConfigEntryNotReady(f"Failed to login API: {err}") from err
+    await async_setup_account(hass, entry_id, api, metrics, cache, config, stale)
+
+async def async_setup(hass, config):
+    """Set up from the configuration.yaml"""
+    async_register_services(hass)
+
+    if config.get(DOMAIN, None) is None:
+        # skip if no config defined in configuration.yaml"""
+        return True
+
+    # Imported into a config entry, so that the account can be unloaded and reloaded like one.
+    hass.async_create_task(
+        hass.config_entries.flow.async_init(
+            DOMAIN, context={"source": SOURCE_IMPORT}, data=dict(config[DOMAIN])
+        )
+    )
 
     # Return boolean to indicate that initialization was successful.
     return True
@@ -125,51 +407,61 @@ async def async_setup_entry(hass, config_entry):
             "CONF_EMAIL": config.get(CONF_EMAIL),
             "CONF_PASSWORD": '*' * len(config.get(CONF_PASSWORD)),
             "CONF_RETRY": config.get(CONF_RETRY),
-            "CONF_DEVICES": config.get(CONF_DEVICES)
+            "CONF_DEVICES": config.get(CONF_DEVICES),
+            "CONF_PUSH": config.get(CONF_PUSH, DEFAULT_PUSH),
+            "CONF_MAX_UPDATE_INTERVAL": config.get(CONF_MAX_UPDATE_INTERVAL, DEFAULT_MAX_UPDATE_INTERVAL),
+            "CONF_OPTIMISTIC_TIMEOUT": config.get(CONF_OPTIMISTIC_TIMEOUT, DEFAULT_OPTIMISTIC_TIMEOUT),
+            "CONF_REFRESH_CONCURRENCY": config.get(CONF_REFRESH_CONCURRENCY, DEFAULT_REFRESH_CONCURRENCY)
         }
     )
 
     if config.get(CONF_DEVICES) == []:
         config[CONF_DEVICES] = None
 
-    if DOMAIN not in hass.data:
-        api = JciHitachiAWSAPI(
-            email=config.get(CONF_EMAIL),
-            password=config.get(CONF_PASSWORD),
-            device_names=config.get(CONF_DEVICES),
-            max_retries=config.get(CONF_RETRY),
-        )
-
-        try:
-            await hass.async_add_executor_job(api.login)
-        except AssertionError as err:
-            _LOGGER.error(f"Assertion check error: {err}")
-            return False
-        except RuntimeError as err:
-            _LOGGER.error(f"Failed to login API: {err}")
-            return False
-        
-        hass.data[DOMAIN] = {}
-        hass.data[DOMAIN][API] = api
-    else:
-        assert API in hass.data[DOMAIN], f"The storage for {DOMAIN} exists but the API instance does not."
-        _LOGGER.debug("The API instance has been created in config flow, skipping login.")
-
-    _LOGGER.debug(f"Backend version: {__version__}")
-    _LOGGER.debug(f"Thing info: {[thing for thing in hass.data[DOMAIN][API].things.values()]}")
+    metrics = JciHitachiMetrics()
+    cache = JciHitachiSessionCache(
+        hass, config_entry.entry_id, config.get(CONF_EMAIL), config.get(CONF_PASSWORD))
+    # The config flow leaves the session it validated the account with.
+    session = hass.data.get(DOMAIN, {}).get(VALIDATED_SESSION, {}).pop(config.get(CONF_EMAIL), None)
+    if session is not None:
+        _LOGGER.debug("The session has been created in config flow, skipping authentication.")
+        cache.inventory_at = time.time()
 
-    hass.data[DOMAIN][UPDATE_DATA] = Queue()
-    hass.data[DOMAIN][UPDATED_DATA] = hass.data[DOMAIN][API].get_status(legacy=True)
-    hass.data[DOMAIN][COORDINATOR] = build_coordinator(hass, hass.data[DOMAIN][API])
+    api = JciHitachiAWSAPI(
+        email=config.get(CONF_EMAIL),
+        password=config.get(CONF_PASSWORD),
+        device_names=config.get(CONF_DEVICES),
+        max_retries=config.get(CONF_RETRY),
+    )
+    try:
+        await async_start_account(hass, config_entry.entry_id, api, metrics, cache, config, session)
+    except AssertionError as err:
+        _LOGGER.error(f"Assertion check error: {err}")
+        return False
 
     # Start jcihitachi components
-    _LOGGER.debug("Starting JciHitachi components.") 
+    _LOGGER.debug("Starting JciHitachi components.")
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
-        
-    
+
     # Return boolean to indicate that initialization was successful.
     return True
 
+async def async_unload_entry(hass, config_entry):
+    """Unload a config entry."""
+    if not await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS):
+        return False
+    await async_unload_account(hass, config_entry.entry_id)
+    return True
+
+
+async def async_remove_entry(hass, config_entry):
+    """Remove the cached session and monthly data of a removed config entry."""
+    config = config_entry.data.get(DOMAIN, {})
+    cache = JciHitachiSessionCache(
+        hass, config_entry.entry_id, config.get(CONF_EMAIL), config.get(CONF_PASSWORD))
+    await cache.async_remove()
+    await async_remove_monthly_data(hass, config_entry.entry_id)
+
 
 @dataclass
 class UpdateData:
@@ -180,29 +472,65 @@ class UpdateData:
 
 
 class JciHitachiEntity(CoordinatorEntity):
+    # Status names the entity's state is derived from, None for all.
+    _status_names = None
+    # Appended to the thing's name to form the entity's name.
+    _name_suffix = ""
+
     def __init__(self, thing, coordinator):
         super().__init__(coordinator)
         self._thing = thing
+        self._prev_available = thing.available
+        self._entry_data = coordinator.entry_data
+        self._store = coordinator.store
+        self._name = f"{thing.name}{self._name_suffix}"
+        self._device_info = {
+            "identifiers": {(DOMAIN, thing.gateway_mac_address)},
+            "name": thing.name,
+            "manufacturer": thing.brand,
+            "model": thing.model,
+            "sw_version": thing.firmware_version,
+        }
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if a status the entity reads or its availability changed."""
+        changed = self.coordinator.data
+        available = self.available
+        if (
+            changed is None
+            or self._status_names is None
+            or available != self._prev_available
+            or not changed.isdisjoint(self._status_names)
+        ):
+            self._prev_available = available
+            self.async_write_ha_state()
 
     @property
     def available(self) -> bool:
         return self._thing.available
 
+    @property
+    def extra_state_attributes(self):
+        """Flag a status restored from disk or missed by the last refresh."""
+        if self._thing.name in self._store.stale:
+            return {"stale": True}
+        return None
+
     @property
     def device_info(self) -> dict:
         """Return device info of the entity."""
-        return {
-            "identifiers": {(DOMAIN, self._thing.gateway_mac_address)},
-            "name": self._thing.name,
-            "manufacturer": self._thing.brand,
-            "model": self._thing.model,
-            "sw_version": self._thing.firmware_version,
-        }
+        return self._device_info
 
     @property
     def name(self):
-        """Return the thing's name."""
-        return self._thing.name
+        """Return the entity's name."""
+        return self._name
+
+    @property
+    def _status(self):
+        """Latest legacy status of the thing."""
+        return self._store.get(self._thing.name)
 
     @property
     def unique_id(self):
@@ -210,8 +538,8 @@ class JciHitachiEntity(CoordinatorEntity):
         raise NotImplementedError
     
     def put_queue(self, status_name, status_value=None, status_str_value=None):
-        """Put data into the queue to update status"""
-        self.hass.data[DOMAIN][UPDATE_DATA].put(
+        """Put data into the device's command queue to update status"""
+        self._entry_data[UPDATE_DATA].put(
             UpdateData(
                 status_name=status_name,
                 device_name=self._thing.name,
@@ -219,26 +547,16 @@ class JciHitachiEntity(CoordinatorEntity):
                 status_str_value=status_str_value
             )
         )
-    
-    def update(self):
-        """Update latest status."""
-        api = self.hass.data[DOMAIN][API]
-
-        while self.hass.data[DOMAIN][UPDATE_DATA].qsize() > 0:
-            data = self.hass.data[DOMAIN][UPDATE_DATA].get()
-            _LOGGER.debug(f"Updating data: {data}")
-            result = api.set_status(**vars(data))
-            if result is True:
-                _LOGGER.debug(f"Data: {data} updated successfully.")
-            else:
-                _LOGGER.error("Failed to update data.")
-
-        # Here we don't need to refresh status as it was refreshed by `api.set_status`.
-        self.hass.data[DOMAIN][UPDATED_DATA] = api.get_status(legacy=True)
-        
-        _LOGGER.debug(
-            f"Latest data: {[(name, value.status) for name, value in self.hass.data[DOMAIN][UPDATED_DATA].items()]}"
-        )
-        
-        # Important: We have to reset the update scheduler to prevent old status from wrongly being loaded. 
-        self.hass.loop.call_soon_threadsafe(self.coordinator.async_set_updated_data, None)
+
+    def put_mapped(self, mapping, ha_value):
+        """Queue the statuses `mapping` writes for `ha_value`. Returns False if it is unknown."""
+        updates = mapping.to_backend(ha_value)
+        if updates is None:
+            return False
+        for status_name, status_str_value in updates:
+            self.put_queue(status_name=status_name, status_str_value=status_str_value)
+        return True
+
+    async def async_flush_queue(self):
+        """Show the queued commands at once and wait until they are sent."""
+        await self._entry_data[UPDATE_DATA].async_flush(self._thing.name)
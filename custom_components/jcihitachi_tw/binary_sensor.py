@@ -4,44 +4,42 @@ import logging
 from homeassistant.components.binary_sensor import (BinarySensorDeviceClass,
                                                     BinarySensorEntity)
 
-from . import API, COORDINATOR, DOMAIN, UPDATED_DATA, JciHitachiEntity
+from . import API, COORDINATOR, DOMAIN, JciHitachiEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 
-async def _async_setup(hass, async_add):
-    api = hass.data[DOMAIN][API]
-    coordinator = hass.data[DOMAIN][COORDINATOR]
+async def _async_setup(hass, entry_id, async_add):
+    entry_data = hass.data[DOMAIN][entry_id]
+    api = entry_data[API]
+    coordinators = entry_data[COORDINATOR]
 
+    entities = []
     for thing in api.things.values():
+        coordinator = coordinators[thing.name]
         if thing.type == "DH":
-            async_add(
+            entities.extend(
                 [JciHitachiErrorBinarySensorEntity(thing, coordinator),
-                 JciHitachiWaterFullBinarySensorEntity(thing, coordinator)],
-                update_before_add=True)
-
-async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
-    """Set up the binary_sensor platform."""
-    await _async_setup(hass, async_add_entities)
+                 JciHitachiWaterFullBinarySensorEntity(thing, coordinator)])
+    # States come from the status already loaded during setup.
+    async_add(entities)
 
 async def async_setup_entry(hass, config_entry, async_add_devices):
     """Set up the binary_sensor platform from a config entry."""
-    await _async_setup(hass, async_add_devices)
+    await _async_setup(hass, config_entry.entry_id, async_add_devices)
 
 
 class JciHitachiErrorBinarySensorEntity(JciHitachiEntity, BinarySensorEntity):
+    _status_names = ("error_code",)
+    _name_suffix = " Error"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Error"
-
     @property
     def is_on(self):
         """Indicate whether an error occurred."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA].get(self._thing.name, None)
+        status = self._status
         if status:
             if status.error_code == 0:
                 return False
@@ -59,18 +57,16 @@ class JciHitachiErrorBinarySensorEntity(JciHitachiEntity, BinarySensorEntity):
 
 
 class JciHitachiWaterFullBinarySensorEntity(JciHitachiEntity, BinarySensorEntity):
+    _status_names = ("water_full_warning",)
+    _name_suffix = " Water Full Warning"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Water Full Warning"
-
     @property
     def is_on(self):
         """Indicate whether the water tank is full."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA].get(self._thing.name, None)
+        status = self._status
         if status:
             if status.water_full_warning == "off":
                 return False
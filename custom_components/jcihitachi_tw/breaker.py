@@ -0,0 +1,137 @@
+"""JciHitachi integration."""
+import logging
+import random
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Consecutive failed calls opening the circuit.
+DEFAULT_FAILURE_THRESHOLD = 5
+# Backoff before the first probe, doubled on every failed probe up to the maximum.
+DEFAULT_BASE_BACKOFF = 10.0
+DEFAULT_MAX_BACKOFF = 600.0
+# Calls at once that, once admitted while recovering, close the circuit.
+DEFAULT_RAMP = 8
+
+
+class CircuitOpenError(RuntimeError):
+    """A cloud call was rejected without being sent as the cloud is failing."""
+
+
+class JciHitachiCircuitBreaker:
+    """Fail cloud calls of an account fast while the cloud is failing.
+
+    After `failure_threshold` consecutive failed calls the circuit opens
+    and calls are rejected with `CircuitOpenError`. Once a jittered
+    exponential backoff has passed, it is half open: a single probe call is
+    admitted, then twice as many at once after every round of successful
+    ones, and the circuit closes once `ramp` calls at once would be
+    admitted. A failed probe opens it again with a doubled backoff.
+
+    Only to be used from the event loop.
+
+    Parameters
+    ----------
+    failure_threshold : int, optional
+        Consecutive failures opening the circuit, by default `DEFAULT_FAILURE_THRESHOLD`.
+    base_backoff : float, optional
+        Seconds before the first probe, by default `DEFAULT_BASE_BACKOFF`.
+    max_backoff : float, optional
+        Longest backoff in seconds, by default `DEFAULT_MAX_BACKOFF`.
+    ramp : int, optional
+        Calls at once closing the circuit once admitted, by default `DEFAULT_RAMP`.
+    """
+
+    def __init__(
+        self,
+        failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+        base_backoff=DEFAULT_BASE_BACKOFF,
+        max_backoff=DEFAULT_MAX_BACKOFF,
+        ramp=DEFAULT_RAMP,
+    ):
+        self._failure_threshold = failure_threshold
+        self._base_backoff = base_backoff
+        self._max_backoff = max_backoff
+        self._ramp = ramp
+        self.state = STATE_CLOSED
+        self._failures = 0
+        self._opened = 0
+        self._retry_at = 0.0
+        self._allowed = 1
+        self._succeeded = 0
+        self._in_flight = 0
+
+    def before_call(self):
+        """Admit a call, to be followed by `record_success` or `record_failure`.
+
+        Raises
+        ------
+        CircuitOpenError
+            If the call is not admitted.
+        """
+        if self.state == STATE_OPEN:
+            remaining = self._retry_at - time.monotonic()
+            if remaining > 0:
+                raise CircuitOpenError(f"The cloud is failing, next attempt in {remaining:.0f} s.")
+            self.state = STATE_HALF_OPEN
+            self._allowed = 1
+            self._succeeded = 0
+            _LOGGER.debug("Probing the cloud.")
+        if self.state == STATE_HALF_OPEN and self._in_flight >= self._allowed:
+            raise CircuitOpenError("The cloud is recovering, too many calls at once.")
+        self._in_flight += 1
+
+    def record_success(self):
+        """Record an admitted call that succeeded."""
+        self._in_flight -= 1
+        self._failures = 0
+        if self.state != STATE_HALF_OPEN:
+            return
+        self._succeeded += 1
+        if self._succeeded < self._allowed:
+            return
+        self._allowed *= 2
+        self._succeeded = 0
+        if self._allowed >= self._ramp:
+            _LOGGER.info("The cloud recovered, resuming cloud calls.")
+            self.state = STATE_CLOSED
+            self._opened = 0
+
+    def record_cancelled(self):
+        """Record an admitted call that was not sent."""
+        self._in_flight -= 1
+
+    def record_failure(self):
+        """Record an admitted call that failed."""
+        self._in_flight -= 1
+        self._failures += 1
+        if self.state == STATE_HALF_OPEN or (
+            self.state == STATE_CLOSED and self._failures >= self._failure_threshold
+        ):
+            self._open()
+
+    def _open(self):
+        backoff = min(self._max_backoff, self._base_backoff * 2 ** self._opened)
+        # Equal jitter, so accounts and restarts do not probe in lockstep.
+        backoff = backoff / 2 + random.uniform(0, backoff / 2)
+        self._opened += 1
+        self._retry_at = time.monotonic() + backoff
+        if self.state == STATE_CLOSED:
+            _LOGGER.warning(f"{self._failures} consecutive cloud calls failed, pausing cloud calls for {backoff:.0f} s.")
+        else:
+            _LOGGER.debug(f"Probe failed, pausing cloud calls for {backoff:.0f} s.")
+        self.state = STATE_OPEN
+
+    def as_dict(self):
+        """Snapshot of the circuit, e.g. for diagnostics."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "backoff_level": self._opened,
+            "retry_in": max(0.0, self._retry_at - time.monotonic()) if self.state == STATE_OPEN else None,
+            "allowed_calls": self._allowed if self.state == STATE_HALF_OPEN else None,
+        }
@@ -14,7 +14,8 @@ from homeassistant.components.climate.const import (FAN_AUTO, FAN_DIFFUSE,
                                                     SWING_OFF, SWING_VERTICAL)
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
 
-from . import API, COORDINATOR, DOMAIN, UPDATED_DATA, JciHitachiEntity
+from . import API, COORDINATOR, DOMAIN, JciHitachiEntity
+from .mapping import StatusMapping
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -67,33 +68,120 @@ SUPPORT_HVAC = [
 ]
 
 
-async def _async_setup(hass, async_add):
-    api = hass.data[DOMAIN][API]
-    coordinator = hass.data[DOMAIN][COORDINATOR]
-
+HVAC_MAPPING = StatusMapping(
+    ("power", "mode"),
+    {
+        HVACMode.OFF: ("off", None),
+        HVACMode.COOL: ("on", "cool"),
+        HVACMode.DRY: ("on", "dry"),
+        HVACMode.FAN_ONLY: ("on", "fan"),
+        HVACMode.AUTO: ("on", "auto"),
+        HVACMode.HEAT: ("on", "heat"),
+    },
+    # Any mode while powered off reads as off, the mode decides otherwise.
+    aliases=[
+        (("off", None), HVACMode.OFF),
+        ((None, "cool"), HVACMode.COOL),
+        ((None, "dry"), HVACMode.DRY),
+        ((None, "fan"), HVACMode.FAN_ONLY),
+        ((None, "auto"), HVACMode.AUTO),
+        ((None, "heat"), HVACMode.HEAT),
+    ],
+)
+PRESET_MAPPING = StatusMapping(
+    ("energy_save", "mold_prev", "fast_op"),
+    {
+        PRESET_NONE: ("disabled", "disabled", "disabled"),
+        PRESET_ECO: ("enabled", "disabled", "disabled"),
+        PRESET_MOLD_PREVENTION: ("disabled", "enabled", "disabled"),
+        PRESET_ECO_MOLD_PREVENTION: ("enabled", "enabled", "disabled"),
+        PRESET_BOOST: ("disabled", "disabled", "enabled"),
+    },
+    aliases=[
+        (("enabled", "enabled", None), PRESET_ECO_MOLD_PREVENTION),
+        (("enabled", None, None), PRESET_ECO),
+        ((None, "enabled", None), PRESET_MOLD_PREVENTION),
+        ((None, None, "enabled"), PRESET_BOOST),
+    ],
+    default=PRESET_NONE,
+)
+FAN_MAPPING = StatusMapping(
+    ("air_speed",),
+    {
+        FAN_AUTO: ("auto",),
+        FAN_SILENT: ("silent",),
+        FAN_LOW: ("low",),
+        FAN_MEDIUM: ("moderate",),
+        FAN_HIGH: ("high",),
+        FAN_RAPID: ("rapid",),
+        FAN_EXPRESS: ("express",),
+    },
+)
+SWING_MAPPING = StatusMapping(
+    ("vertical_wind_swingable", "horizontal_wind_direction"),
+    {
+        SWING_OFF: ("disabled", "central"),
+        SWING_VERTICAL: ("enabled", "central"),
+        SWING_HORIZONTAL: ("disabled", "auto"),
+        SWING_BOTH: ("enabled", "auto"),
+        SWING_HORIZONTAL_LEFTMOST: ("disabled", "leftmost"),
+        SWING_HORIZONTAL_MIDDLE_LEFT: ("disabled", "middleleft"),
+        SWING_HORIZONTAL_MIDDLE_RIGHT: ("disabled", "middleright"),
+        SWING_HORIZONTAL_RIGHTMOST: ("disabled", "rightmost"),
+        SWING_HORIZONTAL_LEFTMOST_VERTICAL_SWING: ("enabled", "leftmost"),
+        SWING_HORIZONTAL_MIDDLE_LEFT_VERTICAL_SWING: ("enabled", "middleleft"),
+        SWING_HORIZONTAL_MIDDLE_RIGHT_VERTICAL_SWING: ("enabled", "middleright"),
+        SWING_HORIZONTAL_RIGHTMOST_VERTICAL_SWING: ("enabled", "rightmost"),
+    },
+    # Unknown horizontal directions read as vertical swing or off.
+    aliases=[
+        (("enabled", None), SWING_VERTICAL),
+        ((None, "auto"), SWING_HORIZONTAL),
+        ((None, "leftmost"), SWING_HORIZONTAL_LEFTMOST),
+        ((None, "middleleft"), SWING_HORIZONTAL_MIDDLE_LEFT),
+        ((None, "middleright"), SWING_HORIZONTAL_MIDDLE_RIGHT),
+        ((None, "rightmost"), SWING_HORIZONTAL_RIGHTMOST),
+    ],
+    default=SWING_OFF,
+)
+
+
+async def _async_setup(hass, entry_id, async_add):
+    entry_data = hass.data[DOMAIN][entry_id]
+    api = entry_data[API]
+    coordinators = entry_data[COORDINATOR]
+
+    entities = []
     for thing in api.things.values():
+        coordinator = coordinators[thing.name]
         if thing.type == "AC":
-            async_add(
-                [JciHitachiClimateEntity(thing, coordinator)],
-                update_before_add=True
-            )
-
-async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
-    """Set up the climate platform."""
-    await _async_setup(hass, async_add_entities)
+            entities.append(JciHitachiClimateEntity(thing, coordinator))
+    # States come from the status already loaded during setup.
+    async_add(entities)
 
 async def async_setup_entry(hass, config_entry, async_add_devices):
     """Set up the climate platform from a config entry."""
-    await _async_setup(hass, async_add_devices)
+    await _async_setup(hass, config_entry.entry_id, async_add_devices)
 
 
 class JciHitachiClimateEntity(JciHitachiEntity, ClimateEntity):
+    _status_names = (
+        "power", "mode", "air_speed", "target_temp", "indoor_temp", "max_temp",
+        "min_temp", "energy_save", "mold_prev", "fast_op", "vertical_wind_swingable",
+        "horizontal_wind_direction",
+    )
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
         self._supported_features = self.calculate_supported_features()
-        self._supported_fan_modes = [fan_mode for i, fan_mode in enumerate(SUPPORT_FAN) if 2 ** i & self._thing.support_code.FanSpeed != 0]
-        self._supported_hvac = [SUPPORT_HVAC[0]] + [hvac for i, hvac in enumerate(SUPPORT_HVAC[1:]) if 2 ** i & self._thing.support_code.Mode != 0]
-        self._supported_presets = self.calculate_supported_presets()
+        self._fan_mapping = FAN_MAPPING.restrict(
+            [fan_mode for i, fan_mode in enumerate(SUPPORT_FAN) if 2 ** i & self._thing.support_code.FanSpeed != 0])
+        self._hvac_mapping = HVAC_MAPPING.restrict(
+            [SUPPORT_HVAC[0]] + [hvac for i, hvac in enumerate(SUPPORT_HVAC[1:]) if 2 ** i & self._thing.support_code.Mode != 0])
+        self._preset_mapping = PRESET_MAPPING.restrict(self.calculate_supported_presets())
+        self._supported_fan_modes = self._fan_mapping.options
+        self._supported_hvac = self._hvac_mapping.options
+        self._supported_presets = self._preset_mapping.options
         self._prev_target = self._thing.support_code.min_temp
 
     @property
@@ -109,7 +197,7 @@ class JciHitachiClimateEntity(JciHitachiEntity, ClimateEntity):
     @property
     def current_temperature(self):
         """Return the current temperature."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
             return status.indoor_temp
         return None
@@ -117,14 +205,14 @@ class JciHitachiClimateEntity(JciHitachiEntity, ClimateEntity):
     @property
     def target_temperature(self):
         """Return the target temperature."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
             if status.target_temp == 65535:
                 if status.mode in ["fan", "auto"]:
-                    _LOGGER.debug(f"no target temp defined in {status.mode} mode, returning previous target: {self._prev_target}")
+                    _LOGGER.debug("no target temp defined in %s mode, returning previous target: %s", status.mode, self._prev_target)
                     return self._prev_target
                 if status.energy_save == "enabled":
-                    _LOGGER.debug(f"no target temp defined in eco mode, returning previous target: {self._prev_target}")
+                    _LOGGER.debug("no target temp defined in eco mode, returning previous target: %s", self._prev_target)
                     return self._prev_target
             else:
                 self._prev_target = status.target_temp
@@ -140,31 +228,22 @@ class JciHitachiClimateEntity(JciHitachiEntity, ClimateEntity):
     @property
     def max_temp(self):
         """Return the maximum temperature."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         return status.max_temp
     
     @property
     def min_temp(self):
         """Return the minimum temperature."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         return status.min_temp
 
     @property
     def hvac_mode(self):
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
-            if status.power == "off":
-                return HVACMode.OFF
-            elif status.mode == "cool":
-                return HVACMode.COOL
-            elif status.mode == "dry":
-                return HVACMode.DRY
-            elif status.mode == "fan":
-                return HVACMode.FAN_ONLY
-            elif status.mode == "auto":
-                return HVACMode.AUTO
-            elif status.mode == "heat":
-                return HVACMode.HEAT
+            hvac_mode = HVAC_MAPPING.to_ha(status)
+            if hvac_mode is not None:
+                return hvac_mode
 
         _LOGGER.error("Missing hvac_mode")
         return None
@@ -175,18 +254,9 @@ class JciHitachiClimateEntity(JciHitachiEntity, ClimateEntity):
     
     @property
     def preset_mode(self):
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
-            if status.energy_save == "enabled" and status.mold_prev == "enabled":
-                return PRESET_ECO_MOLD_PREVENTION
-            elif status.energy_save == "enabled":
-                return PRESET_ECO
-            elif status.mold_prev == "enabled":
-                return PRESET_MOLD_PREVENTION
-            elif status.fast_op == "enabled":
-                return PRESET_BOOST
-            else:
-                return PRESET_NONE
+            return PRESET_MAPPING.to_ha(status)
         _LOGGER.error("Missing preset_mode")
         return None
 
@@ -196,22 +266,11 @@ class JciHitachiClimateEntity(JciHitachiEntity, ClimateEntity):
 
     @property
     def fan_mode(self):
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
-            if status.air_speed == "auto":
-                return FAN_AUTO
-            elif status.air_speed == "silent":
-                return FAN_SILENT
-            elif status.air_speed == "low":
-                return FAN_LOW
-            elif status.air_speed == "moderate":
-                return FAN_MEDIUM
-            elif status.air_speed == "high":
-                return FAN_HIGH
-            elif status.air_speed == "rapid":
-                return FAN_RAPID
-            elif status.air_speed == "express":
-                return FAN_EXPRESS
+            fan_mode = FAN_MAPPING.to_ha(status)
+            if fan_mode is not None:
+                return fan_mode
         _LOGGER.error("Missing fan_mode.")
         return None
     
@@ -221,32 +280,9 @@ class JciHitachiClimateEntity(JciHitachiEntity, ClimateEntity):
     
     @property
     def swing_mode(self):
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
-            if status.vertical_wind_swingable == "enabled":
-                if status.horizontal_wind_direction == "auto":
-                    return SWING_BOTH
-                elif status.horizontal_wind_direction == "leftmost":
-                    return SWING_HORIZONTAL_LEFTMOST_VERTICAL_SWING
-                elif status.horizontal_wind_direction == "middleleft":
-                    return SWING_HORIZONTAL_MIDDLE_LEFT_VERTICAL_SWING
-                elif status.horizontal_wind_direction == "middleright":
-                    return SWING_HORIZONTAL_MIDDLE_RIGHT_VERTICAL_SWING
-                elif status.horizontal_wind_direction == "rightmost":
-                    return SWING_HORIZONTAL_RIGHTMOST_VERTICAL_SWING
-                return SWING_VERTICAL
-            else:
-                if status.horizontal_wind_direction == "auto":
-                    return SWING_HORIZONTAL
-                elif status.horizontal_wind_direction == "leftmost":
-                    return SWING_HORIZONTAL_LEFTMOST
-                elif status.horizontal_wind_direction == "middleleft":
-                    return SWING_HORIZONTAL_MIDDLE_LEFT
-                elif status.horizontal_wind_direction == "middleright":
-                    return SWING_HORIZONTAL_MIDDLE_RIGHT
-                elif status.horizontal_wind_direction == "rightmost":
-                    return SWING_HORIZONTAL_RIGHTMOST
-                return SWING_OFF
+            return SWING_MAPPING.to_ha(status)
         _LOGGER.error("Missing swing_mode.")
         return None
 
@@ -280,135 +316,57 @@ class JciHitachiClimateEntity(JciHitachiEntity, ClimateEntity):
             supported_presets.append(PRESET_BOOST)
         return supported_presets
 
-    def turn_on(self):
+    async def async_turn_on(self):
         """Turn the device on."""
         _LOGGER.debug(f"Turn {self.name} on")
         self.put_queue(status_name="power", status_str_value="on")
-        self.update()
+        await self.async_flush_queue()
         
-    def set_hvac_mode(self, hvac_mode):
+    async def async_set_hvac_mode(self, hvac_mode):
         """Set new target hvac mode."""
 
         _LOGGER.debug(f"Set {self.name} hvac_mode to {hvac_mode}")
 
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
-        if status.power == "off" and hvac_mode != HVACMode.OFF:
-            self.put_queue(status_name="power", status_str_value="on")
-
-        if hvac_mode == HVACMode.OFF:
-            self.put_queue(status_name="power", status_str_value="off")
-        elif hvac_mode == HVACMode.COOL:
-            self.put_queue(status_name="mode", status_str_value="cool")
-        elif hvac_mode == HVACMode.DRY:
-            self.put_queue(status_name="mode", status_str_value="dry")
-        elif hvac_mode == HVACMode.FAN_ONLY:
-            self.put_queue(status_name="mode", status_str_value="fan")
-        elif hvac_mode == HVACMode.AUTO:
-            self.put_queue(status_name="mode", status_str_value="auto")
-        elif hvac_mode == HVACMode.HEAT:
-            self.put_queue(status_name="mode", status_str_value="heat")
-        else:
+        status = self._status
+        updates = self._hvac_mapping.to_backend(hvac_mode)
+        if updates is None:
             _LOGGER.error("Invalid hvac_mode.")
-        self.update()
-
-    def set_preset_mode(self, preset_mode):
+        else:
+            for status_name, status_str_value in updates:
+                # Only power on if needed, the mode carries the change otherwise.
+                if status_name == "power" and status_str_value == "on" and status.power != "off":
+                    continue
+                self.put_queue(status_name=status_name, status_str_value=status_str_value)
+        await self.async_flush_queue()
+
+    async def async_set_preset_mode(self, preset_mode):
         """Set new target preset mode."""
 
         _LOGGER.debug(f"Set {self.name} preset_mode to {preset_mode}")
-        
-        if preset_mode == PRESET_ECO_MOLD_PREVENTION:
-            self.put_queue(status_name="energy_save", status_str_value="enabled")
-            self.put_queue(status_name="mold_prev", status_str_value="enabled")
-            self.put_queue(status_name="fast_op", status_str_value="disabled")
-        elif preset_mode == PRESET_ECO:
-            self.put_queue(status_name="energy_save", status_str_value="enabled")
-            self.put_queue(status_name="mold_prev", status_str_value="disabled")
-            self.put_queue(status_name="fast_op", status_str_value="disabled")
-        elif preset_mode == PRESET_MOLD_PREVENTION:
-            self.put_queue(status_name="energy_save", status_str_value="disabled")
-            self.put_queue(status_name="mold_prev", status_str_value="enabled")
-            self.put_queue(status_name="fast_op", status_str_value="disabled")
-        elif preset_mode == PRESET_BOOST:
-            self.put_queue(status_name="energy_save", status_str_value="disabled")
-            self.put_queue(status_name="mold_prev", status_str_value="disabled")
-            self.put_queue(status_name="fast_op", status_str_value="enabled")
-        elif preset_mode == PRESET_NONE:
-            self.put_queue(status_name="energy_save", status_str_value="disabled")
-            self.put_queue(status_name="mold_prev", status_str_value="disabled")
-            self.put_queue(status_name="fast_op", status_str_value="disabled")
-        else:
+
+        if not self.put_mapped(self._preset_mapping, preset_mode):
             _LOGGER.error("Invalid preset_mode.")
-        self.update()
+        await self.async_flush_queue()
 
-    def set_fan_mode(self, fan_mode):
+    async def async_set_fan_mode(self, fan_mode):
         """Set new target fan mode."""
 
         _LOGGER.debug(f"Set {self.name} fan_mode to {fan_mode}")
 
-        if fan_mode == FAN_AUTO:
-            self.put_queue(status_name="air_speed", status_str_value="auto")
-        elif fan_mode == FAN_SILENT:
-            self.put_queue(status_name="air_speed", status_str_value="silent")
-        elif fan_mode == FAN_LOW:
-            self.put_queue(status_name="air_speed", status_str_value="low")
-        elif fan_mode == FAN_MEDIUM:
-            self.put_queue(status_name="air_speed", status_str_value="moderate")
-        elif fan_mode == FAN_HIGH:
-            self.put_queue(status_name="air_speed", status_str_value="high")
-        elif fan_mode == FAN_RAPID:
-            self.put_queue(status_name="air_speed", status_str_value="rapid")
-        elif fan_mode == FAN_EXPRESS:
-            self.put_queue(status_name="air_speed", status_str_value="express")
-        else:
+        if not self.put_mapped(self._fan_mapping, fan_mode):
             _LOGGER.error("Invalid fan_mode.")
-        self.update()
+        await self.async_flush_queue()
 
-    def set_swing_mode(self, swing_mode):
+    async def async_set_swing_mode(self, swing_mode):
         """Set new swing mode."""
 
         _LOGGER.debug(f"Set {self.name} swing_mode to {swing_mode}")
 
-        if swing_mode == SWING_OFF:
-            self.put_queue(status_name="vertical_wind_swingable", status_str_value="disabled")
-            self.put_queue(status_name="horizontal_wind_direction", status_str_value="central")
-        elif swing_mode == SWING_VERTICAL:
-            self.put_queue(status_name="vertical_wind_swingable", status_str_value="enabled")
-            self.put_queue(status_name="horizontal_wind_direction", status_str_value="central")
-        elif swing_mode == SWING_HORIZONTAL:
-            self.put_queue(status_name="vertical_wind_swingable", status_str_value="disabled")
-            self.put_queue(status_name="horizontal_wind_direction", status_str_value="auto")
-        elif swing_mode == SWING_BOTH:
-            self.put_queue(status_name="vertical_wind_swingable",  status_str_value="enabled")
-            self.put_queue(status_name="horizontal_wind_direction", status_str_value="auto")
-        elif swing_mode == SWING_HORIZONTAL_LEFTMOST:
-            self.put_queue(status_name="vertical_wind_swingable", status_str_value="disabled")
-            self.put_queue(status_name="horizontal_wind_direction", status_str_value="leftmost")
-        elif swing_mode == SWING_HORIZONTAL_MIDDLE_LEFT:
-            self.put_queue(status_name="vertical_wind_swingable", status_str_value="disabled")
-            self.put_queue(status_name="horizontal_wind_direction", status_str_value="middleleft")
-        elif swing_mode == SWING_HORIZONTAL_MIDDLE_RIGHT:
-            self.put_queue(status_name="vertical_wind_swingable", status_str_value="disabled")
-            self.put_queue(status_name="horizontal_wind_direction", status_str_value="middleright")
-        elif swing_mode == SWING_HORIZONTAL_RIGHTMOST:
-            self.put_queue(status_name="vertical_wind_swingable", status_str_value="disabled")
-            self.put_queue(status_name="horizontal_wind_direction", status_str_value="rightmost")
-        elif swing_mode == SWING_HORIZONTAL_LEFTMOST_VERTICAL_SWING:
-            self.put_queue(status_name="vertical_wind_swingable", status_str_value="enabled")
-            self.put_queue(status_name="horizontal_wind_direction", status_str_value="leftmost")
-        elif swing_mode == SWING_HORIZONTAL_MIDDLE_LEFT_VERTICAL_SWING:
-            self.put_queue(status_name="vertical_wind_swingable", status_str_value="enabled")
-            self.put_queue(status_name="horizontal_wind_direction", status_str_value="middleleft")
-        elif swing_mode == SWING_HORIZONTAL_MIDDLE_RIGHT_VERTICAL_SWING:
-            self.put_queue(status_name="vertical_wind_swingable", status_str_value="enabled")
-            self.put_queue(status_name="horizontal_wind_direction", status_str_value="middleright")
-        elif swing_mode == SWING_HORIZONTAL_RIGHTMOST_VERTICAL_SWING:
-            self.put_queue(status_name="vertical_wind_swingable", status_str_value="enabled")
-            self.put_queue(status_name="horizontal_wind_direction", status_str_value="rightmost")
-        else:
+        if not self.put_mapped(SWING_MAPPING, swing_mode):
             _LOGGER.error("Invalid swing_mode.")
-        self.update()
+        await self.async_flush_queue()
 
-    def set_temperature(self, **kwargs):
+    async def async_set_temperature(self, **kwargs):
         """Set new target temperature."""
         target_temp = kwargs.get(ATTR_TEMPERATURE)
         if target_temp is None:
@@ -421,4 +379,4 @@ class JciHitachiClimateEntity(JciHitachiEntity, ClimateEntity):
         target_temp = min(self.max_temp, target_temp)
         target_temp = max(self.min_temp, target_temp)
         self.put_queue(status_name="target_temp", status_value=target_temp)
-        self.update()
+        await self.async_flush_queue()
@@ -0,0 +1,281 @@
+"""JciHitachi integration."""
+import asyncio
+import logging
+import time
+
+from JciHitachi.model import JciHitachiAWSStatus
+
+from .const import DOMAIN
+from .metrics import OPERATION_SET_STATUS
+from .ratelimit import LANE_COMMAND
+from .refresh import answered
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def merge_update_data(items):
+    """Merge queued `UpdateData` into one desired-state document per device.
+
+    Later writes to the same status replace earlier ones while keeping the
+    position of the first write, so the original order is kept otherwise.
+
+    Returns
+    -------
+    dict
+        {device_name: {status_name: UpdateData}}
+    """
+    documents = {}
+    for data in items:
+        documents.setdefault(data.device_name, {})[data.status_name] = data
+    return documents
+
+
+def publish_control(api, thing, document):
+    """Send statuses to a device with a single control request. Blocking.
+
+    This is the request `api.set_status` publishes, carrying any number
+    of statuses. Unlike `api.set_status`, a status only counts as
+    confirmed when the device answered this very request, since
+    `mqtt_events.device_control` keeps the echo of earlier ones.
+
+    Parameters
+    ----------
+    api : JciHitachiAWSAPI
+        Logged in API instance.
+    thing : AWSThing
+        Device.
+    document : dict
+        {status_name: status_value} of valid status ids.
+
+    Returns
+    -------
+    set
+        Names of the statuses the device confirmed.
+    """
+    api._check_before_publish()
+    events = api._mqtt.mqtt_events
+    # Publishing clears it as well, cleared first so a stale event never confirms.
+    if thing.thing_name in events.device_control_event:
+        events.device_control_event[thing.thing_name].clear()
+    api._mqtt.publish(
+        api._aws_identity.host_identity_id,
+        thing.thing_name,
+        "control",
+        api._mqtt_timeout,
+        {
+            **document,
+            "TaskID": api.task_id,
+            "Timestamp": int(time.time()),
+        },
+    )
+    api._mqtt.execute(control=True)
+
+    # Timed out requests are in the execution results as well.
+    if not answered(events.device_control_event, thing.thing_name):
+        return set()
+    device_control = events.device_control.get(thing.thing_name) or {}
+    confirmed = {
+        status_name for status_name, status_value in document.items()
+        if device_control.get(status_name) == status_value
+    }
+    for status_name in confirmed:
+        thing.status_code.set_new_status(status_name, document[status_name])
+    return confirmed
+
+
+def set_status_document(api, device_name, updates):
+    """Write several statuses of a device with a single control request. Blocking.
+
+    Statuses the device does not confirm are sent again one by one.
+
+    Parameters
+    ----------
+    api : JciHitachiAWSAPI
+        Logged in API instance.
+    device_name : str
+        Device name.
+    updates : list of UpdateData
+        Statuses to write, with unique status names.
+
+    Returns
+    -------
+    tuple
+        {status_name: bool} indicating whether each status has been written,
+        and the number of statuses sent again one by one.
+    """
+    thing = api.things[device_name]
+    document = {}
+    pending = {}
+    results = {}
+    for data in updates:
+        is_valid, status_name, status_value = JciHitachiAWSStatus.str2id(
+            device_type=thing.type,
+            status_name=data.status_name,
+            status_value=data.status_value,
+            status_str_value=data.status_str_value,
+            support_code=thing.support_code,
+        )
+        if not is_valid:
+            results[data.status_name] = False
+            continue
+        document[status_name] = status_value
+        pending[status_name] = data
+
+    if document:
+        for status_name in publish_control(api, thing, document):
+            results[pending.pop(status_name).status_name] = True
+
+    # A status sent alone already had its one attempt.
+    if len(document) == 1:
+        for data in pending.values():
+            results[data.status_name] = False
+        return results, 0
+
+    if pending:
+        _LOGGER.debug(f"{device_name} did not confirm {list(pending)}, sending them one by one.")
+    for status_name, data in pending.items():
+        results[data.status_name] = bool(publish_control(api, thing, {status_name: document[status_name]}))
+
+    return results, len(pending)
+
+
+class JciHitachiCommandPipeline:
+    """Per-device command queues, each drained by its own worker task.
+
+    Devices are written independently while the order of commands sent to
+    the same device is kept. Commands waiting in a device's queue are merged
+    and sent with a single control request.
+
+    Parameters
+    ----------
+    hass : HomeAssistant
+        Home Assistant instance.
+    api : JciHitachiAWSAPI
+        Logged in API instance.
+    executor : JciHitachiAPIExecutor
+        Executor running the blocking API calls.
+    coordinators : dict of DataUpdateCoordinator
+        Coordinators by device name, notified of the statuses each write changed.
+    store : dict
+        Status store patched on each command and confirmed after each write.
+    metrics : JciHitachiMetrics
+        Metrics recording write latencies and queue depths.
+    """
+
+    def __init__(self, hass, api, executor, coordinators, store, metrics):
+        self._hass = hass
+        self._api = api
+        self._executor = executor
+        self._coordinators = coordinators
+        self._store = store
+        self._metrics = metrics
+        self._queues = {}
+        self._workers = {}
+        self._patched = {}
+
+        for device_name in api.things:
+            self._queues[device_name] = asyncio.Queue()
+            self._workers[device_name] = hass.async_create_background_task(
+                self._async_worker(device_name), f"{DOMAIN} {device_name} commands"
+            )
+
+    def put(self, data):
+        """Queue an `UpdateData` to its device and apply its value optimistically."""
+        self._store.patch(data)
+        self._patched.setdefault(data.device_name, set()).add(data.status_name)
+        queue = self._queues[data.device_name]
+        queue.put_nowait(data)
+        self._metrics.queue(data.device_name).record(queue.qsize())
+
+    async def async_flush(self, device_name):
+        """Show the patched values and wait until all commands queued so far are sent."""
+        patched = self._patched.pop(device_name, None)
+        if patched:
+            self._coordinators[device_name].async_notify_changed(patched)
+
+        barrier = self._hass.loop.create_future()
+        self._queues[device_name].put_nowait(barrier)
+        await barrier
+
+    async def async_shutdown(self, timeout=None):
+        """Cancel all workers.
+
+        Parameters
+        ----------
+        timeout : float, optional
+            Seconds the commands queued so far may take to be sent first, by
+            default they are dropped right away.
+        """
+        if timeout is not None and self._workers:
+            barriers = {}
+            for device_name, queue in self._queues.items():
+                barriers[device_name] = self._hass.loop.create_future()
+                queue.put_nowait(barriers[device_name])
+            await asyncio.wait(barriers.values(), timeout=timeout)
+            unsent = [device_name for device_name, barrier in barriers.items() if not barrier.done()]
+            if unsent:
+                _LOGGER.warning(f"Dropping commands of {unsent} not sent within {timeout} s.")
+
+        for worker in self._workers.values():
+            worker.cancel()
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+        self._workers.clear()
+
+    async def _async_worker(self, device_name):
+        queue = self._queues[device_name]
+        while True:
+            items = [await queue.get()]
+            while not queue.empty():
+                items.append(queue.get_nowait())
+            self._metrics.queue(device_name).record(0)
+
+            barriers = [item for item in items if isinstance(item, asyncio.Future)]
+            document = merge_update_data(
+                item for item in items if not isinstance(item, asyncio.Future)
+            ).get(device_name)
+
+            try:
+                if document:
+                    await self._async_write(device_name, document)
+            except Exception as err:
+                # Keep the worker alive, later commands of the device still have to be sent.
+                _LOGGER.error(f"Failed to apply the update of {device_name}: {err!r}")
+            finally:
+                # Flushes must never be left waiting, even on a failed write or shutdown.
+                for barrier in barriers:
+                    if not barrier.done():
+                        barrier.set_result(None)
+
+    async def _async_write(self, device_name, document):
+        _LOGGER.debug(f"Updating data: {list(document.values())}")
+        try:
+            with self._metrics.measure(device_name, OPERATION_SET_STATUS):
+                results, resent = await self._executor.async_call(
+                    set_status_document,
+                    self._api,
+                    device_name,
+                    list(document.values()),
+                    lane=LANE_COMMAND,
+                    cost=len(document)
+                )
+            self._metrics.retried(device_name, OPERATION_SET_STATUS, resent)
+        except Exception as err:
+            _LOGGER.error(f"Failed to update data: {list(document.values())}: {err}")
+            results = {}
+
+        for status_name, result in results.items():
+            if result is True:
+                _LOGGER.debug(f"Data: {document[status_name]} updated successfully.")
+            else:
+                _LOGGER.error(f"Failed to update data: {document[status_name]}.")
+        self._store.rollback(
+            device_name, [status_name for status_name in document if results.get(status_name) is not True])
+
+        # Here we don't need to refresh status as confirmed statuses were set by `publish_control`.
+        status = self._api.get_status(device_name, legacy=True)
+        changed = self._store.confirm(status)
+
+        _LOGGER.debug(f"Latest data: {[(name, value.status) for name, value in status.items()]}")
+
+        # Important: We have to reset the update scheduler to prevent old status from wrongly being loaded.
+        self._coordinators[device_name].async_command_sent(changed[device_name])
@@ -5,8 +5,10 @@ from homeassistant import config_entries
 from homeassistant.const import CONF_DEVICES, CONF_EMAIL, CONF_PASSWORD
 from JciHitachi.api import JciHitachiAWSAPI
 
-from .const import (API, CONF_ADD_ANOTHER_DEVICE, CONF_RETRY,
-                    CONFIG_FLOW_ADD_DEVICE_SCHEMA, CONFIG_FLOW_SCHEMA, DOMAIN)
+from .const import (CONF_ADD_ANOTHER_DEVICE, CONF_RETRY,
+                    CONFIG_FLOW_ADD_DEVICE_SCHEMA, CONFIG_FLOW_SCHEMA, DOMAIN,
+                    VALIDATED_SESSION)
+from .session import authenticate
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,9 +23,11 @@ async def validate_auth(hass, email, password, device_names, max_retries) -> Non
         device_names=device_names_,
         max_retries=max_retries,
     )
-    await hass.async_add_executor_job(api.login)
+    # Only authenticates and lists devices, the entry fetches the rest once set up.
+    session = await hass.async_add_executor_job(authenticate, api)
 
-    hass.data[DOMAIN] = {API: api}
+    # Handed over to the entry of this account so it does not authenticate again.
+    hass.data.setdefault(DOMAIN, {}).setdefault(VALIDATED_SESSION, {})[email] = session
 
 
 class JciHitachiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
@@ -47,7 +51,11 @@ class JciHitachiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             
             if user_input[CONF_ADD_ANOTHER_DEVICE]:
                 return await self.async_step_add_device()
-            
+
+            # One entry per account, any number of accounts.
+            await self.async_set_unique_id(user_input[CONF_EMAIL].lower())
+            self._abort_if_unique_id_configured()
+
             try:
                 await validate_auth(
                     self.hass,
@@ -68,7 +76,7 @@ class JciHitachiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
             if not errors:
                 return self.async_create_entry(
-                    title="JciHitachi TW",
+                    title=user_input[CONF_EMAIL],
                     data={
                         DOMAIN: user_input
                     }
@@ -77,6 +85,20 @@ class JciHitachiConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             step_id="user", data_schema=CONFIG_FLOW_SCHEMA, errors=errors
         )
 
+    async def async_step_import(self, import_config):
+        """Import the account configured in configuration.yaml."""
+        await self.async_set_unique_id(import_config[CONF_EMAIL].lower())
+        # An imported account picks up changes to configuration.yaml, reloading its entry.
+        self._abort_if_unique_id_configured(updates={DOMAIN: import_config})
+
+        # Credentials are checked by the entry setup, which logs in anyway.
+        return self.async_create_entry(
+            title=import_config[CONF_EMAIL],
+            data={
+                DOMAIN: import_config
+            }
+        )
+
     async def async_step_add_device(self, user_input=None):
         errors = {}
         if user_input is not None:
@@ -5,13 +5,36 @@ from homeassistant.const import CONF_DEVICES, CONF_EMAIL, CONF_PASSWORD
 
 DOMAIN = "jcihitachi_tw"
 API = "api"
+API_EXECUTOR = "api_executor"
 COORDINATOR = "coordinator"
 UPDATE_DATA = "update_data"
 UPDATED_DATA = "updated_data"
+PUSH_LISTENER = "push_listener"
+METRICS = "metrics"
+REFRESH_POOL = "refresh_pool"
+SESSION_CACHE = "session_cache"
+MONTHLY_CACHE = "monthly_cache"
+RATE_LIMITER = "rate_limiter"
+CIRCUIT_BREAKER = "circuit_breaker"
+UNLOAD_CALLBACKS = "unload_callbacks"
+
+# Sessions authenticated by the config flow by email, taken over by the created entry.
+VALIDATED_SESSION = "validated_session"
+
+# Pseudo status name notified when `AWSThing.monthly_data` is refreshed.
+MONTHLY_DATA = "monthly_data"
 
 CONF_RETRY = "retry"
 CONF_ADD_ANOTHER_DEVICE = "add_another_device"
+CONF_PUSH = "push"
+CONF_MAX_UPDATE_INTERVAL = "max_update_interval"
+CONF_OPTIMISTIC_TIMEOUT = "optimistic_timeout"
+CONF_REFRESH_CONCURRENCY = "refresh_concurrency"
 DEFAULT_RETRY = 5
+DEFAULT_PUSH = False
+DEFAULT_MAX_UPDATE_INTERVAL = 300
+DEFAULT_OPTIMISTIC_TIMEOUT = 15
+DEFAULT_REFRESH_CONCURRENCY = 10
 
 CONFIG_SCHEMA = vol.Schema(
     {
@@ -21,6 +44,10 @@ CONFIG_SCHEMA = vol.Schema(
                 vol.Required(CONF_PASSWORD): cv.string,
                 vol.Optional(CONF_RETRY, default=DEFAULT_RETRY): cv.positive_int,
                 vol.Optional(CONF_DEVICES, default=[]): vol.All(cv.ensure_list, list),
+                vol.Optional(CONF_PUSH, default=DEFAULT_PUSH): cv.boolean,
+                vol.Optional(CONF_MAX_UPDATE_INTERVAL, default=DEFAULT_MAX_UPDATE_INTERVAL): cv.positive_int,
+                vol.Optional(CONF_OPTIMISTIC_TIMEOUT, default=DEFAULT_OPTIMISTIC_TIMEOUT): cv.positive_int,
+                vol.Optional(CONF_REFRESH_CONCURRENCY, default=DEFAULT_REFRESH_CONCURRENCY): cv.positive_int,
             }
         )
     },
@@ -32,6 +59,10 @@ CONFIG_FLOW_SCHEMA = vol.Schema(
         vol.Required(CONF_EMAIL): cv.string,
         vol.Required(CONF_PASSWORD): cv.string,
         vol.Optional(CONF_RETRY, default=DEFAULT_RETRY): cv.positive_int,
+        vol.Optional(CONF_PUSH, default=DEFAULT_PUSH): cv.boolean,
+        vol.Optional(CONF_MAX_UPDATE_INTERVAL, default=DEFAULT_MAX_UPDATE_INTERVAL): cv.positive_int,
+        vol.Optional(CONF_OPTIMISTIC_TIMEOUT, default=DEFAULT_OPTIMISTIC_TIMEOUT): cv.positive_int,
+        vol.Optional(CONF_REFRESH_CONCURRENCY, default=DEFAULT_REFRESH_CONCURRENCY): cv.positive_int,
         vol.Optional(CONF_DEVICES, default=""): cv.string,
         vol.Optional(CONF_ADD_ANOTHER_DEVICE, default=False): cv.boolean,
     }
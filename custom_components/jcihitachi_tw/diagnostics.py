@@ -0,0 +1,37 @@
+"""JciHitachi integration."""
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
+
+from .const import (API, CIRCUIT_BREAKER, COORDINATOR, DOMAIN, METRICS,
+                    RATE_LIMITER, UPDATED_DATA)
+
+TO_REDACT = {CONF_EMAIL, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(hass, config_entry):
+    """Return diagnostics for a config entry."""
+    config = async_redact_data(config_entry.data.get(DOMAIN, {}), TO_REDACT)
+    data = hass.data.get(DOMAIN, {}).get(config_entry.entry_id)
+    if data is None:
+        # Not set up, e.g. while waiting to retry a failed login.
+        return {"config": config, "things": {}}
+    api = data[API]
+    coordinators = data[COORDINATOR]
+    store = data[UPDATED_DATA]
+
+    return {
+        "config": config,
+        "things": {
+            name: {
+                "type": thing.type,
+                "available": thing.available,
+                "status": getattr(store.get(name), "status", None),
+                "update_interval": str(coordinators[name].update_interval),
+                "last_update_success": coordinators[name].last_update_success,
+            }
+            for name, thing in api.things.items()
+        },
+        "metrics": data[METRICS].as_dict(),
+        "rate_limiter": data[RATE_LIMITER].as_dict(),
+        "circuit_breaker": data[CIRCUIT_BREAKER].as_dict(),
+    }
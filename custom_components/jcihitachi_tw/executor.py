@@ -0,0 +1,127 @@
+"""JciHitachi integration."""
+import asyncio
+import functools
+import heapq
+import itertools
+import time
+
+import async_timeout
+
+from .ratelimit import LANE_REFRESH
+from .refresh import NoDeviceAnsweredError
+
+
+class JciHitachiAPIExecutor:
+    """Run blocking `JciHitachiAWSAPI` calls in the executor, one at a time.
+
+    LibJciHitachi shares its MQTT execution pools between calls, so two
+    concurrent calls would pick up each other's requests. Callers queue on
+    the event loop instead of holding executor threads while waiting, and
+    a timeout only starts counting once the call is actually running.
+
+    Waiting calls are run in lane order, then in arrival order, and take
+    their tokens from the account's rate limiter before running. Calls
+    are rejected right away while the account's circuit breaker is open.
+    Only failures of the cloud count towards opening it, devices that do
+    not answer do not.
+
+    Parameters
+    ----------
+    hass : HomeAssistant
+        Home Assistant instance.
+    api : JciHitachiAWSAPI
+        API instance whose calls are serialized.
+    limiter : JciHitachiRateLimiter, optional
+        Rate limiter of the account, by default none.
+    breaker : JciHitachiCircuitBreaker, optional
+        Circuit breaker of the account, by default none.
+    """
+
+    def __init__(self, hass, api, limiter=None, breaker=None):
+        self._hass = hass
+        self._limiter = limiter
+        self._breaker = breaker
+        self._busy = False
+        self._waiters = []
+        self._sequence = itertools.count()
+        self.api = api
+
+    async def _async_acquire(self, lane):
+        if not self._busy and not self._waiters:
+            self._busy = True
+            return
+        future = self._hass.loop.create_future()
+        heapq.heappush(self._waiters, (lane, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Handed over in the meantime, pass it on.
+                self._release()
+            raise
+
+    def _record(self, future):
+        if self._breaker is None:
+            return
+        if future is not None and not future.cancelled() and future.exception() is None:
+            self._breaker.record_success()
+        elif future is None or future.cancelled():
+            # Never reached the cloud, only give the admission back.
+            self._breaker.record_cancelled()
+        elif isinstance(future.exception(), NoDeviceAnsweredError):
+            # Sent, but offline devices say nothing about the cloud.
+            self._breaker.record_cancelled()
+        else:
+            self._breaker.record_failure()
+
+    def _release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._busy = False
+
+    async def async_call(self, func, *args, timeout=None, lane=LANE_REFRESH, cost=1, **kwargs):
+        """Call `func` in the executor once no other call is running.
+
+        Parameters
+        ----------
+        func : callable
+            Blocking function.
+        timeout : float, optional
+            Timeout of the call once it is running, by default none.
+        lane : int, optional
+            Priority lane of the call, by default `LANE_REFRESH`.
+        cost : int, optional
+            Cloud requests the call makes, taken from the rate limiter, by default 1.
+
+        Raises
+        ------
+        CircuitOpenError
+            If the circuit breaker rejected the call.
+        """
+        since = time.monotonic()
+        if self._breaker is not None:
+            self._breaker.before_call()
+        try:
+            await self._async_acquire(lane)
+        except BaseException:
+            self._record(None)
+            raise
+        try:
+            if self._limiter is not None:
+                await self._limiter.async_acquire(lane, cost, since)
+            future = self._hass.async_add_executor_job(
+                functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._release()
+            self._record(None)
+            raise
+        # Release only after the call really finished, even if the caller
+        # timed out or was cancelled in the meantime.
+        future.add_done_callback(lambda _: self._release())
+        future.add_done_callback(self._record)
+
+        async with async_timeout.timeout(timeout):
+            return await asyncio.shield(future)
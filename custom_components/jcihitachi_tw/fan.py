@@ -5,7 +5,8 @@ from homeassistant.components.fan import (FanEntity, FanEntityFeature)
 from homeassistant.util.percentage import (ordered_list_item_to_percentage,
                                            percentage_to_ordered_list_item)
 
-from . import API, COORDINATOR, DOMAIN, UPDATED_DATA, JciHitachiEntity
+from . import API, COORDINATOR, DOMAIN, JciHitachiEntity
+from .mapping import StatusMapping
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,38 +25,43 @@ HEAT_EXCHANGER_PRESET_MODES = [
     "energy_recovery",
     "normal",
 ]
-
-async def _async_setup(hass, async_add):
-    api = hass.data[DOMAIN][API]
-    coordinator = hass.data[DOMAIN][COORDINATOR]
-
+# Auto is a preset rather than a speed, so it cannot be set as a percentage.
+SETTABLE_FAN_SPEEDS = ORDERED_NAMED_FAN_SPEEDS[1:]
+DEHUMIDIFIER_FAN_SPEED_MAPPING = StatusMapping(
+    ("air_speed",), {fan_speed: (fan_speed,) for fan_speed in SETTABLE_FAN_SPEEDS})
+HEAT_EXCHANGER_FAN_SPEED_MAPPING = StatusMapping(
+    ("FanSpeed",), {fan_speed: (fan_speed,) for fan_speed in SETTABLE_FAN_SPEEDS})
+
+async def _async_setup(hass, entry_id, async_add):
+    entry_data = hass.data[DOMAIN][entry_id]
+    api = entry_data[API]
+    coordinators = entry_data[COORDINATOR]
+
+    entities = []
     for thing in api.things.values():
+        coordinator = coordinators[thing.name]
         if thing.type == "DH":
-            async_add([JciHitachiDehumidifierFanEntity(thing, coordinator)], update_before_add=True)
+            entities.append(JciHitachiDehumidifierFanEntity(thing, coordinator))
         elif thing.type == "HE":
-            async_add([JciHitachiHeatExchangerFanEntity(thing, coordinator)], update_before_add=True)
-
+            entities.append(JciHitachiHeatExchangerFanEntity(thing, coordinator))
+    # States come from the status already loaded during setup.
+    async_add(entities)
 
-async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
-    """Set up the fan platform."""
-    await _async_setup(hass, async_add_entities)
 
 async def async_setup_entry(hass, config_entry, async_add_devices):
     """Set up the fan platform from a config entry."""
-    await _async_setup(hass, async_add_devices)
+    await _async_setup(hass, config_entry.entry_id, async_add_devices)
 
 
 class JciHitachiDehumidifierFanEntity(JciHitachiEntity, FanEntity):
+    _status_names = ("power", "air_speed")
+    _name_suffix = " Air Speed"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
         self._supported_features = self.calculate_supported_features()
         self._supported_fan_speeds = self.calculate_supported_fan_speeds()
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Air Speed"
-
     @property
     def supported_features(self):
         """Return the list of supported features."""
@@ -64,7 +70,7 @@ class JciHitachiDehumidifierFanEntity(JciHitachiEntity, FanEntity):
     @property
     def is_on(self):
         """Return true if the entity is on"""
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
             if status.power == "off":
                 return False
@@ -77,7 +83,7 @@ class JciHitachiDehumidifierFanEntity(JciHitachiEntity, FanEntity):
     @property
     def percentage(self):
         """Return the current speed percentage."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         return ordered_list_item_to_percentage(self._supported_fan_speeds, status.air_speed)
     
     @property
@@ -87,7 +93,7 @@ class JciHitachiDehumidifierFanEntity(JciHitachiEntity, FanEntity):
 
     @property
     def preset_mode(self):
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
             if status.air_speed == "auto":
                 return "auto"
@@ -120,7 +126,7 @@ class JciHitachiDehumidifierFanEntity(JciHitachiEntity, FanEntity):
     
         return support_fan_speeds
     
-    def set_percentage(self, percentage):
+    async def async_set_percentage(self, percentage):
         """Set the speed percentage of the fan."""
         air_speed = percentage_to_ordered_list_item(
             self._supported_fan_speeds,
@@ -129,50 +135,40 @@ class JciHitachiDehumidifierFanEntity(JciHitachiEntity, FanEntity):
         
         _LOGGER.debug(f"Set {self.name} air speed to {air_speed}")
 
-        if air_speed == "silent":
-            self.put_queue(status_name="air_speed", status_str_value="silent")
-        elif air_speed == "low":
-            self.put_queue(status_name="air_speed", status_str_value="low")
-        elif air_speed == "moderate":
-            self.put_queue(status_name="air_speed", status_str_value="moderate")
-        elif air_speed == "high":
-            self.put_queue(status_name="air_speed", status_str_value="high")
-        else:
+        if not self.put_mapped(DEHUMIDIFIER_FAN_SPEED_MAPPING, air_speed):
             _LOGGER.error("Invalid air_speed.")
         
-        self.update()
+        await self.async_flush_queue()
     
-    def set_preset_mode(self, preset_mode):
+    async def async_set_preset_mode(self, preset_mode):
         """Set the preset mode of the fan."""
         _LOGGER.debug(f"Set {self.name} preset mode to {preset_mode}")
         self.put_queue(status_name="air_speed", status_str_value="auto")
-        self.update()
+        await self.async_flush_queue()
 
-    def turn_on(self, **kwargs):
+    async def async_turn_on(self, **kwargs):
         """Turn the device on."""
         _LOGGER.debug(f"Turn {self.name} on")
         self.put_queue(status_name="power", status_str_value="on")
-        self.update()
+        await self.async_flush_queue()
 
-    def turn_off(self, **kwargs):
+    async def async_turn_off(self, **kwargs):
         """Turn the device off."""
         _LOGGER.debug(f"Turn {self.name} off")
         self.put_queue(status_name="power", status_str_value="off")
-        self.update()
+        await self.async_flush_queue()
 
 
 class JciHitachiHeatExchangerFanEntity(JciHitachiEntity, FanEntity):
+    _status_names = ("Switch", "FanSpeed", "BreathMode")
+    _name_suffix = " Air Speed"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
         self._supported_features = self.calculate_supported_features()
         self._supported_fan_speeds = self.calculate_supported_fan_speeds()
         self._supported_presets = self.calculate_supported_presets()
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Air Speed"
-
     @property
     def supported_features(self):
         """Return the list of supported features."""
@@ -181,7 +177,7 @@ class JciHitachiHeatExchangerFanEntity(JciHitachiEntity, FanEntity):
     @property
     def is_on(self):
         """Return true if the entity is on"""
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
             if status.Switch == "off":
                 return False
@@ -194,7 +190,7 @@ class JciHitachiHeatExchangerFanEntity(JciHitachiEntity, FanEntity):
     @property
     def percentage(self):
         """Return the current speed percentage."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         return ordered_list_item_to_percentage(self._supported_fan_speeds, status.FanSpeed)
     
     @property
@@ -204,7 +200,7 @@ class JciHitachiHeatExchangerFanEntity(JciHitachiEntity, FanEntity):
 
     @property
     def preset_mode(self):
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
             return status.BreathMode
         _LOGGER.error("Missing preset_mode.")
@@ -244,40 +240,32 @@ class JciHitachiHeatExchangerFanEntity(JciHitachiEntity, FanEntity):
         
         return support_presets
 
-    def set_percentage(self, percentage):
+    async def async_set_percentage(self, percentage):
         """Set the speed percentage of the fan."""
         fan_speed = percentage_to_ordered_list_item(
             ORDERED_NAMED_FAN_SPEEDS, percentage)
         
         _LOGGER.debug(f"Set {self.name} air speed to {fan_speed}")
 
-        if fan_speed == "silent":
-            self.put_queue(status_name="FanSpeed", status_str_value="silent")
-        elif fan_speed == "low":
-            self.put_queue(status_name="FanSpeed", status_str_value="low")
-        elif fan_speed == "moderate":
-            self.put_queue(status_name="FanSpeed", status_str_value="moderate")
-        elif fan_speed == "high":
-            self.put_queue(status_name="FanSpeed", status_str_value="high")
-        else:
+        if not self.put_mapped(HEAT_EXCHANGER_FAN_SPEED_MAPPING, fan_speed):
             _LOGGER.error("Invalid FanSpeed.")
         
-        self.update()
+        await self.async_flush_queue()
     
-    def set_preset_mode(self, preset_mode):
+    async def async_set_preset_mode(self, preset_mode):
         """Set the preset mode of the fan."""
         _LOGGER.debug(f"Set {self.name} preset mode to {preset_mode}")
         self.put_queue(status_name="BreathMode", status_str_value=preset_mode)
-        self.update()
+        await self.async_flush_queue()
 
-    def turn_on(self, **kwargs):
+    async def async_turn_on(self, **kwargs):
         """Turn the device on."""
         _LOGGER.debug(f"Turn {self.name} on")
         self.put_queue(status_name="Switch", status_str_value="on")
-        self.update()
+        await self.async_flush_queue()
 
-    def turn_off(self, **kwargs):
+    async def async_turn_off(self, **kwargs):
         """Turn the device off."""
         _LOGGER.debug(f"Turn {self.name} off")
         self.put_queue(status_name="Switch", status_str_value="off")
-        self.update()
+        await self.async_flush_queue()
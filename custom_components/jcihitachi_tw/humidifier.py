@@ -6,6 +6,7 @@ from homeassistant.components.humidifier import (HumidifierEntityFeature,
                                                  HumidifierEntity)
 
 from . import API, COORDINATOR, DOMAIN, UPDATED_DATA, JciHitachiEntity
+from .mapping import StatusMapping
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,37 +32,56 @@ AVAILABLE_MODES = [
     MODE_ECO_COMFORT
 ]
 
-
-async def _async_setup(hass, async_add):
-    api = hass.data[DOMAIN][API]
-    coordinator = hass.data[DOMAIN][COORDINATOR]
-
+MODE_MAPPING = StatusMapping(
+    ("mode",),
+    {
+        MODE_AUTO: ("auto",),
+        MODE_CUSTOM: ("custom",),
+        MODE_CONTINUOUS: ("continuous",),
+        MODE_CLOTHES_DRY: ("clothes_dry",),
+        MODE_AIR_PURIFY: ("air_purify",),
+        MODE_MOLD_PREV: ("mold_prev",),
+        MODE_LOW_HUMIDITY: ("low_humidity",),
+        MODE_ECO_COMFORT: ("eco_comfort",),
+    },
+)
+
+
+async def _async_setup(hass, entry_id, async_add):
+    entry_data = hass.data[DOMAIN][entry_id]
+    api = entry_data[API]
+    coordinators = entry_data[COORDINATOR]
+
+    entities = []
     for thing in api.things.values():
+        coordinator = coordinators[thing.name]
         if thing.type == "DH":
-            status = hass.data[DOMAIN][UPDATED_DATA][thing.name]
+            status = entry_data[UPDATED_DATA][thing.name]
             supported_features = JciHitachiDehumidifierEntity.calculate_supported_features(
                 status
             )
-            async_add(
-                [JciHitachiDehumidifierEntity(
-                    thing, coordinator, supported_features)],
-                update_before_add=True
-            )
-
-async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
-    """Set up the humidifier platform."""
-    await _async_setup(hass, async_add_entities)
+            entities.append(JciHitachiDehumidifierEntity(
+                thing, coordinator, supported_features))
+    # States come from the status already loaded during setup.
+    async_add(entities)
 
 async def async_setup_entry(hass, config_entry, async_add_devices):
     """Set up the humidifier platform from a config entry."""
-    await _async_setup(hass, async_add_devices)
+    await _async_setup(hass, config_entry.entry_id, async_add_devices)
 
 
 class JciHitachiDehumidifierEntity(JciHitachiEntity, HumidifierEntity):
+    _status_names = (
+        "power", "mode", "target_humidity", "indoor_humidity", "max_humidity",
+        "min_humidity",
+    )
+
     def __init__(self, thing, coordinator, supported_features):
         super().__init__(thing, coordinator)
         self._supported_features = supported_features
-        self._available_modes = [mode for i, mode in enumerate(AVAILABLE_MODES) if 2 ** i & self._thing.support_code.Mode != 0]
+        self._mode_mapping = MODE_MAPPING.restrict(
+            [mode for i, mode in enumerate(AVAILABLE_MODES) if 2 ** i & self._thing.support_code.Mode != 0])
+        self._available_modes = self._mode_mapping.options
 
     @property
     def supported_features(self):
@@ -71,7 +91,7 @@ class JciHitachiDehumidifierEntity(JciHitachiEntity, HumidifierEntity):
     @property
     def current_humidity(self):
         """Return the current humidity."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
             return status.indoor_humidity
         return None
@@ -79,7 +99,7 @@ class JciHitachiDehumidifierEntity(JciHitachiEntity, HumidifierEntity):
     @property
     def target_humidity(self):
         """Return the target humidity."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
             return status.target_humidity
         return None
@@ -87,35 +107,22 @@ class JciHitachiDehumidifierEntity(JciHitachiEntity, HumidifierEntity):
     @property
     def max_humidity(self):
         """Return the maximum humidity."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         return status.max_humidity
 
     @property
     def min_humidity(self):
         """Return the minimum humidity."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         return status.min_humidity
 
     @property
     def mode(self):
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
-            if status.mode == "auto":
-                return MODE_AUTO
-            elif status.mode == "custom":
-                return MODE_CUSTOM
-            elif status.mode == "continuous":
-                return MODE_CONTINUOUS
-            elif status.mode == "clothes_dry":
-                return MODE_CLOTHES_DRY
-            elif status.mode == "air_purify":
-                return MODE_AIR_PURIFY
-            elif status.mode == "mold_prev":
-                return MODE_MOLD_PREV
-            elif status.mode == "low_humidity":
-                return MODE_LOW_HUMIDITY
-            elif status.mode == "eco_comfort":
-                return MODE_ECO_COMFORT
+            mode = MODE_MAPPING.to_ha(status)
+            if mode is not None:
+                return mode
 
         _LOGGER.error("Missing mode.")
         return None
@@ -126,7 +133,7 @@ class JciHitachiDehumidifierEntity(JciHitachiEntity, HumidifierEntity):
 
     @property
     def is_on(self):
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
             if status.power == "off":
                 return False
@@ -149,48 +156,32 @@ class JciHitachiDehumidifierEntity(JciHitachiEntity, HumidifierEntity):
         support_flags = HumidifierEntityFeature.MODES
         return support_flags
 
-    def set_mode(self, mode):
+    async def async_set_mode(self, mode):
         """Set new target preset mode."""
 
         _LOGGER.debug(f"Set {self.name} mode to {mode}")
 
-        if mode == MODE_AUTO:
-            self.put_queue(status_name="mode", status_str_value="auto")
-        elif mode == MODE_CUSTOM:
-            self.put_queue(status_name="mode", status_str_value="custom")
-        elif mode == MODE_CONTINUOUS:
-            self.put_queue(status_name="mode", status_str_value="continuous")
-        elif mode == MODE_CLOTHES_DRY:
-            self.put_queue(status_name="mode", status_str_value="clothes_dry")
-        elif mode == MODE_AIR_PURIFY:
-            self.put_queue(status_name="mode", status_str_value="air_purify")
-        elif mode == MODE_MOLD_PREV:
-            self.put_queue(status_name="mode", status_str_value="mold_prev")
-        elif mode == MODE_LOW_HUMIDITY:
-            self.put_queue(status_name="mode", status_str_value="low_humidity")
-        elif mode == MODE_ECO_COMFORT:
-            self.put_queue(status_name="mode", status_str_value="eco_comfort")
-        else:
+        if not self.put_mapped(self._mode_mapping, mode):
             _LOGGER.error("Invalid mode.")
-        self.update()
+        await self.async_flush_queue()
 
-    def set_humidity(self, humidity):
+    async def async_set_humidity(self, humidity):
         """Set new target humidity."""
 
         target_humidity = int(humidity)
         _LOGGER.debug(f"Set {self.name} humidity to {target_humidity}")
 
         self.put_queue(status_name="target_humidity", status_value=target_humidity)
-        self.update()
+        await self.async_flush_queue()
 
-    def turn_on(self, **kwargs):
+    async def async_turn_on(self, **kwargs):
         """Turn the device on."""
         _LOGGER.debug(f"Turn {self.name} on")
         self.put_queue(status_name="power", status_str_value="on")
-        self.update()
+        await self.async_flush_queue()
 
-    def turn_off(self, **kwargs):
+    async def async_turn_off(self, **kwargs):
         """Turn the device off."""
         _LOGGER.debug(f"Turn {self.name} off")
         self.put_queue(status_name="power", status_str_value="off")
-        self.update()
+        await self.async_flush_queue()
@@ -5,38 +5,44 @@ from homeassistant.components.light import (
     LightEntity,
 )
 
-from . import API, COORDINATOR, DOMAIN, UPDATED_DATA, JciHitachiEntity
+from . import API, COORDINATOR, DOMAIN, JciHitachiEntity
+from .mapping import StatusMapping
 
 _LOGGER = logging.getLogger(__name__)
 
 
-async def _async_setup(hass, async_add):
-    api = hass.data[DOMAIN][API]
-    coordinator = hass.data[DOMAIN][COORDINATOR]
+async def _async_setup(hass, entry_id, async_add):
+    entry_data = hass.data[DOMAIN][entry_id]
+    api = entry_data[API]
+    coordinators = entry_data[COORDINATOR]
 
+    entities = []
     for thing in api.things.values():
+        coordinator = coordinators[thing.name]
         if thing.type == "DH":
-            async_add(
-                [JciHitachiDehumidifierLightEntity(thing, coordinator)],
-                update_before_add=True,
-            )
-
-
-async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
-    await _async_setup(hass, async_add_entities)
+            entities.append(JciHitachiDehumidifierLightEntity(thing, coordinator))
+    # States come from the status already loaded during setup.
+    async_add(entities)
 
 
 async def async_setup_entry(hass, config_entry, async_add_devices):
-    await _async_setup(hass, async_add_devices)
+    await _async_setup(hass, config_entry.entry_id, async_add_devices)
 
 
 class JciHitachiDehumidifierLightEntity(JciHitachiEntity, LightEntity):
-    brightness_mapping = {
-        "bright": 255,
-        "dark": 170,
-        "off": 85,
-        "all_off": 0,
-    }
+    _status_names = ("display_brightness",)
+    _name_suffix = " panel LED"
+
+    brightness_mapping = StatusMapping(
+        ("display_brightness",),
+        {
+            255: ("bright",),
+            170: ("dark",),
+            85: ("off",),
+            0: ("all_off",),
+        },
+        default=0,
+    )
 
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
@@ -45,10 +51,6 @@ class JciHitachiDehumidifierLightEntity(JciHitachiEntity, LightEntity):
     def unique_id(self):
         return f"{self._thing.gateway_mac_address}_dehumidifier_light"
 
-    @property
-    def name(self):
-        return f"{self._thing.name} panel LED"
-
     @property
     def supported_features(self):
         return SUPPORT_BRIGHTNESS
@@ -56,7 +58,7 @@ class JciHitachiDehumidifierLightEntity(JciHitachiEntity, LightEntity):
     @property
     def is_on(self):
         """Return true if the entity is on"""
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
             if status.display_brightness == "all_off":
                 return False
@@ -68,30 +70,28 @@ class JciHitachiDehumidifierLightEntity(JciHitachiEntity, LightEntity):
 
     @property
     def brightness(self):
-        status = self.hass.data[DOMAIN][UPDATED_DATA][self._thing.name]
+        status = self._status
         if status:
-            return self.brightness_mapping.get(status.display_brightness, 0)
+            return self.brightness_mapping.to_ha(status)
 
         _LOGGER.error("Missing brightness.")
         return 0
 
-    def turn_on(self, **kwargs):
+    async def async_turn_on(self, **kwargs):
         _LOGGER.debug(f"Turn {self.name} on")
         brightness = kwargs.get(ATTR_BRIGHTNESS, 255)
         if brightness > 170:
-            brightness_value = "bright"
-        elif brightness <= 170 and brightness > 85:
-            brightness_value = "dark"
-        elif brightness <= 85 and brightness > 3:
-            brightness_value = "off"
+            brightness = 255
+        elif brightness > 85:
+            brightness = 170
+        elif brightness > 3:
+            brightness = 85
         else:
-            brightness_value = "all_off"
-        self.put_queue(
-            status_name="display_brightness", status_str_value=brightness_value
-        )
-        self.update()
+            brightness = 0
+        self.put_mapped(self.brightness_mapping, brightness)
+        await self.async_flush_queue()
 
-    def turn_off(self, **kwargs):
+    async def async_turn_off(self, **kwargs):
         _LOGGER.debug(f"Turn {self.name} off")
-        self.put_queue(status_name="display_brightness", status_str_value="all_off")
-        self.update()
+        self.put_mapped(self.brightness_mapping, 0)
+        await self.async_flush_queue()
@@ -0,0 +1,77 @@
+"""JciHitachi integration."""
+
+
+class StatusMapping:
+    """Bidirectional mapping between Home Assistant values and backend statuses.
+
+    Each Home Assistant value maps to a tuple of backend string values, one
+    per status name. A None backend value is left untouched when writing,
+    e.g. ("off", None) powers off without changing the mode.
+
+    Combinations that are not in the table are resolved once through the
+    alias patterns, in order, where None matches any value, and then
+    cached, so reads are dictionary lookups.
+
+    Parameters
+    ----------
+    status_names : tuple of str
+        Legacy status names the mapping reads and writes.
+    table : dict
+        {ha_value: tuple of backend values}, in the order options are listed.
+    aliases : list of tuple, optional
+        Read-only (pattern, ha_value) pairs tried in order.
+    default : optional
+        Value read when nothing matches, by default None.
+    """
+
+    def __init__(self, status_names, table, aliases=(), default=None):
+        self.status_names = tuple(status_names)
+        self.default = default
+        self._aliases = tuple(aliases)
+        self._to_backend = dict(table)
+        self._to_ha = {}
+        for ha_value, backend_values in self._to_backend.items():
+            self._to_ha.setdefault(tuple(backend_values), ha_value)
+
+    @property
+    def options(self):
+        """Home Assistant values that can be written."""
+        return list(self._to_backend)
+
+    def restrict(self, options):
+        """Return a mapping writing only `options`, e.g. those a device supports."""
+        mapping = StatusMapping(
+            self.status_names,
+            {ha_value: self._to_backend[ha_value] for ha_value in options if ha_value in self._to_backend},
+            self._aliases,
+            self.default,
+        )
+        # Reading is not restricted, the device may still report any value.
+        mapping._to_ha = self._to_ha
+        return mapping
+
+    def to_ha(self, status):
+        """Read the Home Assistant value from a legacy `JciHitachiAWSStatus`."""
+        key = tuple(status.status.get(status_name) for status_name in self.status_names)
+        try:
+            return self._to_ha[key]
+        except KeyError:
+            pass
+        ha_value = self.default
+        for pattern, alias in self._aliases:
+            if all(p is None or p == k for p, k in zip(pattern, key)):
+                ha_value = alias
+                break
+        self._to_ha[key] = ha_value
+        return ha_value
+
+    def to_backend(self, ha_value):
+        """Return the (status_name, status_str_value) pairs writing `ha_value`, None if unknown."""
+        backend_values = self._to_backend.get(ha_value)
+        if backend_values is None:
+            return None
+        return [
+            (status_name, value)
+            for status_name, value in zip(self.status_names, backend_values)
+            if value is not None
+        ]
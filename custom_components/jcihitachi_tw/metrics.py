@@ -0,0 +1,133 @@
+"""JciHitachi integration."""
+import bisect
+import time
+from contextlib import contextmanager
+
+# Upper bounds of the latency histogram buckets in seconds.
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, float("inf"))
+
+# Key of account level operations such as login.
+ACCOUNT = "account"
+
+OPERATION_LOGIN = "login"
+OPERATION_REFRESH_STATUS = "refresh_status"
+OPERATION_SET_STATUS = "set_status"
+OPERATION_REFRESH_MONTHLY_DATA = "refresh_monthly_data"
+
+
+class OperationMetrics:
+    """Latency histogram and outcome counters of one operation on one device."""
+
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.failures = 0
+        self.retries = 0
+        self.total_latency = 0.0
+        self.last_latency = None
+
+    def record(self, latency, success):
+        """Record a finished call."""
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self.count += 1
+        self.total_latency += latency
+        self.last_latency = latency
+        if not success:
+            self.failures += 1
+
+    def percentile(self, q):
+        """Estimate the `q` quantile (0-1) in seconds from the histogram, None if empty."""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank:
+                # The last bucket is unbounded, report the largest finite bound.
+                return bound if bound != float("inf") else LATENCY_BUCKETS[-2]
+        return LATENCY_BUCKETS[-2]
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "retries": self.retries,
+            "mean_latency": self.total_latency / self.count if self.count else None,
+            "last_latency": self.last_latency,
+            "p50_latency": self.percentile(0.5),
+            "p95_latency": self.percentile(0.95),
+            "histogram": {
+                ("+Inf" if bound == float("inf") else str(bound)): count
+                for bound, count in zip(LATENCY_BUCKETS, self.buckets)
+            },
+        }
+
+
+class QueueMetrics:
+    """Current and highest depth of a device's command queue."""
+
+    def __init__(self):
+        self.depth = 0
+        self.max_depth = 0
+
+    def record(self, depth):
+        self.depth = depth
+        self.max_depth = max(self.max_depth, depth)
+
+    def as_dict(self):
+        return {"depth": self.depth, "max_depth": self.max_depth}
+
+
+class JciHitachiMetrics:
+    """Performance metrics per device and per operation.
+
+    Only to be used from the event loop.
+    """
+
+    def __init__(self):
+        self._operations = {}
+        self._queues = {}
+
+    def operation(self, device_name, operation):
+        """Return the `OperationMetrics` of an operation on a device."""
+        key = (device_name or ACCOUNT, operation)
+        metrics = self._operations.get(key)
+        if metrics is None:
+            metrics = self._operations[key] = OperationMetrics()
+        return metrics
+
+    def queue(self, device_name):
+        """Return the `QueueMetrics` of a device."""
+        metrics = self._queues.get(device_name)
+        if metrics is None:
+            metrics = self._queues[device_name] = QueueMetrics()
+        return metrics
+
+    @contextmanager
+    def measure(self, device_name, operation):
+        """Time the enclosed call, counting it as failed if it raises."""
+        start = time.monotonic()
+        success = False
+        try:
+            yield
+            success = True
+        finally:
+            self.operation(device_name, operation).record(time.monotonic() - start, success)
+
+    def count(self, operation):
+        """Return the number of finished calls of an operation over all devices."""
+        return sum(metrics.count for (_, name), metrics in self._operations.items() if name == operation)
+
+    def retried(self, device_name, operation, count=1):
+        """Count retries of an operation."""
+        self.operation(device_name, operation).retries += count
+
+    def as_dict(self):
+        """Snapshot of all metrics, e.g. for diagnostics."""
+        snapshot = {}
+        for (device_name, operation), metrics in self._operations.items():
+            snapshot.setdefault(device_name, {})[operation] = metrics.as_dict()
+        for device_name, metrics in self._queues.items():
+            snapshot.setdefault(device_name, {})["command_queue"] = metrics.as_dict()
+        return snapshot
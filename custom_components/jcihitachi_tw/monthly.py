@@ -0,0 +1,186 @@
+"""JciHitachi integration."""
+import asyncio
+import datetime
+import logging
+import time
+
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .metrics import OPERATION_REFRESH_MONTHLY_DATA
+from .ratelimit import LANE_BACKGROUND
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Seconds the current month's data is reused before it is fetched again.
+CURRENT_MONTH_TTL = 3600
+# Same month length `api.refresh_monthly_data` spans.
+MONTH_SECONDS = 31 * 86400
+SAVE_DELAY = 10
+
+
+def monthly_data_store(hass, entry_id):
+    """Return the storage of the monthly data cache of a config entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.monthly_data")
+
+
+async def async_remove_monthly_data(hass, entry_id):
+    """Remove the monthly data cache of a config entry from storage."""
+    await monthly_data_store(hass, entry_id).async_remove()
+
+
+def month_key(date):
+    """Return the cache key of the month `date` is in."""
+    return f"{date.year:04d}-{date.month:02d}"
+
+
+def months_between(start_key, end_key):
+    """Return the number of months from the month `start_key` to the month `end_key`."""
+    start_year, start_month = map(int, start_key.split("-"))
+    end_year, end_month = map(int, end_key.split("-"))
+    return (end_year - start_year) * 12 + end_month - start_month
+
+
+def month_keys(months, now=None):
+    """Keys of the months `api.refresh_monthly_data(months, ...)` spans, oldest first."""
+    now = time.time() if now is None else now
+    start = datetime.date.fromtimestamp(now - months * MONTH_SECONDS)
+    end = datetime.date.fromtimestamp(now)
+    year, month = start.year, start.month
+    keys = []
+    while (year, month) <= (end.year, end.month):
+        keys.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return keys
+
+
+class JciHitachiMonthlyDataCache:
+    """Monthly data of an account's devices, kept in HA storage.
+
+    Completed months cannot change and are only fetched once after they
+    completed. The current month is fetched again once it is
+    `CURRENT_MONTH_TTL` seconds old. A month the cloud has no data for is
+    remembered as such.
+
+    Monthly data is requested over HTTP rather than through the MQTT
+    execution pools, so devices are fetched concurrently, up to
+    `concurrency` at a time, instead of through the API executor.
+
+    Parameters
+    ----------
+    hass : HomeAssistant
+        Home Assistant instance.
+    entry_id : str
+        Config entry id the cache belongs to.
+    api : JciHitachiAWSAPI
+        API instance.
+    metrics : JciHitachiMetrics
+        Metrics the fetches are recorded in.
+    limiter : JciHitachiRateLimiter
+        Rate limiter of the account.
+    breaker : JciHitachiCircuitBreaker
+        Circuit breaker of the account.
+    concurrency : int
+        Largest number of devices fetched at the same time.
+    """
+
+    def __init__(self, hass, entry_id, api, metrics, limiter, breaker, concurrency):
+        self._hass = hass
+        self._api = api
+        self._metrics = metrics
+        self._limiter = limiter
+        self._breaker = breaker
+        self._store = monthly_data_store(hass, entry_id)
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._locks = {}
+        # {device_name: {month_key: record or None}}
+        self._months = {}
+        # {device_name: time the current month was fetched}
+        self._fetched_at = {}
+
+    async def async_load(self):
+        """Load the cache from storage."""
+        data = await self._store.async_load() or {}
+        self._months = data.get("months", {})
+        self._fetched_at = data.get("fetched_at", {})
+
+    def _data(self):
+        return {"months": self._months, "fetched_at": self._fetched_at}
+
+    async def async_get(self, device_name, months, lane=LANE_BACKGROUND):
+        """Return the monthly data records of the last `months` months of a device.
+
+        Records are in the format of `AWSThing.monthly_data`, oldest first.
+        All of them are fetched if some completed month is not cached, the
+        months since the last fetch if the month current then has completed
+        since, only the last month if just the current month is outdated,
+        and none otherwise. Fetches wait for the rate limiter in `lane`.
+        """
+        async with self._locks.setdefault(device_name, asyncio.Lock()):
+            now = time.time()
+            keys = month_keys(months, now)
+            cached = self._months.get(device_name, {})
+            fetched_at = self._fetched_at.get(device_name)
+            # Only the part of the month current at the last fetch until then was fetched.
+            partial = month_key(datetime.date.fromtimestamp(fetched_at)) if fetched_at is not None else None
+            fetch_months = None
+            if partial is not None and partial != keys[-1]:
+                # Spans the whole of the month completed since.
+                fetch_months = months_between(partial, keys[-1]) + 1
+            # The range starts within its first month, whose record may never be returned.
+            if any(key not in cached for key in keys[1:-1]):
+                fetch_months = max(fetch_months or 0, months)
+            elif fetch_months is None and (
+                    keys[-1] not in cached or fetched_at is None or now - fetched_at > CURRENT_MONTH_TTL):
+                fetch_months = 1
+
+            if fetch_months is not None:
+                # A zero month range has no data, the current month needs at least one.
+                fetch_months = max(fetch_months, 1)
+                thing = self._api.things[device_name]
+                # The month selector's choice, shown by the sensors, which the fetch overwrites.
+                shown = thing.monthly_data
+                self._breaker.before_call()
+                try:
+                    async with self._semaphore:
+                        await self._limiter.async_acquire(lane)
+                        with self._metrics.measure(device_name, OPERATION_REFRESH_MONTHLY_DATA):
+                            await self._hass.async_add_executor_job(
+                                self._api.refresh_monthly_data, fetch_months, device_name)
+                    records = thing.monthly_data
+                except asyncio.CancelledError:
+                    self._breaker.record_cancelled()
+                    raise
+                except Exception:
+                    self._breaker.record_failure()
+                    raise
+                finally:
+                    thing.monthly_data = shown
+                self._breaker.record_success()
+                self._update(device_name, month_keys(fetch_months, now), records, now)
+
+            cached = self._months.get(device_name, {})
+            return [cached[key] for key in keys if cached.get(key) is not None]
+
+    def records(self, device_name):
+        """Return every cached monthly data record of a device, oldest first."""
+        cached = self._months.get(device_name, {})
+        return [cached[key] for key in sorted(cached) if cached[key] is not None]
+
+    def _update(self, device_name, keys, records, now):
+        fetched = {
+            month_key(datetime.date.fromtimestamp(record["Timestamp"] / 1000)): record
+            for record in records or []
+        }
+        cached = self._months.setdefault(device_name, {})
+        for key in keys:
+            # The range starts within its first month, which may be left out.
+            if key in fetched or key != keys[0]:
+                cached[key] = fetched.get(key)
+        self._fetched_at[device_name] = now
+        self._store.async_delay_save(self._data, SAVE_DELAY)
+
+    async def async_save(self):
+        """Write the cache to storage now rather than after `SAVE_DELAY`."""
+        await self._store.async_save(self._data())
@@ -3,39 +3,37 @@ import logging
 
 from homeassistant.components.number import NumberEntity
 
-from . import API, COORDINATOR, DOMAIN, JciHitachiEntity
+from . import (API, COORDINATOR, DOMAIN, MONTHLY_CACHE, MONTHLY_DATA,
+               JciHitachiEntity)
+from .ratelimit import LANE_COMMAND
 
 _LOGGER = logging.getLogger(__name__)
 
 
-async def _async_setup(hass, async_add):
-    api = hass.data[DOMAIN][API]
-    coordinator = hass.data[DOMAIN][COORDINATOR]
+async def _async_setup(hass, entry_id, async_add):
+    entry_data = hass.data[DOMAIN][entry_id]
+    api = entry_data[API]
+    coordinators = entry_data[COORDINATOR]
 
-    for thing in api.things.values():
-        async_add(
-            [JciHitachiMonthlyDataSelectorNumberEntity(thing, coordinator)],
-            update_before_add=True
-        )
-
-async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
-    """Set up the number platform."""
-    await _async_setup(hass, async_add_entities)
+    # States come from the status already loaded during setup.
+    async_add([
+        JciHitachiMonthlyDataSelectorNumberEntity(thing, coordinators[thing.name])
+        for thing in api.things.values()
+    ])
 
 async def async_setup_entry(hass, config_entry, async_add_devices):
     """Set up the number platform from a config entry."""
-    await _async_setup(hass, async_add_devices)
+    await _async_setup(hass, config_entry.entry_id, async_add_devices)
 
 
 class JciHitachiMonthlyDataSelectorNumberEntity(JciHitachiEntity, NumberEntity):
+    _status_names = ()
+    _name_suffix = " Month Selector"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
         self._value = 0
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Month Selector"
     
     @property
     def native_value(self):
@@ -56,11 +54,12 @@ class JciHitachiMonthlyDataSelectorNumberEntity(JciHitachiEntity, NumberEntity):
     def unique_id(self):
         return f"{self._thing.gateway_mac_address}_monthly_data_selector_number"
 
-    def set_native_value(self, value):
+    async def async_set_native_value(self, value):
         """Set new month."""
         _LOGGER.debug(f"Set {self.name} value to {value}")
         self._value = value
 
-        api = self.hass.data[DOMAIN][API]
-        api.refresh_monthly_data(int(self._value), self._thing.name)
-        self.update()
\ No newline at end of file
+        self._thing.monthly_data = await self._entry_data[MONTHLY_CACHE].async_get(
+            self._thing.name, int(self._value), LANE_COMMAND)
+        self.async_write_ha_state()
+        self.coordinator.async_notify_changed({MONTHLY_DATA})
\ No newline at end of file
@@ -0,0 +1,148 @@
+"""JciHitachi integration."""
+import asyncio
+import cProfile
+import io
+import logging
+import pstats
+import time
+import tracemalloc
+
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from .const import COORDINATOR, DOMAIN, METRICS
+from .metrics import OPERATION_SET_STATUS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Functions or allocation sites listed per section of the report.
+REPORT_LINES = 40
+# Frames kept per traced allocation, when tracing is started by the profiler.
+TRACEMALLOC_FRAMES = 10
+# Files the integration's sections of the report are restricted to, as a
+# regular expression for the profile and patterns for the allocations.
+HOT_PATHS = r"jcihitachi_tw|JciHitachi"
+HOT_PATH_PATTERNS = ("*jcihitachi_tw*", "*JciHitachi*")
+# Seconds between checks of the number of commands sent.
+COMMAND_POLL_INTERVAL = 1
+
+
+def _command_count(accounts):
+    return sum(entry_data[METRICS].count(OPERATION_SET_STATUS) for entry_data in accounts)
+
+
+def write_report(path, profile, before, after, summary):
+    """Write a profile and the allocations between two snapshots to `path`. Blocking."""
+    stream = io.StringIO()
+    stream.write(f"{summary}\n")
+
+    # Directories are kept, the integration's functions are told apart by them.
+    stats = pstats.Stats(profile, stream=stream)
+    stream.write("\n== Integration functions by cumulative time ==\n")
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(HOT_PATHS, REPORT_LINES)
+    stream.write("\n== Event loop functions by own time ==\n")
+    stats.sort_stats(pstats.SortKey.TIME).print_stats(REPORT_LINES)
+
+    stream.write("\n== Memory allocated while profiling, by line ==\n")
+    for stat in after.compare_to(before, "lineno")[:REPORT_LINES]:
+        stream.write(f"{stat}\n")
+    stream.write("\n== Memory allocated while profiling by the integration, by line ==\n")
+    filters = [tracemalloc.Filter(True, pattern) for pattern in HOT_PATH_PATTERNS]
+    for stat in after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")[:REPORT_LINES]:
+        stream.write(f"{stat}\n")
+
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(stream.getvalue())
+
+
+class JciHitachiProfiler:
+    """Profile the integration over refresh cycles and commands, on demand.
+
+    A cProfile run covers the event loop while every coordinator of every
+    account refreshes `cycles` times, then until `commands` commands were
+    sent or `timeout` seconds passed, which includes the coordinators'
+    update methods, the state writes and the entity property reads.
+    Blocking cloud calls run in executor threads and only show up as the
+    time spent awaiting them. A tracemalloc snapshot is taken before and
+    after, and the report is written to the config directory.
+
+    Only one profile is collected at a time.
+
+    Parameters
+    ----------
+    hass : HomeAssistant
+        Home Assistant instance.
+    """
+
+    def __init__(self, hass):
+        self._hass = hass
+        self._running = False
+
+    async def async_profile(self, accounts, cycles, commands=0, timeout=None):
+        """Collect a profile and write its report.
+
+        Parameters
+        ----------
+        accounts : list of dict
+            Runtime data of the accounts to profile.
+        cycles : int
+            Refresh cycles of every coordinator.
+        commands : int, optional
+            Commands to wait for after the cycles, by default 0.
+        timeout : float, optional
+            Longest wait for the commands in seconds, by default none.
+
+        Returns
+        -------
+        str
+            Path of the report.
+
+        Raises
+        ------
+        HomeAssistantError
+            If a profile is already being collected.
+        """
+        if self._running:
+            raise HomeAssistantError("A profile is already being collected.")
+        self._running = True
+        tracing = tracemalloc.is_tracing()
+        try:
+            if not tracing:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+            before = await self._hass.async_add_executor_job(tracemalloc.take_snapshot)
+            profile = cProfile.Profile()
+            try:
+                profile.enable()
+            except ValueError as err:
+                raise HomeAssistantError(f"Another profiler is running: {err}") from err
+
+            start = time.monotonic()
+            sent = _command_count(accounts)
+            try:
+                coordinators = [
+                    coordinator for entry_data in accounts for coordinator in entry_data[COORDINATOR].values()]
+                for _ in range(cycles):
+                    await asyncio.gather(*(coordinator.async_refresh() for coordinator in coordinators))
+                deadline = None if timeout is None else time.monotonic() + timeout
+                while _command_count(accounts) - sent < commands and (deadline is None or time.monotonic() < deadline):
+                    await asyncio.sleep(COMMAND_POLL_INTERVAL)
+            finally:
+                profile.disable()
+            duration = time.monotonic() - start
+            sent = _command_count(accounts) - sent
+
+            after = await self._hass.async_add_executor_job(tracemalloc.take_snapshot)
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+            self._running = False
+
+        now = dt_util.now()
+        path = self._hass.config.path(f"{DOMAIN}_profile_{now.strftime('%Y%m%d_%H%M%S')}.txt")
+        summary = (
+            f"JciHitachi profile collected at {now.isoformat()} over {duration:.1f} s: "
+            f"{len(coordinators)} devices, {cycles} refresh cycles, {sent} commands."
+        )
+        await self._hass.async_add_executor_job(write_report, path, profile, before, after, summary)
+        _LOGGER.info(f"Wrote the profile report to {path}.")
+        return path
@@ -0,0 +1,119 @@
+"""JciHitachi integration."""
+import json
+import logging
+
+from awscrt.mqtt import QoS
+from JciHitachi.model import STATUS_DICT
+
+_LOGGER = logging.getLogger(__name__)
+
+# Same QoS LibJciHitachi subscribes with, awscrt rejects plain ints.
+QOS = QoS.AT_LEAST_ONCE
+SHADOW_UPDATE_TOPIC = "$aws/things/{thing_name}/shadow/name/{shadow_name}/update/documents"
+SHADOW_NAME = "info"
+
+
+def mqtt_subscriber(api):
+    """Return subscribe/unsubscribe callables bound to the API's MQTT connection.
+
+    Any pair of callables with the same signatures can be used instead,
+    e.g. a client connected to a local MQTT broker for testing.
+    """
+    mqttc = api._mqtt._mqttc
+
+    def subscribe(topic, callback):
+        subscribe_future, _ = mqttc.subscribe(topic, QOS, callback=callback)
+        subscribe_future.result()
+
+    def unsubscribe(topic):
+        unsubscribe_future, _ = mqttc.unsubscribe(topic)
+        unsubscribe_future.result()
+
+    return subscribe, unsubscribe
+
+
+class JciHitachiPushListener:
+    """Apply AWS IoT shadow updates to the status store as they arrive.
+
+    Parameters
+    ----------
+    hass : HomeAssistant
+        Home Assistant instance.
+    api : JciHitachiAWSAPI
+        Logged in API instance.
+    coordinators : dict of DataUpdateCoordinator
+        Coordinators by device name, notified on every applied update.
+    subscriber : tuple of callables, optional
+        (subscribe, unsubscribe) pair, by default the API's MQTT connection.
+    """
+
+    def __init__(self, hass, api, coordinators, subscriber=None):
+        self._hass = hass
+        self._api = api
+        self._coordinators = coordinators
+        self._subscribe, self._unsubscribe = subscriber or mqtt_subscriber(api)
+        self._topics = {}
+
+    def subscribe(self):
+        """Subscribe to shadow update topics of all things. Blocking."""
+        for name, thing in self._api.things.items():
+            topic = SHADOW_UPDATE_TOPIC.format(thing_name=thing.thing_name, shadow_name=SHADOW_NAME)
+            self._subscribe(topic, self._on_message)
+            self._topics[topic] = name
+        _LOGGER.debug(f"Subscribed to shadow topics: {list(self._topics)}")
+
+    def unsubscribe(self):
+        """Unsubscribe from all subscribed topics. Blocking."""
+        for topic in list(self._topics):
+            try:
+                self._unsubscribe(topic)
+            except Exception as err:
+                _LOGGER.warning(f"Failed to unsubscribe from {topic}: {err}")
+            self._topics.pop(topic)
+
+    def _on_message(self, topic, payload, dup=False, qos=QOS, retain=False, **kwargs):
+        """Handle messages on the MQTT client thread."""
+        name = self._topics.get(topic)
+        if name is None:
+            return
+
+        try:
+            document = json.loads(payload)
+        except (TypeError, ValueError) as err:
+            _LOGGER.error(f"Invalid shadow payload on {topic}: {err}")
+            return
+
+        # `update/documents` carries the full document under `current`,
+        # `update/accepted` and `update/delta` carry the state directly.
+        state = document.get("current", document).get("state", {})
+        reported = state.get("reported", state)
+        if not isinstance(reported, dict) or not reported:
+            return
+
+        self._hass.loop.call_soon_threadsafe(self.async_apply, name, reported)
+
+    def async_apply(self, name, reported):
+        """Apply reported fields to a thing and notify entities."""
+        thing = self._api.things.get(name)
+        if thing is None or thing.status_code is None:
+            return
+
+        known = STATUS_DICT.get(thing.type, {})
+        applied = {
+            status_name: value for status_name, value in reported.items()
+            if status_name in known and status_name != "DeviceType"
+        }
+        if not applied:
+            return
+
+        for status_name, value in applied.items():
+            if status_name == "PowerConsumption":
+                # Scaled the same way as `JciHitachiAWSStatus` does for polled status.
+                value /= 10.0
+            thing.status_code.set_new_status(status_name, value)
+
+        coordinator = self._coordinators[name]
+        changed = coordinator.store.confirm(self._api.get_status(name, legacy=True))
+        _LOGGER.debug(f"Pushed update applied to {name}: {applied}")
+
+        coordinator.async_set_updated_data(changed[name])
@@ -0,0 +1,131 @@
+"""JciHitachi integration."""
+import asyncio
+import heapq
+import itertools
+import time
+
+# Lanes in priority order, a lower lane is served first.
+LANE_COMMAND = 0
+LANE_REFRESH = 1
+LANE_BACKGROUND = 2
+LANE_NAMES = {
+    LANE_COMMAND: "command",
+    LANE_REFRESH: "refresh",
+    LANE_BACKGROUND: "background",
+}
+
+# Cloud requests per second an account sends on average, and in a burst.
+DEFAULT_RATE = 10.0
+DEFAULT_BURST = 20
+
+
+def queue_delay_operation(lane):
+    """Return the metrics operation the queueing delay of `lane` is recorded as."""
+    return f"queue_delay_{LANE_NAMES[lane]}"
+
+
+class JciHitachiRateLimiter:
+    """Token bucket shared by every cloud request of an account, with priority lanes.
+
+    Requests take one token per device they address. When the bucket is
+    empty, waiting requests are served in lane order, then in arrival
+    order, as tokens refill, so a command never waits behind queued
+    refreshes or background work. The time every request waited is
+    recorded as the queueing delay of its lane.
+
+    Only to be used from the event loop.
+
+    Parameters
+    ----------
+    hass : HomeAssistant
+        Home Assistant instance.
+    metrics : JciHitachiMetrics
+        Metrics the queueing delays are recorded in.
+    rate : float, optional
+        Tokens refilled per second, by default `DEFAULT_RATE`.
+    burst : int, optional
+        Bucket size, by default `DEFAULT_BURST`.
+    """
+
+    def __init__(self, hass, metrics, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self._hass = hass
+        self._metrics = metrics
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._timer = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    async def async_acquire(self, lane, cost=1, since=None):
+        """Wait for `cost` tokens in `lane`.
+
+        Parameters
+        ----------
+        lane : int
+            `LANE_COMMAND`, `LANE_REFRESH` or `LANE_BACKGROUND`.
+        cost : int, optional
+            Tokens taken, capped at the bucket size, by default 1.
+        since : float, optional
+            `time.monotonic()` the caller started waiting at, by default now.
+        """
+        since = time.monotonic() if since is None else since
+        cost = min(max(cost, 1), self._burst)
+        self._refill()
+        if not self._waiters and self._tokens >= cost:
+            self._tokens -= cost
+        else:
+            future = self._hass.loop.create_future()
+            heapq.heappush(self._waiters, (lane, next(self._sequence), cost, future))
+            self._schedule()
+            try:
+                await future
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    # Granted in the meantime, hand the tokens back.
+                    self._tokens += cost
+                    self._schedule()
+                raise
+        self._metrics.operation(None, queue_delay_operation(lane)).record(time.monotonic() - since, True)
+
+    def _schedule(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._grant()
+        if self._waiters:
+            cost = self._waiters[0][2]
+            self._timer = self._hass.loop.call_later(
+                max(0.0, (cost - self._tokens) / self._rate), self._schedule)
+
+    def _grant(self):
+        self._refill()
+        while self._waiters:
+            _, _, cost, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._tokens < cost:
+                break
+            heapq.heappop(self._waiters)
+            self._tokens -= cost
+            future.set_result(None)
+
+    def as_dict(self):
+        """Snapshot of the bucket, e.g. for diagnostics."""
+        self._refill()
+        return {
+            "rate": self._rate,
+            "burst": self._burst,
+            "tokens": self._tokens,
+            "waiting": {
+                LANE_NAMES[lane]: sum(1 for waiter in self._waiters if waiter[0] == lane and not waiter[3].done())
+                for lane in LANE_NAMES
+            },
+        }
@@ -0,0 +1,219 @@
+"""JciHitachi integration."""
+import asyncio
+import gzip
+import json
+import logging
+import threading
+import time
+
+from homeassistant.util import dt as dt_util
+
+from .const import API, DOMAIN
+from .refresh import answered
+from .session import dump_thing
+
+_LOGGER = logging.getLogger(__name__)
+
+RECORDING_VERSION = 1
+# Cloud calls of the API that are recorded, the MQTT executions are recorded as well.
+RECORDED_METHODS = ("login", "refresh_status", "set_status", "refresh_monthly_data")
+
+
+def write_recording(path, header, events):
+    """Write a recording as gzipped JSON lines, the header first. Blocking."""
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        for line in [header, *events]:
+            file.write(json.dumps(line, separators=(",", ":")) + "\n")
+
+
+class JciHitachiRecorder:
+    """Record the cloud traffic of a live API, so that it can be replayed offline.
+
+    The cloud calls of the API instance and the executions of its MQTT
+    connection are wrapped until `stop`. Every call is recorded with its
+    start offset `t` and duration `d` in seconds, the devices it addressed
+    and what they answered, or the error it raised. `get_status` only reads
+    the statuses kept by the API and is not recorded, a replay derives it
+    from the recorded answers.
+
+    The header holds the device inventory with the support codes and
+    statuses when recording started, in the format of the session cache.
+
+    Parameters
+    ----------
+    api : JciHitachiAWSAPI
+        Logged in API instance.
+    """
+
+    def __init__(self, api):
+        self._api = api
+        self._lock = threading.Lock()
+        self._events = []
+        self._started_at = None
+        self._start = None
+        self._header = None
+        self._mqtt = None
+        self._published = []
+
+    def start(self):
+        """Start recording. To be called from the event loop."""
+        self._started_at = dt_util.now()
+        self._start = time.monotonic()
+        self._header = {
+            "version": RECORDING_VERSION,
+            "started_at": self._started_at.isoformat(),
+            "things": [dump_thing(thing) for thing in self._api.things.values()],
+        }
+        describe = {
+            "login": self._describe_login,
+            "refresh_status": self._describe_refresh_status,
+            "set_status": self._describe_set_status,
+            "refresh_monthly_data": self._describe_refresh_monthly_data,
+        }
+        for name in RECORDED_METHODS:
+            # Shadows the method on the instance only, `stop` removes it again.
+            setattr(self._api, name, self._recorded(name, getattr(self._api, name), describe[name]))
+        self._wrap_mqtt()
+
+    def stop(self):
+        """Stop recording and return the header and the events. To be called from the event loop."""
+        for name in RECORDED_METHODS:
+            self._api.__dict__.pop(name, None)
+        self._unwrap_mqtt()
+        with self._lock:
+            events, self._events = self._events, []
+        return self._header, events
+
+    def _record(self, op, start, fields):
+        event = {"op": op, "t": round(start - self._start, 3), "d": round(time.monotonic() - start, 3), **fields}
+        with self._lock:
+            self._events.append(event)
+
+    def _recorded(self, op, func, describe):
+        """Wrap `func`, recording every call with the fields `describe(result, *args, **kwargs)` returns."""
+        def wrapper(*args, **kwargs):
+            start = time.monotonic()
+            try:
+                result = func(*args, **kwargs)
+            except Exception as err:
+                self._record(op, start, {**describe(None, *args, **kwargs), "error": repr(err)})
+                raise
+            self._record(op, start, describe(result, *args, **kwargs))
+            return result
+        return wrapper
+
+    def _describe_login(self, result):
+        # A login connects a new MQTT connection.
+        self._wrap_mqtt()
+        return {"things": [dump_thing(thing) for thing in self._api.things.values()]}
+
+    def _describe_refresh_status(self, result, device_name=None, refresh_support_code=False, refresh_shadow=False):
+        names = list(self._api.things) if device_name is None else [device_name]
+        return {"device": device_name, "statuses": {name: dump_thing(self._api.things[name])["status"] for name in names}}
+
+    def _describe_set_status(self, result, status_name, device_name, status_value=None, status_str_value=None):
+        return {
+            "device": device_name,
+            "status_name": status_name,
+            "status_value": status_value,
+            "status_str_value": status_str_value,
+            "result": result,
+        }
+
+    def _describe_refresh_monthly_data(self, result, months, device_name=None):
+        names = list(self._api.things) if device_name is None else [device_name]
+        return {
+            "device": device_name,
+            "months": months,
+            "records": {name: self._api.things[name].monthly_data for name in names},
+        }
+
+    def _wrap_mqtt(self):
+        self._unwrap_mqtt()
+        mqtt = getattr(self._api, "_mqtt", None)
+        if mqtt is None:
+            return
+        publish, execute = mqtt.publish, mqtt.execute
+
+        def recorded_publish(host_identity_id, thing_name, publish_type, *args, **kwargs):
+            self._published.append((thing_name, publish_type))
+            return publish(host_identity_id, thing_name, publish_type, *args, **kwargs)
+
+        def recorded_execute(control=False, **kwargs):
+            # Executions are serialized by the API executor, the publishes are theirs.
+            published, self._published = self._published, []
+            start = time.monotonic()
+            try:
+                results = execute(control, **kwargs)
+            except Exception as err:
+                self._record_execution(control, published, start, repr(err))
+                raise
+            self._record_execution(control, published, start)
+            return results
+
+        mqtt.publish, mqtt.execute = recorded_publish, recorded_execute
+        self._mqtt = mqtt
+
+    def _unwrap_mqtt(self):
+        if self._mqtt is not None:
+            self._mqtt.__dict__.pop("publish", None)
+            self._mqtt.__dict__.pop("execute", None)
+            self._mqtt = None
+        self._published = []
+
+    def _record_execution(self, control, published, start, error=None):
+        """Record what every device published to in an execution answered, None if it did not."""
+        names = {thing.thing_name: name for name, thing in self._api.things.items()}
+        events = self._mqtt.mqtt_events
+        # Named after the publish type of the requests.
+        op = "control" if control else "status"
+        devices = {}
+        for thing_name, kind in published:
+            if kind != op or thing_name not in names:
+                continue
+            # Timed out requests are in the results as well, only an answer to this one set the event.
+            if control:
+                confirmed = answered(events.device_control_event, thing_name)
+                devices[names[thing_name]] = events.device_control.get(thing_name) if confirmed else None
+            else:
+                confirmed = answered(events.device_status_event, thing_name) and thing_name in events.device_status
+                devices[names[thing_name]] = events.device_status[thing_name].status if confirmed else None
+        fields = {"devices": devices}
+        if error is not None:
+            fields["error"] = error
+        self._record(op, start, fields)
+
+
+async def async_record(hass, accounts, duration):
+    """Record the cloud traffic of accounts for `duration` seconds.
+
+    Parameters
+    ----------
+    hass : HomeAssistant
+        Home Assistant instance.
+    accounts : list of dict
+        Runtime data of the accounts to record.
+    duration : float
+        Seconds to record for.
+
+    Returns
+    -------
+    list of str
+        Paths of the recordings, one per account.
+    """
+    recorders = [JciHitachiRecorder(entry_data[API]) for entry_data in accounts]
+    for recorder in recorders:
+        recorder.start()
+    try:
+        await asyncio.sleep(duration)
+    finally:
+        recordings = [recorder.stop() for recorder in recorders]
+
+    stamp = dt_util.now().strftime("%Y%m%d_%H%M%S")
+    paths = []
+    for index, (header, events) in enumerate(recordings):
+        path = hass.config.path(f"{DOMAIN}_recording_{stamp}_{index}.jsonl.gz")
+        await hass.async_add_executor_job(write_recording, path, header, events)
+        _LOGGER.info(f"Wrote {len(events)} recorded cloud calls of {len(header['things'])} devices to {path}.")
+        paths.append(path)
+    return paths
@@ -0,0 +1,222 @@
+"""JciHitachi integration."""
+import asyncio
+import logging
+import time
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds a device has to answer within a batch.
+DEFAULT_DEVICE_TIMEOUT = 5.0
+# Seconds a refresh may wait for and run its batch before the device counts as late.
+DEFAULT_CYCLE_TIMEOUT = 25.0
+# Seconds a batch may run past its longest device deadline.
+BATCH_TIMEOUT_MARGIN = 2.0
+
+
+class DeviceLateError(RuntimeError):
+    """A device was not refreshed in time while other devices of the account were."""
+
+
+class NoDeviceAnsweredError(RuntimeError):
+    """No device of a batch answered, although the requests were sent."""
+
+
+def answered(device_events, thing_name):
+    """Whether a device answered the request last published to it, given the per-thing events of its kind."""
+    event = device_events.get(thing_name)
+    return event is not None and event.is_set()
+
+
+def refresh_status_batch(api, device_names, timeouts=None):
+    """Refresh the status of several devices with a single execution. Blocking.
+
+    Unlike `api.refresh_status`, which stops at the first device that does
+    not respond, every device gets its own outcome and deadline.
+
+    Parameters
+    ----------
+    api : JciHitachiAWSAPI
+        Logged in API instance.
+    device_names : list of str
+        Devices to refresh.
+    timeouts : dict, optional
+        {device_name: seconds the device has to answer}, by default the
+        device offline timeout of `api`.
+
+    Returns
+    -------
+    dict
+        {device_name: DeviceLateError} of the devices that did not answer in time.
+
+    Raises
+    ------
+    NoDeviceAnsweredError
+        If no device responded.
+    """
+    things = [(name, api.things[name]) for name in device_names]
+    timeouts = timeouts or {}
+
+    # Same requests `api.refresh_status` publishes, awaited concurrently by one execution.
+    api._check_before_publish()
+    for name, thing in things:
+        api._mqtt.publish(
+            api._aws_identity.host_identity_id,
+            thing.thing_name,
+            "status",
+            timeouts.get(name, api._mqtt_timeout),
+        )
+    api._mqtt.execute()
+
+    errors = {}
+    events = api._mqtt.mqtt_events
+    for name, thing in things:
+        # Timed out requests are in the execution results as well, and
+        # `device_status` keeps every earlier answer. Publishing cleared
+        # the event, so only an answer to this request has set it.
+        if answered(events.device_status_event, thing.thing_name) and thing.thing_name in events.device_status:
+            thing.status_code = events.device_status[thing.thing_name]
+        else:
+            errors[name] = DeviceLateError(
+                f"Timed out refreshing {name} status code. "
+                "Please ensure the device is online and avoid opening the official app."
+            )
+    if len(errors) == len(things):
+        raise NoDeviceAnsweredError(f"Timed out refreshing {', '.join(errors)} status code.")
+    return errors
+
+
+class JciHitachiRefreshPool:
+    """Refresh devices in batches of at most `concurrency` concurrent requests.
+
+    Devices asking for a refresh while a batch is running are refreshed
+    together in the next one, so a cycle over many devices takes about
+    `len(devices) / concurrency` device round trips instead of one per
+    device. Each caller is resumed as soon as its batch finishes.
+
+    Every device has `device_timeout` seconds to answer within its batch,
+    and at most `cycle_timeout` seconds from asking for a refresh to its
+    batch being sent, so a polling cycle takes at most about
+    `cycle_timeout + device_timeout` seconds, whatever the number of
+    devices. Devices that miss their deadline while other
+    devices of the account answered fail with `DeviceLateError`, as their
+    last status is still worth showing. When no device answered, the
+    refresh fails with the underlying error.
+
+    Parameters
+    ----------
+    hass : HomeAssistant
+        Home Assistant instance.
+    api : JciHitachiAWSAPI
+        Logged in API instance.
+    executor : JciHitachiAPIExecutor
+        Executor running the blocking API calls.
+    concurrency : int
+        Largest number of devices refreshed by one batch.
+    device_timeout : float, optional
+        Seconds a device has to answer, by default `DEFAULT_DEVICE_TIMEOUT`.
+    cycle_timeout : float, optional
+        Seconds a refresh may wait for its batch, by default `DEFAULT_CYCLE_TIMEOUT`.
+    """
+
+    def __init__(
+        self,
+        hass,
+        api,
+        executor,
+        concurrency,
+        device_timeout=DEFAULT_DEVICE_TIMEOUT,
+        cycle_timeout=DEFAULT_CYCLE_TIMEOUT,
+    ):
+        self._hass = hass
+        self._api = api
+        self._executor = executor
+        self._concurrency = max(1, concurrency)
+        self._device_timeout = device_timeout
+        self._cycle_timeout = cycle_timeout
+        # {device_name: (future, deadline)}
+        self._pending = {}
+        # When a device of the account last answered.
+        self._answered_at = None
+        self._wakeup = asyncio.Event()
+        self._worker = hass.async_create_background_task(self._async_worker(), f"{DOMAIN} refresh")
+
+    async def async_refresh(self, device_name):
+        """Refresh a device in the next batch. Raises if it failed to refresh."""
+        pending = self._pending.get(device_name)
+        if pending is None:
+            pending = self._pending[device_name] = (
+                self._hass.loop.create_future(), time.monotonic() + self._cycle_timeout)
+            self._wakeup.set()
+        # Shielded so that one cancelled caller does not fail others sharing the refresh.
+        await asyncio.shield(pending[0])
+
+    async def async_shutdown(self):
+        """Cancel the worker and fail pending refreshes."""
+        self._worker.cancel()
+        await asyncio.gather(self._worker, return_exceptions=True)
+        for future, _ in self._pending.values():
+            if not future.done():
+                future.cancel()
+        self._pending.clear()
+
+    def _late(self, device_name, err):
+        """Return the error of a device that was not refreshed, late if others answered meanwhile."""
+        if isinstance(err, DeviceLateError):
+            return err
+        if self._answered_at is not None and time.monotonic() - self._answered_at < self._cycle_timeout:
+            return DeviceLateError(f"Failed to refresh {device_name} in time: {err!r}")
+        return err
+
+    async def _async_worker(self):
+        while True:
+            await self._wakeup.wait()
+            # Let refreshes requested in the same loop iteration join the batch.
+            await asyncio.sleep(0)
+            now = time.monotonic()
+            batch = {}
+            timeouts = {}
+            for device_name in list(self._pending):
+                if len(batch) >= self._concurrency:
+                    break
+                future, deadline = self._pending.pop(device_name)
+                if deadline <= now:
+                    if not future.done():
+                        future.set_exception(self._late(device_name, RuntimeError(
+                            f"{device_name} was not refreshed within {self._cycle_timeout} s.")))
+                    continue
+                batch[device_name] = future
+                timeouts[device_name] = min(self._device_timeout, deadline - now)
+            if not self._pending:
+                self._wakeup.clear()
+            if batch:
+                await self._async_run(batch, timeouts)
+
+    async def _async_run(self, batch, timeouts):
+        _LOGGER.debug(f"Refreshing {list(batch)}")
+        try:
+            errors = await self._executor.async_call(
+                refresh_status_batch,
+                self._api,
+                list(batch),
+                timeouts,
+                timeout=max(timeouts.values()) + BATCH_TIMEOUT_MARGIN,
+                cost=len(batch),
+            )
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as err:
+            errors = {device_name: self._late(device_name, err) for device_name in batch}
+        else:
+            self._answered_at = time.monotonic()
+
+        for device_name, future in batch.items():
+            if future.done():
+                continue
+            if device_name in errors:
+                future.set_exception(errors[device_name])
+            else:
+                future.set_result(None)
@@ -0,0 +1,108 @@
+"""JciHitachi integration."""
+import time
+from datetime import timedelta
+
+FAST_UPDATE_INTERVAL = timedelta(seconds=3)
+FAST_UPDATE_WINDOW = timedelta(seconds=30)
+IDLE_CYCLES_BEFORE_BACKOFF = 3
+BACKOFF_FACTOR = 2
+
+# Status changes that are usually followed by further changes shortly,
+# e.g. a unit ramping up after being powered on or a full water tank.
+TRANSITION_STATUS_NAMES = (
+    "power",
+    "mode",
+    "water_full_warning",
+    "error_code",
+    "Switch",
+)
+
+
+class AdaptivePollingScheduler:
+    """Polling interval scheduler.
+
+    Polls every `fast_interval` for `fast_window` after a command or a
+    state transition, returns to `base_interval` on any other change and
+    backs off towards `max_interval` after `idle_cycles` unchanged cycles.
+
+    Parameters
+    ----------
+    base_interval : timedelta
+        Regular polling interval.
+    max_interval : timedelta
+        Ceiling of the backed off polling interval.
+    fast_interval : timedelta, optional
+        Polling interval after commands and transitions.
+    fast_window : timedelta, optional
+        How long to keep polling fast.
+    idle_cycles : int, optional
+        Number of unchanged cycles before backing off.
+    """
+
+    def __init__(
+        self,
+        base_interval,
+        max_interval,
+        fast_interval=FAST_UPDATE_INTERVAL,
+        fast_window=FAST_UPDATE_WINDOW,
+        idle_cycles=IDLE_CYCLES_BEFORE_BACKOFF,
+    ):
+        self.base_interval = base_interval
+        self.max_interval = max(max_interval, base_interval)
+        self.fast_interval = min(fast_interval, base_interval)
+        self.fast_window = fast_window
+        self.idle_cycles = idle_cycles
+        self.interval = base_interval
+        self._fast_until = 0.0
+        self._unchanged_cycles = 0
+
+    @staticmethod
+    def classify(changed):
+        """Classify the status names changed by a refresh, None if unknown.
+
+        Returns
+        -------
+        tuple of bool
+            Whether anything changed and whether a transition status changed.
+        """
+        if changed is None:
+            return True, False
+        return bool(changed), not changed.isdisjoint(TRANSITION_STATUS_NAMES)
+
+    def reset(self, base_interval):
+        """Change the regular polling interval and start over from it."""
+        self.base_interval = base_interval
+        self.max_interval = max(self.max_interval, base_interval)
+        self.fast_interval = min(self.fast_interval, base_interval)
+        self._unchanged_cycles = 0
+        self.interval = base_interval
+
+    def _start_fast_window(self):
+        self._fast_until = time.monotonic() + self.fast_window.total_seconds()
+        self._unchanged_cycles = 0
+        self.interval = self.fast_interval
+
+    def command_sent(self):
+        """Poll fast after a command. Returns the next interval."""
+        self._start_fast_window()
+        return self.interval
+
+    def refreshed(self, changed, transition):
+        """Update the interval after a refresh. Returns the next interval."""
+        if transition:
+            self._start_fast_window()
+        elif time.monotonic() < self._fast_until:
+            self.interval = self.fast_interval
+        elif changed:
+            self._unchanged_cycles = 0
+            self.interval = self.base_interval
+        else:
+            self._unchanged_cycles += 1
+            if self._unchanged_cycles >= self.idle_cycles:
+                self.interval = min(
+                    max(self.interval, self.base_interval) * BACKOFF_FACTOR,
+                    self.max_interval
+                )
+            else:
+                self.interval = max(self.interval, self.base_interval)
+        return self.interval
@@ -5,9 +5,13 @@ import logging
 from homeassistant.components.sensor import (SensorStateClass,
                                              SensorDeviceClass, SensorEntity)
 from homeassistant.const import (CONCENTRATION_MICROGRAMS_PER_CUBIC_METER,
-                                 PERCENTAGE, UnitOfEnergy, UnitOfTemperature)
+                                 PERCENTAGE, EntityCategory, UnitOfEnergy,
+                                 UnitOfTemperature, UnitOfTime)
 
-from . import API, COORDINATOR, DOMAIN, UPDATED_DATA, JciHitachiEntity
+from . import (API, COORDINATOR, DOMAIN, METRICS, MONTHLY_DATA,
+               JciHitachiEntity)
+from .metrics import (OPERATION_REFRESH_MONTHLY_DATA, OPERATION_REFRESH_STATUS,
+                      OPERATION_SET_STATUS)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,58 +24,63 @@ ODOR_LEVELS = [
     ODOR_LEVEL_HIGH,
 ]
 
+METRIC_OPERATIONS = {
+    OPERATION_REFRESH_STATUS: " Refresh Latency",
+    OPERATION_SET_STATUS: " Command Latency",
+    OPERATION_REFRESH_MONTHLY_DATA: " Monthly Data Latency",
+}
 
-async def _async_setup(hass, async_add):
-    api = hass.data[DOMAIN][API]
-    coordinator = hass.data[DOMAIN][COORDINATOR]
 
+async def _async_setup(hass, entry_id, async_add):
+    entry_data = hass.data[DOMAIN][entry_id]
+    api = entry_data[API]
+    coordinators = entry_data[COORDINATOR]
+    metrics = entry_data[METRICS]
+
+    entities = []
     for thing in api.things.values():
+        coordinator = coordinators[thing.name]
+        entities.extend(
+            [JciHitachiLatencySensorEntity(thing, coordinator, metrics, operation)
+             for operation in METRIC_OPERATIONS] +
+            [JciHitachiCommandQueueSensorEntity(thing, coordinator, metrics)]
+        )
         if thing.type == "AC":
-            async_add(
+            entities.extend(
                 [JciHitachiPowerConsumptionSensorEntity(thing, coordinator),
                  JciHitachiMonthlyPowerConsumptionSensorEntity(thing, coordinator),
                  JciHitachiMonthIndicatorSensorEntity(thing, coordinator),
-                 ],
-                update_before_add=True)
+                 ])
         elif thing.type == "DH":
-            async_add(
+            entities.extend(
                 [JciHitachiIndoorHumiditySensorEntity(thing, coordinator),
                  JciHitachiOdorLevelSensorEntity(thing, coordinator),
                  JciHitachiPM25SensorEntity(thing, coordinator),
                  JciHitachiPowerConsumptionSensorEntity(thing, coordinator),
                  JciHitachiMonthlyPowerConsumptionSensorEntity(thing, coordinator),
                  JciHitachiMonthIndicatorSensorEntity(thing, coordinator),
-                 ],
-                update_before_add=True)
+                 ])
         elif thing.type == "HE":
-            async_add(
-                [JciHitachiIndoorTemperatureSensorEntity(thing, coordinator),
-                 ], 
-                 update_before_add=True
-            )
-
-async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
-    """Set up the sensor platform."""
-    await _async_setup(hass, async_add_entities)
+            entities.append(JciHitachiIndoorTemperatureSensorEntity(thing, coordinator))
+    # States come from the status already loaded during setup.
+    async_add(entities)
 
 async def async_setup_entry(hass, config_entry, async_add_devices):
     """Set up the sensor platform from a config entry."""
-    await _async_setup(hass, async_add_devices)
+    await _async_setup(hass, config_entry.entry_id, async_add_devices)
 
 
 class JciHitachiIndoorHumiditySensorEntity(JciHitachiEntity, SensorEntity):
+    _status_names = ("indoor_humidity",)
+    _name_suffix = " Indoor Humidity"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Indoor Humidity"
-
     @property
     def native_value(self):
         """Return the indoor humidity."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA].get(self._thing.name, None)
+        status = self._status
         if status:
             return None if status.indoor_humidity == "unsupported" else status.indoor_humidity
         return None
@@ -92,18 +101,16 @@ class JciHitachiIndoorHumiditySensorEntity(JciHitachiEntity, SensorEntity):
 
 
 class JciHitachiPM25SensorEntity(JciHitachiEntity, SensorEntity):
+    _status_names = ("pm25_value",)
+    _name_suffix = " PM2.5"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} PM2.5"
-
     @property
     def native_value(self):
         """Return the PM2.5 value."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA].get(self._thing.name, None)
+        status = self._status
         if status:
             return None if status.pm25_value == "unsupported" else status.pm25_value
         return None
@@ -124,18 +131,16 @@ class JciHitachiPM25SensorEntity(JciHitachiEntity, SensorEntity):
 
 
 class JciHitachiOdorLevelSensorEntity(JciHitachiEntity, SensorEntity):
+    _status_names = ("odor_level",)
+    _name_suffix = " Odor Level"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Odor Level"
-
     @property
     def native_value(self):
         """Return the odor level."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA].get(self._thing.name, None)
+        status = self._status
         if status:
             if status.odor_level == "low":
                 return ODOR_LEVEL_LOW
@@ -161,18 +166,16 @@ class JciHitachiOdorLevelSensorEntity(JciHitachiEntity, SensorEntity):
 
 
 class JciHitachiPowerConsumptionSensorEntity(JciHitachiEntity, SensorEntity):
+    _status_names = ("power_kwh",)
+    _name_suffix = " Power Consumption"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Power Consumption"
-
     @property
     def native_value(self):
         """Return the power consumption in KW/H"""
-        status = self.hass.data[DOMAIN][UPDATED_DATA].get(self._thing.name, None)
+        status = self._status
         if status:
             return None if status.power_kwh == "unsupported" else status.power_kwh
         return None
@@ -196,14 +199,12 @@ class JciHitachiPowerConsumptionSensorEntity(JciHitachiEntity, SensorEntity):
         return SensorStateClass.TOTAL_INCREASING
 
 class JciHitachiMonthlyPowerConsumptionSensorEntity(JciHitachiEntity, SensorEntity):
+    _status_names = (MONTHLY_DATA,)
+    _name_suffix = " Monthly Power Consumption"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Monthly Power Consumption"
-
     @property
     def native_value(self):
         """Return the monthly power consumption in KW/H"""
@@ -231,14 +232,12 @@ class JciHitachiMonthlyPowerConsumptionSensorEntity(JciHitachiEntity, SensorEnti
         return None
 
 class JciHitachiMonthIndicatorSensorEntity(JciHitachiEntity, SensorEntity):
+    _status_names = (MONTHLY_DATA,)
+    _name_suffix = " Month Indicator"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Month Indicator"
-
     @property
     def state(self):
         """Return the month in yyyy-mm format."""
@@ -266,18 +265,16 @@ class JciHitachiMonthIndicatorSensorEntity(JciHitachiEntity, SensorEntity):
 
 
 class JciHitachiIndoorTemperatureSensorEntity(JciHitachiEntity, SensorEntity):
+    _status_names = ("IndoorTemperature",)
+    _name_suffix = " Indoor Temperature"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Indoor Temperature"
-
     @property
     def native_value(self):
         """Return the indoor temperature."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA].get(self._thing.name, None)
+        status = self._status
         if status:
             return None if status.IndoorTemperature == "unsupported" else status.IndoorTemperature
         return None
@@ -294,4 +291,57 @@ class JciHitachiIndoorTemperatureSensorEntity(JciHitachiEntity, SensorEntity):
 
     @property
     def unique_id(self):
-        return f"{self._thing.gateway_mac_address}_indoor_temperature_sensor"
\ No newline at end of file
+        return f"{self._thing.gateway_mac_address}_indoor_temperature_sensor"
+
+
+class JciHitachiLatencySensorEntity(JciHitachiEntity, SensorEntity):
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, thing, coordinator, metrics, operation):
+        self._name_suffix = METRIC_OPERATIONS[operation]
+        super().__init__(thing, coordinator)
+        self._operation = operation
+        self._metrics = metrics.operation(thing.name, operation)
+
+    @property
+    def native_value(self):
+        """Return the estimated 95th percentile latency."""
+        return self._metrics.percentile(0.95)
+
+    @property
+    def extra_state_attributes(self):
+        """Return counters and the latency histogram."""
+        return self._metrics.as_dict()
+
+    @property
+    def unique_id(self):
+        return f"{self._thing.gateway_mac_address}_{self._operation}_latency_sensor"
+
+
+class JciHitachiCommandQueueSensorEntity(JciHitachiEntity, SensorEntity):
+    _name_suffix = " Command Queue Depth"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, thing, coordinator, metrics):
+        super().__init__(thing, coordinator)
+        self._metrics = metrics.queue(thing.name)
+
+    @property
+    def native_value(self):
+        """Return the number of commands waiting to be sent."""
+        return self._metrics.depth
+
+    @property
+    def extra_state_attributes(self):
+        """Return the highest depth seen."""
+        return {"max_depth": self._metrics.max_depth}
+
+    @property
+    def unique_id(self):
+        return f"{self._thing.gateway_mac_address}_command_queue_sensor"
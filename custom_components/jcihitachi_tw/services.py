@@ -0,0 +1,146 @@
+"""JciHitachi integration."""
+import asyncio
+import datetime
+import logging
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+
+from .const import API, DOMAIN, MONTHLY_CACHE
+from .monthly import month_key
+from .profiler import JciHitachiProfiler
+from .recording import async_record
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_GET_MONTHLY_DATA = "get_monthly_data"
+ATTR_DEVICE = "device"
+ATTR_MONTHS = "months"
+DEFAULT_MONTHS = 12
+
+SERVICE_PROFILE = "profile"
+ATTR_CYCLES = "cycles"
+ATTR_COMMANDS = "commands"
+ATTR_TIMEOUT = "timeout"
+DEFAULT_CYCLES = 3
+DEFAULT_PROFILE_TIMEOUT = 300
+
+SERVICE_RECORD = "record"
+ATTR_DURATION = "duration"
+DEFAULT_RECORD_DURATION = 300
+
+GET_MONTHLY_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE): cv.string,
+        vol.Optional(ATTR_MONTHS, default=DEFAULT_MONTHS): vol.All(vol.Coerce(int), vol.Range(min=1, max=36)),
+    }
+)
+
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CYCLES, default=DEFAULT_CYCLES): vol.All(vol.Coerce(int), vol.Range(min=1, max=20)),
+        vol.Optional(ATTR_COMMANDS, default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=50)),
+        vol.Optional(ATTR_TIMEOUT, default=DEFAULT_PROFILE_TIMEOUT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=3600)),
+    }
+)
+
+RECORD_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_RECORD_DURATION): vol.All(
+            vol.Coerce(int), vol.Range(min=10, max=3600)),
+    }
+)
+
+
+def _accounts(hass):
+    """Runtime data of every set up account."""
+    entry_ids = [entry.entry_id for entry in hass.config_entries.async_entries(DOMAIN)]
+    data = hass.data.get(DOMAIN, {})
+    return [data[entry_id] for entry_id in entry_ids if entry_id in data]
+
+
+def async_register_services(hass):
+    """Register the services of the integration."""
+
+    async def async_get_monthly_data(call):
+        """Return the monthly power consumption of the last months of one or every device."""
+        device_name = call.data.get(ATTR_DEVICE)
+        months = call.data[ATTR_MONTHS]
+        requests = [
+            (name, entry_data[MONTHLY_CACHE])
+            for entry_data in _accounts(hass)
+            for name in entry_data[API].things
+            if device_name is None or name == device_name
+        ]
+        if device_name is not None and not requests:
+            raise ServiceValidationError(f"Unknown device: {device_name}")
+
+        results = await asyncio.gather(
+            *(cache.async_get(name, months) for name, cache in requests), return_exceptions=True)
+
+        devices = {}
+        for (name, _), records in zip(requests, results):
+            if isinstance(records, Exception):
+                _LOGGER.warning(f"Failed to get {name} monthly data: {records}")
+                continue
+            devices[name] = [
+                {
+                    "month": month_key(datetime.date.fromtimestamp(record["Timestamp"] / 1000)),
+                    "timestamp": record["Timestamp"],
+                    "power_consumption": record["PowerConsumption_Sum"] / 10,
+                }
+                for record in records
+            ]
+        return {"devices": devices}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_MONTHLY_DATA,
+        async_get_monthly_data,
+        schema=GET_MONTHLY_DATA_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    profiler = JciHitachiProfiler(hass)
+
+    async def async_profile(call):
+        """Profile refresh cycles and commands, and write the report to the config directory."""
+        accounts = _accounts(hass)
+        if not accounts:
+            raise ServiceValidationError("No account is set up.")
+        path = await profiler.async_profile(
+            accounts, call.data[ATTR_CYCLES], call.data[ATTR_COMMANDS], call.data[ATTR_TIMEOUT])
+        return {"report": path}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    record_lock = asyncio.Lock()
+
+    async def async_record_traffic(call):
+        """Record the cloud traffic of every account, and write the recordings to the config directory."""
+        accounts = _accounts(hass)
+        if not accounts:
+            raise ServiceValidationError("No account is set up.")
+        if record_lock.locked():
+            raise HomeAssistantError("A recording is already in progress.")
+        async with record_lock:
+            paths = await async_record(hass, accounts, call.data[ATTR_DURATION])
+        return {"recordings": paths}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_RECORD,
+        async_record_traffic,
+        schema=RECORD_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,320 @@
+"""JciHitachi integration."""
+import base64
+import dataclasses
+import json
+import logging
+import os
+import time
+
+from homeassistant.helpers.storage import Store
+from JciHitachi import aws_connection
+from JciHitachi.api import AWSThing
+from JciHitachi.model import JciHitachiAWSStatus, JciHitachiAWSStatusSupport
+
+from .const import DOMAIN
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+except ImportError:
+    Fernet = None
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+KDF_ITERATIONS = 200_000
+# Devices added to the account show up once the cached inventory is this old.
+INVENTORY_MAX_AGE = 86400
+
+
+def dump_thing(thing):
+    """Return the inventory entry, support code and status of a device, as saved in a session."""
+    return {
+        "json": thing.picked_thing,
+        "support": getattr(thing.support_code, "_raw_status", None),
+        "status": getattr(thing.status_code, "status", None),
+    }
+
+
+def dump_session(api):
+    """Return the session tokens, device inventory and last statuses of a logged in API.
+
+    None if there is no session.
+    """
+    if getattr(api, "_aws_tokens", None) is None or getattr(api, "_aws_identity", None) is None:
+        return None
+    return {
+        "device_names": api.device_names,
+        "tokens": dataclasses.asdict(api._aws_tokens),
+        "identity": dataclasses.asdict(api._aws_identity),
+        "things": [dump_thing(thing) for thing in api.things.values()],
+    }
+
+
+def authenticate(api):
+    """Authenticate and list the devices of the account, without connecting. Blocking.
+
+    The user lookup and device inventory of `api.login`, without the MQTT
+    connection and the support code, status and shadow requests, which is
+    enough to validate an account.
+
+    Returns
+    -------
+    dict
+        Session in the format of `dump_session`, with no support codes or
+        statuses, that `restore_session` completes.
+
+    Raises
+    ------
+    RuntimeError
+        If authentication or retrieving the devices fails.
+    AssertionError
+        If some of `api.device_names` are not available.
+    """
+    conn = aws_connection.GetUser(
+        email=api.email,
+        password=api.password,
+        print_response=api.print_response,
+    )
+    api._aws_tokens = conn.aws_tokens
+    conn_status, api._aws_identity = conn.get_data()
+    if conn_status != "OK":
+        raise RuntimeError(f"An error occurred when retrieving user info: {conn_status}")
+
+    conn = aws_connection.GetAllDevice(api._aws_tokens, print_response=api.print_response)
+    conn_status, conn_json = conn.get_data()
+    if conn_status != "OK":
+        raise RuntimeError(f"An error occurred when retrieving devices info: {conn_status}")
+    api._things = AWSThing.from_device_names(conn_json, api.device_names)
+    api.device_names = list(api._things)
+    return dump_session(api)
+
+
+def is_complete(session):
+    """Whether every device of `session` has a saved support code and status."""
+    return all(item["support"] is not None and item.get("status") is not None for item in session["things"])
+
+
+def restore_inventory(api, session):
+    """Restore the tokens, devices and saved statuses of `session` without connecting.
+
+    Returns
+    -------
+    set
+        Names of the devices whose status is the saved one.
+    """
+    api._aws_tokens = aws_connection.AWSTokens(**session["tokens"])
+    api._aws_identity = aws_connection.AWSIdentity(**session["identity"])
+    things = {}
+    for item in session["things"]:
+        thing = AWSThing(item["json"])
+        if item["support"] is not None:
+            thing.support_code = JciHitachiAWSStatusSupport(item["support"])
+        if item.get("status") is not None:
+            # Already preprocessed, taken as is like a legacy status.
+            thing.status_code = JciHitachiAWSStatus(item["status"], legacy=True)
+        things[thing.name] = thing
+    api._things = things
+    api.device_names = list(things)
+    return {name for name, thing in things.items() if thing.status_code is not None}
+
+
+def connect_session(api, session):
+    """Connect a session restored by `restore_inventory`. Blocking.
+
+    Skips the user lookup, the device inventory and the support code and
+    shadow requests of a full login, only the MQTT connection is set up
+    again. Expired tokens are renewed the same way a running session does.
+    Statuses are only refreshed if some device has no saved one.
+
+    Raises
+    ------
+    RuntimeError
+        If the saved session is rejected.
+    """
+    # Same MQTT connection `api.login` sets up.
+    def get_credential_callable():
+        api._check_before_publish()
+        conn = aws_connection.GetCredentials(
+            email=api.email,
+            password=api.password,
+            aws_tokens=api._aws_tokens,
+            print_response=api.print_response,
+        )
+        conn_status, aws_credentials = conn.get_data(api._aws_identity)
+        if conn_status != "OK":
+            _LOGGER.error(f"An error occurred when acquiring a new AwsCredentials: {conn_status}")
+        return aws_credentials
+
+    api._mqtt = aws_connection.JciHitachiAWSMqttConnection(
+        get_credential_callable, print_response=api.print_response
+    )
+    api._mqtt.configure(api._aws_identity.identity_id)
+    if not api._mqtt.connect(
+        api._aws_identity.host_identity_id,
+        api._shadow_names,
+        [thing.thing_name for thing in api.things.values()],
+    ):
+        raise RuntimeError("An error occurred when connecting to MQTT endpoint.")
+
+    if not is_complete(session):
+        api.refresh_status(refresh_support_code=any(item["support"] is None for item in session["things"]))
+
+
+def restore_session(api, session):
+    """Resume a session saved by `dump_session` instead of `api.login`. Blocking.
+
+    If every device has a saved status, statuses are not refreshed and the
+    saved ones are used until the first refresh.
+
+    Returns
+    -------
+    set
+        Names of the devices whose status is the saved one.
+
+    Raises
+    ------
+    RuntimeError
+        If the saved session is rejected.
+    """
+    stale = restore_inventory(api, session)
+    connect_session(api, session)
+    return stale if is_complete(session) else set()
+
+
+def resume_session(api, session, device_names):
+    """Connect a session restored by `restore_inventory`, or login if it is rejected. Blocking.
+
+    Entities are already built on the restored devices, so after a login
+    the restored `AWSThing` instances are kept and updated in place.
+
+    Parameters
+    ----------
+    api : JciHitachiAWSAPI
+        API instance `session` was restored into.
+    session : dict
+        Session saved by `dump_session`.
+    device_names : list of str or None
+        Configured device names, used by the login.
+
+    Returns
+    -------
+    bool
+        True if the session was resumed, False if a login was done instead.
+    """
+    try:
+        connect_session(api, session)
+        return True
+    except Exception as err:
+        _LOGGER.info(f"The cached session was rejected, logging in: {err}")
+    close_session(api)
+
+    restored = dict(api.things)
+    api.device_names = device_names
+    api.login()
+    for name, thing in api.things.items():
+        if name not in restored:
+            _LOGGER.info(f"{name} was added to the account, it shows up after a restart.")
+            continue
+        restored[name]._json = thing._json
+        restored[name].support_code = thing.support_code
+        restored[name].status_code = thing.status_code
+        restored[name].shadow = thing.shadow
+        restored[name].available = thing.available
+    for name in restored.keys() - api.things.keys():
+        _LOGGER.info(f"{name} was removed from the account.")
+    api._things = {name: restored.get(name, thing) for name, thing in api.things.items()}
+    return False
+
+
+def close_session(api):
+    """Disconnect a partially restored session. Blocking."""
+    if getattr(api, "_mqtt", None) is not None:
+        try:
+            api.logout()
+        except Exception as err:
+            _LOGGER.debug(f"Failed to disconnect the rejected session: {err}")
+        api._mqtt = None
+
+
+class JciHitachiSessionCache:
+    """Session tokens, device inventory and last statuses of an account, kept in HA storage.
+
+    The cache is encrypted with a key derived from the account's
+    credentials when `cryptography` is available, so that a password
+    change invalidates it. Otherwise it is written in plain text. The
+    credentials are kept in plain text in the config entry, so the
+    encryption does not protect the tokens from anyone able to read HA
+    storage, only the private storage file's permissions do.
+
+    Parameters
+    ----------
+    hass : HomeAssistant
+        Home Assistant instance.
+    entry_id : str
+        Config entry id the cache belongs to.
+    email : str
+        Account email.
+    password : str
+        Account password.
+    """
+
+    def __init__(self, hass, entry_id, email, password):
+        self._hass = hass
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.session", private=True)
+        self._secret = f"{email}\n{password}".encode()
+        # When the device inventory was fetched by a full login.
+        self.inventory_at = None
+
+    def _fernet(self, salt):
+        kdf = PBKDF2HMAC(algorithm=hashes.SHA256(), length=32, salt=salt, iterations=KDF_ITERATIONS)
+        return Fernet(base64.urlsafe_b64encode(kdf.derive(self._secret)))
+
+    def _encrypt(self, session):
+        if Fernet is None:
+            return {"session": session}
+        salt = os.urandom(16)
+        token = self._fernet(salt).encrypt(json.dumps(session).encode())
+        return {"salt": base64.b64encode(salt).decode(), "session": token.decode()}
+
+    def _decrypt(self, data):
+        if "salt" not in data:
+            return data["session"]
+        if Fernet is None:
+            return None
+        try:
+            token = self._fernet(base64.b64decode(data["salt"])).decrypt(data["session"].encode())
+        except InvalidToken:
+            return None
+        return json.loads(token)
+
+    async def async_load(self, device_names=None):
+        """Return the cached session for `device_names`, None if there is no usable one."""
+        data = await self._store.async_load()
+        if not data:
+            return None
+        session = await self._hass.async_add_executor_job(self._decrypt, data)
+        if session is None:
+            _LOGGER.debug("The cached session cannot be decrypted with the current credentials.")
+            return None
+        if device_names and set(device_names) != set(session["device_names"]):
+            _LOGGER.debug("The cached session was saved for other devices.")
+            return None
+        if time.time() - session["inventory_at"] > INVENTORY_MAX_AGE:
+            _LOGGER.debug("The cached device inventory is outdated.")
+            return None
+        self.inventory_at = session["inventory_at"]
+        return session
+
+    async def async_save(self, api):
+        """Save the session of a logged in API."""
+        session = dump_session(api)
+        if session is None or self.inventory_at is None:
+            return
+        session["inventory_at"] = self.inventory_at
+        await self._store.async_save(await self._hass.async_add_executor_job(self._encrypt, session))
+
+    async def async_remove(self):
+        """Remove the cached session."""
+        await self._store.async_remove()
@@ -0,0 +1,104 @@
+"""JciHitachi integration."""
+import asyncio
+import datetime
+import logging
+
+from homeassistant.const import UnitOfEnergy
+from homeassistant.util import dt as dt_util
+from homeassistant.util import slugify
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Months of history fetched, older cached months are imported as well.
+IMPORT_MONTHS = 24
+
+
+def statistic_id(thing):
+    """Return the id of a device's external monthly power consumption statistic."""
+    return f"{DOMAIN}:{slugify(thing.gateway_mac_address)}_monthly_power_consumption"
+
+
+def build_statistics(records):
+    """Convert monthly data records, oldest first, to cumulative statistics.
+
+    Every month is one row starting at the first hour of the month, which
+    is how the energy dashboard shows it. The recorder only takes rows
+    starting on a UTC hour, so in time zones offset by a fraction of an
+    hour the row starts at the first UTC hour within the month instead.
+    """
+    statistics = []
+    total = 0.0
+    for record in records:
+        date = dt_util.as_local(dt_util.utc_from_timestamp(record["Timestamp"] / 1000))
+        start = dt_util.as_utc(date.replace(day=1, hour=0, minute=0, second=0, microsecond=0))
+        if start.minute or start.second or start.microsecond:
+            start = start.replace(minute=0, second=0, microsecond=0) + datetime.timedelta(hours=1)
+        state = record["PowerConsumption_Sum"] / 10
+        total += state
+        statistics.append({
+            "start": start,
+            "state": state,
+            "sum": total,
+        })
+    return statistics
+
+
+class JciHitachiStatisticsImporter:
+    """Import the monthly power consumption of an account's devices as external statistics.
+
+    All devices are fetched concurrently through the monthly data cache, so
+    only months that are not cached yet and the current month hit the
+    cloud, then imported in bulk. The energy dashboard then reads the
+    history from the recorder.
+
+    Parameters
+    ----------
+    hass : HomeAssistant
+        Home Assistant instance.
+    api : JciHitachiAWSAPI
+        API instance.
+    monthly_cache : JciHitachiMonthlyDataCache
+        Monthly data cache of the account.
+    """
+
+    def __init__(self, hass, api, monthly_cache):
+        self._hass = hass
+        self._api = api
+        self._monthly_cache = monthly_cache
+
+    async def async_import(self, now=None):
+        """Fetch and import the monthly data of every device."""
+        if "recorder" not in self._hass.config.components:
+            _LOGGER.debug("The recorder is not set up, skipping the statistics import.")
+            return
+        from homeassistant.components.recorder.statistics import \
+            async_add_external_statistics
+
+        things = list(self._api.things.values())
+        results = await asyncio.gather(
+            *(self._monthly_cache.async_get(thing.name, IMPORT_MONTHS) for thing in things),
+            return_exceptions=True,
+        )
+        for thing, result in zip(things, results):
+            if isinstance(result, Exception):
+                _LOGGER.warning(f"Failed to get {thing.name} monthly data: {result}")
+                continue
+            # Every cached month, so that the sums do not depend on the fetched range.
+            statistics = build_statistics(self._monthly_cache.records(thing.name))
+            if not statistics:
+                continue
+            async_add_external_statistics(
+                self._hass,
+                {
+                    "has_mean": False,
+                    "has_sum": True,
+                    "name": f"{thing.name} Monthly Power Consumption",
+                    "source": DOMAIN,
+                    "statistic_id": statistic_id(thing),
+                    "unit_of_measurement": UnitOfEnergy.KILO_WATT_HOUR,
+                },
+                statistics,
+            )
+        _LOGGER.debug(f"Imported monthly power consumption statistics of {len(things)} devices.")
@@ -0,0 +1,105 @@
+"""JciHitachi integration."""
+import logging
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class JciHitachiStatusStore(dict):
+    """Latest legacy status of each thing, with optimistic command values.
+
+    Commanded values are patched in as soon as a command is queued.
+    Confirmed readings either confirm a patched value, keep it while the
+    device catches up, or roll it back once `optimistic_timeout` passes.
+
+    Parameters
+    ----------
+    statuses : dict
+        {device_name: JciHitachiAWSStatus} from `api.get_status(legacy=True)`.
+    optimistic_timeout : float
+        Seconds a patched value is kept before a differing reading wins.
+    stale : iterable of str, optional
+        Devices whose status was restored from disk rather than read.
+        Devices that missed a refresh are flagged by `mark_stale`.
+    """
+
+    def __init__(self, statuses, optimistic_timeout, stale=()):
+        super().__init__(statuses)
+        self.optimistic_timeout = optimistic_timeout
+        self.stale = set(stale)
+        self._pending = {}
+
+    def patch(self, data):
+        """Apply the value of an `UpdateData` before the device confirms it."""
+        status = self.get(data.device_name)
+        if status is None:
+            return
+        value = data.status_value if data.status_str_value is None else data.status_str_value
+        status.status[data.status_name] = value
+        self._pending.setdefault(data.device_name, {})[data.status_name] = (
+            value, time.monotonic() + self.optimistic_timeout)
+
+    def rollback(self, device_name, status_names):
+        """Drop patched values the device rejected, the next `confirm` restores them."""
+        pending = self._pending.get(device_name, {})
+        for status_name in status_names:
+            if pending.pop(status_name, None) is not None:
+                _LOGGER.warning(f"{device_name} rejected {status_name}, rolling back.")
+
+    def confirm(self, statuses):
+        """Store confirmed readings, reconciling them with patched values.
+
+        Returns
+        -------
+        dict
+            {device_name: set of changed status names, or None if unknown
+            or no longer stale}.
+        """
+        now = time.monotonic()
+        changed = {}
+        for device_name, status in statuses.items():
+            pending = self._pending.get(device_name)
+            if pending and status is not None:
+                for status_name, (value, deadline) in list(pending.items()):
+                    current = status.status.get(status_name)
+                    if current == value:
+                        pending.pop(status_name)
+                    elif now >= deadline:
+                        pending.pop(status_name)
+                        _LOGGER.warning(
+                            f"{device_name} did not apply {status_name}={value} within "
+                            f"{self.optimistic_timeout}s, rolling back to {current}."
+                        )
+                    else:
+                        status.status[status_name] = value
+            if device_name in self.stale and status is not None:
+                self.stale.discard(device_name)
+                changed[device_name] = None
+            else:
+                changed[device_name] = self.diff(self.get(device_name), status)
+            self[device_name] = status
+        return changed
+
+    def mark_stale(self, device_name):
+        """Flag the status of a device as not read by its last refresh.
+
+        Returns
+        -------
+        bool
+            Whether the device was not flagged yet.
+        """
+        if device_name in self.stale:
+            return False
+        self.stale.add(device_name)
+        return True
+
+    @staticmethod
+    def diff(previous, current):
+        """Return the names of statuses that differ, None if either is missing."""
+        if previous is None or current is None:
+            return None
+        previous, current = previous.status, current.status
+        return {
+            status_name for status_name in previous.keys() | current.keys()
+            if previous.get(status_name) != current.get(status_name)
+        }
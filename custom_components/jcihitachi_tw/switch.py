@@ -3,48 +3,46 @@ import logging
 
 from homeassistant.components.switch import SwitchEntity
 
-from . import API, COORDINATOR, DOMAIN, UPDATED_DATA, JciHitachiEntity
+from . import API, COORDINATOR, DOMAIN, JciHitachiEntity
 
 _LOGGER = logging.getLogger(__name__)
 
 
-async def _async_setup(hass, async_add):
-    api = hass.data[DOMAIN][API]
-    coordinator = hass.data[DOMAIN][COORDINATOR]
+async def _async_setup(hass, entry_id, async_add):
+    entry_data = hass.data[DOMAIN][entry_id]
+    api = entry_data[API]
+    coordinators = entry_data[COORDINATOR]
 
+    entities = []
     for thing in api.things.values():
+        coordinator = coordinators[thing.name]
         if thing.type == "DH":
-            async_add(
+            entities.extend(
                 [JciHitachiAirCleaningFilterEntity(thing, coordinator),
                  JciHitachiCleanFilterNotifySwitchEntity(thing, coordinator),
                  JciHitachiMoldPrevSwitchEntity(thing, coordinator),
                  JciHitachiWindSwingableSwitchEntity(thing, coordinator),
                  JciHitachiIonSwitchEntity(thing, coordinator),
-                 JciHitachiKeypadLockSwitchEntity(thing, coordinator)],
-                update_before_add=True)
-
-async def async_setup_platform(hass, config, async_add_entities, discovery_info=None):
-    """Set up the switch platform."""
-    await _async_setup(hass, async_add_entities)
+                 JciHitachiKeypadLockSwitchEntity(thing, coordinator)])
+    # States come from the status already loaded during setup.
+    async_add(entities)
 
 async def async_setup_entry(hass, config_entry, async_add_devices):
     """Set up the switch platform from a config entry."""
-    await _async_setup(hass, async_add_devices)
+    await _async_setup(hass, config_entry.entry_id, async_add_devices)
 
 
 class JciHitachiAirCleaningFilterEntity(JciHitachiEntity, SwitchEntity):
+    _status_names = ("air_cleaning_filter",)
+    _name_suffix = " Air Cleaning Filter Setting"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Air Cleaning Filter Setting"
-
     @property
     def is_on(self):
         """Indicate whether air cleaning filter setting is on."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA].get(self._thing.name, None)
+        status = self._status
         if status:
             if status.air_cleaning_filter == "disabled":
                 return False
@@ -56,32 +54,30 @@ class JciHitachiAirCleaningFilterEntity(JciHitachiEntity, SwitchEntity):
     def unique_id(self):
         return f"{self._thing.gateway_mac_address}_air_cleaning_filter_switch"
 
-    def turn_on(self):
+    async def async_turn_on(self):
         """Turn air cleaning filter setting on."""
         _LOGGER.debug(f"Turn {self.name} on")
         self.put_queue(status_name="air_cleaning_filter", status_str_value="enabled")
-        self.update()
+        await self.async_flush_queue()
 
-    def turn_off(self):
+    async def async_turn_off(self):
         """Turn air cleaning filter setting off."""
         _LOGGER.debug(f"Turn {self.name} off")
         self.put_queue(status_name="air_cleaning_filter", status_str_value="disabled")
-        self.update()
+        await self.async_flush_queue()
 
 
 class JciHitachiCleanFilterNotifySwitchEntity(JciHitachiEntity, SwitchEntity):
+    _status_names = ("clean_filter_notify",)
+    _name_suffix = " Clean Filter Notification"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Clean Filter Notification"
-
     @property
     def is_on(self):
         """Indicate whether clean filter notification is on."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA].get(self._thing.name, None)
+        status = self._status
         if status:
             if status.clean_filter_notify == "disabled":
                 return False
@@ -93,32 +89,30 @@ class JciHitachiCleanFilterNotifySwitchEntity(JciHitachiEntity, SwitchEntity):
     def unique_id(self):
         return f"{self._thing.gateway_mac_address}_clean_filter_notify_switch"
 
-    def turn_on(self):
+    async def async_turn_on(self):
         """Turn clean filter notification on."""
         _LOGGER.debug(f"Turn {self.name} on")
         self.put_queue(status_name="clean_filter_notify", status_str_value="enabled")
-        self.update()
+        await self.async_flush_queue()
 
-    def turn_off(self):
+    async def async_turn_off(self):
         """Turn clean filter notification off."""
         _LOGGER.debug(f"Turn {self.name} off")
         self.put_queue(status_name="clean_filter_notify", status_str_value="disabled")
-        self.update()
+        await self.async_flush_queue()
 
 
 class JciHitachiMoldPrevSwitchEntity(JciHitachiEntity, SwitchEntity):
+    _status_names = ("mold_prev",)
+    _name_suffix = " Mold Prevention"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Mold Prevention"
-
     @property
     def is_on(self):
         """Indicate whether mold prevention is on."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA].get(self._thing.name, None)
+        status = self._status
         if status:
             if status.mold_prev == "disabled":
                 return False
@@ -130,32 +124,30 @@ class JciHitachiMoldPrevSwitchEntity(JciHitachiEntity, SwitchEntity):
     def unique_id(self):
         return f"{self._thing.gateway_mac_address}_mold_prev_switch"
 
-    def turn_on(self):
+    async def async_turn_on(self):
         """Turn mold prevention on."""
         _LOGGER.debug(f"Turn {self.name} on")
         self.put_queue(status_name="mold_prev", status_str_value="enabled")
-        self.update()
+        await self.async_flush_queue()
 
-    def turn_off(self):
+    async def async_turn_off(self):
         """Turn mold prevention off."""
         _LOGGER.debug(f"Turn {self.name} off")
         self.put_queue(status_name="mold_prev", status_str_value="disabled")
-        self.update()
+        await self.async_flush_queue()
 
 
 class JciHitachiWindSwingableSwitchEntity(JciHitachiEntity, SwitchEntity):
+    _status_names = ("wind_swingable",)
+    _name_suffix = " Wind Swingable"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Wind Swingable"
-
     @property
     def is_on(self):
         """Indicate whether wind swingable is on."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA].get(self._thing.name, None)
+        status = self._status
         if status:
             if status.wind_swingable == "disabled":
                 return False
@@ -167,31 +159,29 @@ class JciHitachiWindSwingableSwitchEntity(JciHitachiEntity, SwitchEntity):
     def unique_id(self):
         return f"{self._thing.gateway_mac_address}_wind_swingable_switch"
 
-    def turn_on(self):
+    async def async_turn_on(self):
         """Turn wind swingable on."""
         _LOGGER.debug(f"Turn {self.name} on")
         self.put_queue(status_name="wind_swingable", status_str_value="enabled")
-        self.update()
+        await self.async_flush_queue()
     
-    def turn_off(self):
+    async def async_turn_off(self):
         """Turn wind swingable off."""
         _LOGGER.debug(f"Turn {self.name} off")
         self.put_queue(status_name="wind_swingable", status_str_value="disabled")
-        self.update()
+        await self.async_flush_queue()
 
 class JciHitachiIonSwitchEntity(JciHitachiEntity, SwitchEntity):
+    _status_names = ("Ion",)
+    _name_suffix = " Ion"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Ion"
-
     @property
     def is_on(self):
         """Indicate whether ion is on."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA].get(self._thing.name, None)
+        status = self._status
         if status:
             if status.Ion == "disabled":
                 return False
@@ -203,31 +193,29 @@ class JciHitachiIonSwitchEntity(JciHitachiEntity, SwitchEntity):
     def unique_id(self):
         return f"{self._thing.gateway_mac_address}_ion_switch"
 
-    def turn_on(self):
+    async def async_turn_on(self):
         """Turn ion on."""
         _LOGGER.debug(f"Turn {self.name} on")
         self.put_queue(status_name="Ion", status_str_value="enabled")
-        self.update()
+        await self.async_flush_queue()
     
-    def turn_off(self):
+    async def async_turn_off(self):
         """Turn ion off."""
         _LOGGER.debug(f"Turn {self.name} off")
         self.put_queue(status_name="Ion", status_str_value="disabled")
-        self.update()
+        await self.async_flush_queue()
 
 class JciHitachiKeypadLockSwitchEntity(JciHitachiEntity, SwitchEntity):
+    _status_names = ("KeypadLock",)
+    _name_suffix = " Keypad Lock"
+
     def __init__(self, thing, coordinator):
         super().__init__(thing, coordinator)
 
-    @property
-    def name(self):
-        """Return the name of the entity."""
-        return f"{self._thing.name} Keypad Lock"
-
     @property
     def is_on(self):
         """Indicate whether keypad lock is on."""
-        status = self.hass.data[DOMAIN][UPDATED_DATA].get(self._thing.name, None)
+        status = self._status
         if status:
             if status.KeypadLock == "disabled":
                 return False
@@ -239,14 +227,14 @@ class JciHitachiKeypadLockSwitchEntity(JciHitachiEntity, SwitchEntity):
     def unique_id(self):
         return f"{self._thing.gateway_mac_address}_keypad_lock_switch"
 
-    def turn_on(self):
+    async def async_turn_on(self):
         """Turn keypad lock on."""
         _LOGGER.debug(f"Turn {self.name} on")
         self.put_queue(status_name="KeypadLock", status_str_value="enabled")
-        self.update()
+        await self.async_flush_queue()
     
-    def turn_off(self):
+    async def async_turn_off(self):
         """Turn keypad lock off."""
         _LOGGER.debug(f"Turn {self.name} off")
         self.put_queue(status_name="KeypadLock", status_str_value="disabled")
-        self.update()
\ No newline at end of file
+        await self.async_flush_queue()
\ No newline at end of file
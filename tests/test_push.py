@@ -0,0 +1,159 @@
+"""Tests of the push listener, fed through a fake subscriber."""
+import json
+from concurrent.futures import Future
+
+import pytest
+from awscrt.mqtt import QoS
+from JciHitachi.api import AWSThing
+from JciHitachi.model import JciHitachiAWSStatus
+
+from custom_components.jcihitachi_tw.push import (SHADOW_NAME,
+                                                  SHADOW_UPDATE_TOPIC,
+                                                  JciHitachiPushListener,
+                                                  mqtt_subscriber)
+from custom_components.jcihitachi_tw.store import JciHitachiStatusStore
+
+THING_NAME = "ap-northeast-1:000000000001"
+TOPIC = SHADOW_UPDATE_TOPIC.format(thing_name=THING_NAME, shadow_name=SHADOW_NAME)
+
+
+class FakeLoop:
+    def call_soon_threadsafe(self, callback, *args):
+        callback(*args)
+
+
+class FakeHass:
+    loop = FakeLoop()
+
+
+class FakeAPI:
+    def __init__(self):
+        thing = AWSThing({"CustomDeviceName": "Dehumidifier", "DeviceType": "2", "ThingName": THING_NAME})
+        thing.status_code = JciHitachiAWSStatus({"DeviceType": 2, "Switch": 0, "PM25": 10, "PowerConsumption": 12})
+        self.things = {thing.name: thing}
+
+    def get_status(self, device_name=None, legacy=False):
+        return {
+            name: thing.status_code.legacy_status
+            for name, thing in self.things.items()
+            if device_name is None or name == device_name
+        }
+
+
+class FakeSubscriber:
+    def __init__(self):
+        self.callbacks = {}
+
+    def subscribe(self, topic, callback):
+        self.callbacks[topic] = callback
+
+    def unsubscribe(self, topic):
+        del self.callbacks[topic]
+
+    def publish(self, topic, document):
+        self.callbacks[topic](topic, json.dumps(document).encode())
+
+
+class StubConnection:
+    """Checks arguments like `awscrt.mqtt.Connection`, failing the returned future."""
+
+    def __init__(self):
+        self.subscriptions = {}
+
+    def subscribe(self, topic, qos, callback=None):
+        future = Future()
+        try:
+            assert isinstance(qos, QoS)
+            self.subscriptions[topic] = callback
+            future.set_result({"topic": topic, "qos": qos})
+        except Exception as err:
+            future.set_exception(err)
+        return future, 1
+
+    def unsubscribe(self, topic):
+        future = Future()
+        self.subscriptions.pop(topic)
+        future.set_result({})
+        return future, 2
+
+
+class StubMqtt:
+    def __init__(self):
+        self._mqttc = StubConnection()
+
+
+class FakeCoordinator:
+    def __init__(self, store):
+        self.store = store
+        self.updates = []
+
+    def async_set_updated_data(self, data):
+        self.updates.append(data)
+
+
+@pytest.fixture
+def setup():
+    api = FakeAPI()
+    store = JciHitachiStatusStore(api.get_status(legacy=True), optimistic_timeout=15)
+    coordinator = FakeCoordinator(store)
+    subscriber = FakeSubscriber()
+    listener = JciHitachiPushListener(
+        FakeHass(), api, {"Dehumidifier": coordinator}, (subscriber.subscribe, subscriber.unsubscribe))
+    listener.subscribe()
+    return listener, subscriber, store, coordinator
+
+
+def test_subscribe_and_unsubscribe(setup):
+    listener, subscriber, _, _ = setup
+    assert list(subscriber.callbacks) == [TOPIC]
+    listener.unsubscribe()
+    assert subscriber.callbacks == {}
+
+
+def test_documents_update(setup):
+    _, subscriber, store, coordinator = setup
+    subscriber.publish(TOPIC, {
+        "previous": {"state": {"reported": {"Switch": 0, "PM25": 10}}},
+        "current": {"state": {"reported": {"Switch": 1, "PM25": 35}}},
+    })
+    assert store["Dehumidifier"].status["power"] == "on"
+    assert store["Dehumidifier"].status["pm25_value"] == 35
+    assert coordinator.updates == [{"power", "pm25_value"}]
+
+
+def test_state_update(setup):
+    _, subscriber, store, coordinator = setup
+    subscriber.publish(TOPIC, {"state": {"PowerConsumption": 25}})
+    assert store["Dehumidifier"].status["power_kwh"] == 2.5
+    assert coordinator.updates == [{"power_kwh"}]
+
+
+def test_unchanged_update(setup):
+    _, subscriber, _, coordinator = setup
+    subscriber.publish(TOPIC, {"state": {"reported": {"PM25": 10}}})
+    assert coordinator.updates == [set()]
+
+
+def test_ignored_messages(setup):
+    listener, subscriber, store, coordinator = setup
+    subscriber.publish(TOPIC, {"state": {"reported": {"Unknown": 1, "DeviceType": 1}}})
+    subscriber.publish(TOPIC, {"state": {"reported": {}}})
+    subscriber.callbacks[TOPIC](TOPIC, b"not json")
+    listener._on_message("$aws/things/other/shadow/name/info/update/documents", b'{"state": {"PM25": 1}}')
+    assert store["Dehumidifier"].status["pm25_value"] == 10
+    assert coordinator.updates == []
+
+
+def test_mqtt_subscriber():
+    api = FakeAPI()
+    api._mqtt = StubMqtt()
+    store = JciHitachiStatusStore(api.get_status(legacy=True), optimistic_timeout=15)
+    coordinator = FakeCoordinator(store)
+    listener = JciHitachiPushListener(FakeHass(), api, {"Dehumidifier": coordinator}, mqtt_subscriber(api))
+    listener.subscribe()
+    callback = api._mqtt._mqttc.subscriptions[TOPIC]
+    callback(topic=TOPIC, payload=b'{"state": {"reported": {"PM25": 40}}}', dup=False, qos=QoS.AT_LEAST_ONCE, retain=False)
+    assert store["Dehumidifier"].status["pm25_value"] == 40
+    assert coordinator.updates == [{"pm25_value"}]
+    listener.unsubscribe()
+    assert api._mqtt._mqttc.subscriptions == {}